@@ -74,6 +74,16 @@ class SmartSlugGenerator:
                             slug = test_result.get('slug', '')
                             if len(slug) == 5:
                                 tested_slugs.add(slug)
+                    # Fast scanner sessions keep per-slug results in an NDJSON file next to the log
+                    results_file = session_data.get('testing_results_file')
+                    if results_file:
+                        results_file = os.path.join(os.path.dirname(session_file), os.path.basename(results_file))
+                        if os.path.exists(results_file):
+                            with open(results_file, 'r') as f:
+                                for line in f:
+                                    slug = json.loads(line).get('slug', '') if line.strip() else ''
+                                    if len(slug) == 5:
+                                        tested_slugs.add(slug)
                     print(f"📚 Loaded tested slugs from {session_file}")
                 except Exception as e:
                     print(f"⚠️  Error loading {session_file}: {e}")
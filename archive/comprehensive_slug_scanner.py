@@ -5,28 +5,189 @@ Scans all possible 5-character combinations (aaaaa to zzzzz including numbers)
 Total combinations: 36^5 = 60,466,176
 """
 
+import asyncio
 import time
 import csv
+import hashlib
 import json
+import re
 import requests
+from requests.adapters import HTTPAdapter
 import string
+import struct
 import itertools
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, local
 import os
+import shutil
 import signal
 import sys
 
+# Try to import the async HTTP client - batches fall back to worker threads if unavailable
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    print("⚠️  httpx not available, using worker threads. Install with: pip install 'httpx[http2]'")
+
+try:
+    import h2  # noqa: F401 - only needed so httpx can negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Try to import Aho-Corasick for single-pass indicator scanning
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Try to import Hyperscan - SIMD literal matching, preferred over Aho-Corasick when present
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Cap on concurrent in-flight probes per batch on the async path
+MAX_INFLIGHT = 256
+
+# Probes HEAD first and only fetch this much of a body - enough for the indicator scan
+PREFIX_BYTES = 2048
+RANGE_HEADERS = {'Range': f'bytes=0-{PREFIX_BYTES - 1}'}
+MIN_CONTENT_LENGTH = 1000
+
+# Results CSV columns
+RESULT_FIELDNAMES = ['slug', 'url', 'status_code', 'content_length', 'content_type', 
+                     'has_business_indicators', 'first_100_chars', 'found_at']
+
+# Buffer size for the append-only results CSV
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Live checkpoint/progress files sit on tmpfs and are copied to disk this often (seconds)
+SNAPSHOT_INTERVAL = 60
+SHM_DIR = '/dev/shm'
+
+# Checkpoint reports are flushed to stdout every this many checkpoints
+CHECKPOINT_FLUSH_EVERY = 10
+
+# Checkpoint journal record - little-endian uint32 slug index
+CHECKPOINT_RECORD = struct.Struct('<I')
+
+# Progress header - tested count, found count, wall-clock ns - rewritten in place at offset 0
+PROGRESS_RECORD = struct.Struct('<QQQ')
+
+# Business indicators looked for in the body prefix
+BUSINESS_INDICATORS = (
+    'business_name', 'company', 'clinic', 'center', 'health',
+    'medical', 'therapy', 'treatment', 'doctor', 'wellness',
+    'spa', 'hotel', 'booking', 'appointment', 'schedule'
+)
+
+# ASCII case folding for raw bytes - the indicators are all ASCII
+ASCII_LOWER = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+
+def build_indicator_automaton():
+    """Aho-Corasick automaton over the business indicators"""
+    automaton = ahocorasick.Automaton()
+    for indicator in BUSINESS_INDICATORS:
+        automaton.add_word(indicator, indicator)
+    automaton.make_automaton()
+    return automaton
+
+def build_indicator_database():
+    """Hyperscan block-mode database over the business indicators - caseless, one report per indicator"""
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+    database.compile(
+        expressions=[re.escape(indicator).encode() for indicator in BUSINESS_INDICATORS],
+        ids=list(range(len(BUSINESS_INDICATORS))),
+        elements=len(BUSINESS_INDICATORS),
+        flags=[flags] * len(BUSINESS_INDICATORS)
+    )
+    return database
+
+def stop_on_first_match(indicator_id, start, end, flags, context):
+    """Hyperscan match handler - halt the scan on the first hit"""
+    return True
+
+INDICATOR_DATABASE = build_indicator_database() if HYPERSCAN_AVAILABLE else None
+INDICATOR_SCRATCH = local()  # Hyperscan scratch space is per thread
+INDICATOR_AUTOMATON = build_indicator_automaton() if AHOCORASICK_AVAILABLE and not HYPERSCAN_AVAILABLE else None
+INDICATOR_PATTERN = re.compile(b'|'.join(re.escape(indicator.encode()) for indicator in BUSINESS_INDICATORS))
+
+def has_business_indicator(body):
+    """True if any business indicator occurs in body (bytes) - one case-insensitive pass"""
+    if INDICATOR_DATABASE is not None:
+        scratch = getattr(INDICATOR_SCRATCH, 'scratch', None)
+        if scratch is None:
+            scratch = INDICATOR_SCRATCH.scratch = hyperscan.Scratch(INDICATOR_DATABASE)
+        try:
+            INDICATOR_DATABASE.scan(body, match_event_handler=stop_on_first_match, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            return True  # the handler stopped on a match
+        return False
+    
+    lowered = body.translate(ASCII_LOWER)
+    if INDICATOR_AUTOMATON is not None:
+        # latin-1 maps bytes 1:1 onto code points, so this is a copy rather than a decode
+        return next(INDICATOR_AUTOMATON.iter(lowered.decode('latin-1')), None) is not None
+    return INDICATOR_PATTERN.search(lowered) is not None
+
+def tmpfs_path(filename):
+    """Per-working-directory path for filename on tmpfs - filename itself when there is no tmpfs"""
+    if not os.path.isdir(SHM_DIR):
+        return filename
+    directory_key = hashlib.blake2b(os.getcwd().encode(), digest_size=4).hexdigest()
+    return os.path.join(SHM_DIR, f"vsdh_{directory_key}_{filename}")
+
+def parse_content_length(headers):
+    """Content-Length as an int, or None if the server didn't send one"""
+    try:
+        return int(headers.get('content-length'))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Thread-safe token bucket on the monotonic clock - callers take tokens for a whole batch at once"""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self.condition = Condition()
+    
+    def acquire(self, n=1):
+        """Block until n tokens are available, then take them - requests above capacity run into debt"""
+        with self.condition:
+            needed = min(n, self.capacity)
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= needed:
+                    self.tokens -= n
+                    return
+                self.condition.wait((needed - self.tokens) / self.rate)
+
 class ComprehensiveSlugScanner:
     def __init__(self):
         self.base_url = "https://vsdigital-bookingwidget-prod.azurewebsites.net"
         self.api_endpoint = "/api/business/"
+        self.url_prefix = self.base_url + self.api_endpoint  # probe URLs are this plus the slug
         
         # Character set: a-z + 0-9
         self.charset = string.ascii_lowercase + string.digits  # 36 characters
         self.total_combinations = 36 ** 5  # 60,466,176
         
+        # Precomputed slug halves - enumeration is one concat per slug
+        self.prefix_table = [''.join(combo) for combo in itertools.product(self.charset, repeat=3)]  # 46,656
+        self.suffix_table = [''.join(combo) for combo in itertools.product(self.charset, repeat=2)]  # 1,296
+        
         # Known working slugs to skip
         self.known_slugs = {
             'ad31y', 'mj42f', 'os27m', 'lp56a', 'zb74k', 'ym99l', 
@@ -34,11 +195,19 @@ class ComprehensiveSlugScanner:
             'bm49t', 'qu29u', 'tc33l'
         }
         
+        # Suffix tables with the known slugs removed - skipping them costs nothing per slug
+        self.unknown_suffixes = {}
+        for slug in self.known_slugs:
+            suffixes = self.unknown_suffixes.setdefault(slug[:3], list(self.suffix_table))
+            suffixes.remove(slug[3:])
+        
         # Results tracking
         self.found_slugs = []
         self.tested_count = 0
+        self.resumed_count = 0  # tested_count restored from the progress file - excluded from this run's rate
         self.start_time = None
-        self.lock = Lock()
+        self.start_monotonic = None  # elapsed/rate math - immune to wall-clock jumps
+        self.next_request_slot = 0.0
         
         # Configuration
         self.max_workers = 5  # Reduce for better progress visibility
@@ -46,10 +215,32 @@ class ComprehensiveSlugScanner:
         self.batch_size = 50  # Progress save interval - checkpoint every 50
         self.timeout = 10  # Request timeout
         
+        # Shared across worker threads - same overall rate as one sleep per slug per worker
+        overall_rate = self.requests_per_second * self.max_workers
+        self.rate_limiter = TokenBucket(overall_rate, overall_rate)
+        self.session = self.create_http_session()  # keep-alive across slugs and batches
+        
+        # Created on the first batch and kept for the whole scan - no per-batch loop/client/thread churn
+        self.event_loop = None
+        self.http_client = None
+        self.inflight = None
+        self.executor = None
+        
         # Progress tracking files
-        self.progress_file = "scan_progress.json"
+        self.progress_file = "scan_progress.json"  # human-readable, written at the end of a scan
+        self.persistent_progress_file = "scan_progress.bin"
+        self.progress_binary_file = tmpfs_path(self.persistent_progress_file)
+        self.progress_fd = None
         self.results_file = f"comprehensive_scan_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        self.checkpoint_file = "scan_checkpoint.txt"
+        self.persistent_checkpoint_file = "scan_checkpoint.bin"  # append-only journal of slug indices
+        self.checkpoint_file = tmpfs_path(self.persistent_checkpoint_file)  # live copy, snapshotted to disk
+        self.last_snapshot = time.monotonic()
+        self.legacy_checkpoint_file = "scan_checkpoint.txt"
+        self.checkpoint_fd = None
+        self.checkpoints_since_flush = 0
+        self.results_fh = None  # opened on the first found slug, then appended to
+        self.results_writer = None
+        self.results_saved_count = 0
         
         # Set up signal handler for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -60,98 +251,200 @@ class ComprehensiveSlugScanner:
         print(f"⚡ Concurrent workers: {self.max_workers}")
         print(f"🔄 Rate limit: {self.requests_per_second} requests/second")
         print(f"💾 Results file: {self.results_file}")
-        print(f"📍 Checkpoint file: {self.checkpoint_file}")
+        print(f"📍 Checkpoint file: {self.persistent_checkpoint_file}")
+        if self.checkpoint_file != self.persistent_checkpoint_file:
+            print(f"📍 Live checkpoint on tmpfs: {self.checkpoint_file} (snapshot every {SNAPSHOT_INTERVAL}s)")
     
     def signal_handler(self, signum, frame):
         """Handle graceful shutdown"""
         print(f"\n🛑 Received signal {signum}. Saving progress...")
         self.save_progress()
+        self.save_progress_json()
         self.save_results()
+        self.close_results()
+        self.close_checkpoint()
+        self.close_progress()
+        self.snapshot_state()
         print("✅ Progress saved. Exiting...")
         sys.exit(0)
     
+    def create_http_session(self):
+        """Create the shared requests session - one host, so a single pool sized for every worker"""
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers * 4, max_retries=0))
+        return session
+    
+    def create_http_client(self):
+        """Create the async HTTP client - HTTP/2 multiplexes the batch over one connection when h2 is installed"""
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=MAX_INFLIGHT, max_keepalive_connections=MAX_INFLIGHT),
+            timeout=self.timeout
+        )
+    
     def generate_all_combinations(self, start_from=None):
-        """Generate all possible 5-character combinations"""
+        """Generate all possible 5-character combinations, from start_from on if given"""
         print(f"🔢 Generating combinations from charset: {self.charset}")
         
-        # If resuming, skip to start position
+        # Seek straight to the resume point - index 0 on a fresh scan
+        start = 0
         if start_from:
             print(f"📍 Resuming from: {start_from}")
-            started = False
-            for combo in itertools.product(self.charset, repeat=5):
-                slug = ''.join(combo)
-                if slug == start_from:
-                    started = True
-                if started:
-                    yield slug
-        else:
-            # Generate all combinations
-            for combo in itertools.product(self.charset, repeat=5):
-                yield ''.join(combo)
+            start = self.slug_to_index(start_from)
+        prefix_index, suffix_index = divmod(start, len(self.suffix_table))
+        
+        # Partial first prefix, then whole prefixes - known slugs are left out here rather than checked per probe
+        prefix = self.prefix_table[prefix_index]
+        for suffix in self.suffix_table[suffix_index:]:
+            slug = prefix + suffix
+            if slug not in self.known_slugs:
+                yield slug
+        for prefix in self.prefix_table[prefix_index + 1:]:
+            for suffix in self.unknown_suffixes.get(prefix, self.suffix_table):
+                yield prefix + suffix
+    
+    def slug_to_index(self, slug):
+        """Position of slug in the charset enumeration order"""
+        index = 0
+        for char in slug:
+            index = index * len(self.charset) + self.charset.index(char)
+        return index
+    
+    def index_to_slug(self, index):
+        """Slug at a position in the charset enumeration order"""
+        prefix_index, suffix_index = divmod(index, len(self.suffix_table))
+        return self.prefix_table[prefix_index] + self.suffix_table[suffix_index]
     
     def test_slug_api(self, slug):
         """Test a single slug via API endpoint"""
-        if slug in self.known_slugs:
-            return None  # Skip known slugs
-        
         try:
-            url = f"{self.base_url}{self.api_endpoint}{slug}"
-            response = requests.get(url, timeout=self.timeout)
-            
-            # Check if it's a real business (not just HTML shell)
-            content = response.text.lower()
-            
-            # Look for business indicators in the response
-            business_indicators = [
-                'business_name', 'company', 'clinic', 'center', 'health',
-                'medical', 'therapy', 'treatment', 'doctor', 'wellness',
-                'spa', 'hotel', 'booking', 'appointment', 'schedule'
-            ]
-            
-            # Check for JSON-like structure or business content
-            has_business_content = any(indicator in content for indicator in business_indicators)
-            
-            # Additional checks for valid business pages
-            is_valid = (
-                response.status_code == 200 and
-                len(content) > 1000 and  # Substantial content
-                (has_business_content or 'json' in response.headers.get('content-type', ''))
-            )
+            url = self.url_prefix + slug
+            head = self.session.head(url, timeout=self.timeout, allow_redirects=False)
+            if head.status_code != 200:
+                return None
+            content_length = parse_content_length(head.headers)
+            if content_length is not None and content_length <= MIN_CONTENT_LENGTH:
+                return None
             
-            if is_valid:
-                print(f"✅ FOUND VALID SLUG: {slug} - {len(content)} chars")
-                return {
-                    'slug': slug,
-                    'url': url,
-                    'status_code': response.status_code,
-                    'content_length': len(content),
-                    'content_type': response.headers.get('content-type', ''),
-                    'has_business_indicators': has_business_content,
-                    'first_100_chars': content[:100].replace('\n', ' ').replace('\r', ' '),
-                    'found_at': datetime.now().isoformat()
-                }
+            if content_length is None:
+                # No length from HEAD - the full body is the only way to size it
+                response = self.session.get(url, timeout=self.timeout)
+                prefix = response.content
+                content_length = len(prefix)
+            else:
+                with self.session.get(url, headers=RANGE_HEADERS, timeout=self.timeout, stream=True) as response:
+                    prefix = response.raw.read(PREFIX_BYTES, decode_content=True)
+            return self.classify_response(slug, url, head.status_code, head.headers, content_length, prefix)
         except Exception as e:
             pass  # Skip errors silently
         
         return None
     
+    async def test_slug_api_async(self, client, semaphore, slug):
+        """Test a single slug via API endpoint on the shared async client"""
+        url = self.url_prefix + slug
+        async with semaphore:
+            await self.wait_for_request_slot()
+            try:
+                head = await client.head(url)
+                if head.status_code != 200:
+                    return None
+                content_length = parse_content_length(head.headers)
+                if content_length is not None and content_length <= MIN_CONTENT_LENGTH:
+                    return None
+                
+                if content_length is None:
+                    response = await client.get(url)
+                    prefix = response.content
+                    content_length = len(prefix)
+                else:
+                    # Stop reading at PREFIX_BYTES even if the server ignores the Range header
+                    prefix = bytearray()
+                    async with client.stream('GET', url, headers=RANGE_HEADERS) as response:
+                        async for chunk in response.aiter_bytes():
+                            prefix += chunk
+                            if len(prefix) >= PREFIX_BYTES:
+                                break
+                    prefix = bytes(prefix[:PREFIX_BYTES])
+            except httpx.HTTPError:
+                return None  # Skip errors silently
+        return self.classify_response(slug, url, head.status_code, head.headers, content_length, prefix)
+    
+    async def wait_for_request_slot(self):
+        """Space async requests out at the same overall rate as the worker threads"""
+        interval = 1.0 / (self.requests_per_second * self.max_workers)
+        now = time.monotonic()
+        slot = max(now, self.next_request_slot)
+        self.next_request_slot = slot + interval
+        await asyncio.sleep(slot - now)
+    
+    def classify_response(self, slug, url, status_code, headers, content_length, prefix):
+        """Return a result dict if the response looks like a real business, else None.
+        content_length is the full body size; prefix is the first PREFIX_BYTES of the body."""
+        # Check for JSON-like structure or business content - straight on the bytes, no decode
+        has_business_content = has_business_indicator(prefix)
+        
+        # Additional checks for valid business pages
+        is_valid = (
+            status_code == 200 and
+            content_length > MIN_CONTENT_LENGTH and  # Substantial content
+            (has_business_content or 'json' in headers.get('content-type', ''))
+        )
+        
+        if is_valid:
+            print(f"✅ FOUND VALID SLUG: {slug} - {content_length} chars")
+            first_100_chars = prefix[:100].decode('utf-8', 'replace').lower()
+            return {
+                'slug': slug,
+                'url': url,
+                'status_code': status_code,
+                'content_length': content_length,
+                'content_type': headers.get('content-type', ''),
+                'has_business_indicators': has_business_content,
+                'first_100_chars': first_100_chars.replace('\n', ' ').replace('\r', ' '),
+                'found_at': datetime.now().isoformat()
+            }
+        
+        return None
+    
     def worker_thread(self, slug_batch):
         """Worker thread to process a batch of slugs"""
         local_results = []
         
+        # Rate limiting - one wait for the whole chunk
+        self.rate_limiter.acquire(len(slug_batch))
+        
         for slug in slug_batch:
             result = self.test_slug_api(slug)
             if result:
                 local_results.append(result)
                 print(f"✅ FOUND: {slug} - {result['content_length']} chars")
-            
-            # Rate limiting
-            time.sleep(1.0 / self.requests_per_second)
         
         return local_results
     
     def save_progress(self):
-        """Save current progress"""
+        """Save current progress - one fixed-size binary header pwritten on a held fd"""
+        if self.progress_fd is None:
+            self.progress_fd = os.open(self.progress_binary_file, os.O_RDWR | os.O_CREAT, 0o644)
+        os.pwrite(self.progress_fd, PROGRESS_RECORD.pack(self.tested_count, len(self.found_slugs), time.time_ns()), 0)
+    
+    def load_progress(self):
+        """Read the binary progress header - (tested_count, found_count, saved_at_ns) or None"""
+        if os.path.exists(self.progress_binary_file):
+            with open(self.progress_binary_file, 'rb') as f:
+                data = f.read(PROGRESS_RECORD.size)
+            if len(data) == PROGRESS_RECORD.size:
+                return PROGRESS_RECORD.unpack(data)
+        return None
+    
+    def close_progress(self):
+        """Close the held progress fd"""
+        if self.progress_fd is not None:
+            os.close(self.progress_fd)
+            self.progress_fd = None
+    
+    def save_progress_json(self):
+        """Write the human-readable progress summary"""
         progress_data = {
             'tested_count': self.tested_count,
             'found_count': len(self.found_slugs),
@@ -164,44 +457,100 @@ class ComprehensiveSlugScanner:
             json.dump(progress_data, f, indent=2)
     
     def save_results(self):
-        """Save found slugs to CSV"""
-        if not self.found_slugs:
+        """Append found slugs not yet written to the results CSV"""
+        new_results = self.found_slugs[self.results_saved_count:]
+        if not new_results:
             return
         
-        fieldnames = ['slug', 'url', 'status_code', 'content_length', 'content_type', 
-                     'has_business_indicators', 'first_100_chars', 'found_at']
+        if self.results_fh is None:
+            self.results_fh = open(self.results_file, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+            self.results_writer = csv.DictWriter(self.results_fh, fieldnames=RESULT_FIELDNAMES)
+            self.results_writer.writeheader()
         
-        with open(self.results_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(self.found_slugs)
+        self.results_writer.writerows(new_results)
+        self.results_fh.flush()
+        self.results_saved_count += len(new_results)
         
         print(f"💾 Saved {len(self.found_slugs)} results to {self.results_file}")
     
+    def close_results(self):
+        """Flush and close the results CSV"""
+        if self.results_fh is not None:
+            self.results_fh.close()
+            self.results_fh = None
+            self.results_writer = None
+    
     def load_checkpoint(self):
-        """Load last checkpoint to resume scanning"""
+        """Load last checkpoint to resume scanning - last journal record, else the legacy text file"""
         if os.path.exists(self.checkpoint_file):
-            with open(self.checkpoint_file, 'r') as f:
-                return f.read().strip()
+            with open(self.checkpoint_file, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size >= CHECKPOINT_RECORD.size:
+                    # Skip a torn trailing record if the last append was cut short
+                    f.seek(size - size % CHECKPOINT_RECORD.size - CHECKPOINT_RECORD.size)
+                    index, = CHECKPOINT_RECORD.unpack(f.read(CHECKPOINT_RECORD.size))
+                    return self.index_to_slug(index)
+        if os.path.exists(self.legacy_checkpoint_file):
+            with open(self.legacy_checkpoint_file, 'r') as f:
+                return f.read().strip() or None
         return None
     
     def save_checkpoint(self, current_slug):
-        """Save current position for resuming"""
-        with open(self.checkpoint_file, 'w') as f:
-            f.write(current_slug)
+        """Save current position for resuming - one 4-byte record appended on a held fd"""
+        if self.checkpoint_fd is None:
+            self.checkpoint_fd = os.open(self.checkpoint_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        os.write(self.checkpoint_fd, CHECKPOINT_RECORD.pack(self.slug_to_index(current_slug)))
+        
+        if time.monotonic() - self.last_snapshot >= SNAPSHOT_INTERVAL:
+            self.snapshot_state()
+    
+    def snapshot_pairs(self):
+        """(live, on-disk) path pairs that differ - empty when there is no tmpfs"""
+        return [(live, persistent) for live, persistent in (
+            (self.checkpoint_file, self.persistent_checkpoint_file),
+            (self.progress_binary_file, self.persistent_progress_file)
+        ) if live != persistent]
+    
+    def snapshot_state(self):
+        """Copy the live checkpoint/progress files to disk - written aside and renamed so a crash keeps the last copy"""
+        for live, persistent in self.snapshot_pairs():
+            if os.path.exists(live):
+                shutil.copy2(live, persistent + '.tmp')
+                os.replace(persistent + '.tmp', persistent)
+        self.last_snapshot = time.monotonic()
+    
+    def restore_snapshot(self):
+        """Seed the live files from disk unless tmpfs already holds newer state (e.g. after a reboot)"""
+        for live, persistent in self.snapshot_pairs():
+            if os.path.exists(persistent) and (not os.path.exists(live) or os.path.getmtime(persistent) > os.path.getmtime(live)):
+                shutil.copy2(persistent, live)
+    
+    def close_checkpoint(self):
+        """Sync and close the held checkpoint fd"""
+        if self.checkpoint_fd is not None:
+            try:
+                os.fsync(self.checkpoint_fd)
+            finally:
+                os.close(self.checkpoint_fd)
+                self.checkpoint_fd = None
     
     def scan_all_combinations(self, resume=True):
         """Main scanning function"""
         self.start_time = datetime.now().isoformat()
+        self.start_monotonic = time.monotonic()
         
         # Check if resuming
+        self.restore_snapshot()
         start_from = None
         if resume:
             start_from = self.load_checkpoint()
+            progress = self.load_progress() if start_from else None
+            if progress:
+                self.tested_count = self.resumed_count = progress[0]
         
         print(f"🚀 Starting comprehensive scan at {self.start_time}")
         if start_from:
-            print(f"📍 Resuming from checkpoint: {start_from}")
+            print(f"📍 Resuming from checkpoint: {start_from} ({self.tested_count:,} already tested)")
         
         try:
             current_batch = []
@@ -219,18 +568,7 @@ class ComprehensiveSlugScanner:
                     
                     # Progress update with current slug info
                     self.tested_count += self.batch_size
-                    progress = (self.tested_count / self.total_combinations) * 100
-                    elapsed = (datetime.now() - datetime.fromisoformat(self.start_time)).total_seconds()
-                    rate = self.tested_count / elapsed if elapsed > 0 else 0
-                    eta = (self.total_combinations - self.tested_count) / rate if rate > 0 else 0
-                    
-                    print(f"📍 CHECKPOINT - Current slug: {slug}")
-                    print(f"📊 Progress: {self.tested_count:,}/{self.total_combinations:,} ({progress:.4f}%)")
-                    print(f"✅ Valid slugs found: {len(self.found_slugs)}")
-                    print(f"⚡ Rate: {rate:.1f} slugs/sec")
-                    print(f"⏰ ETA: {eta/3600:.1f} hours")
-                    print(f"💾 Checkpoint saved at: {datetime.now().strftime('%H:%M:%S')}")
-                    print("-" * 60)
+                    self.print_checkpoint(slug)
                     
                     # Save progress periodically
                     if self.tested_count % (self.batch_size * 10) == 0:
@@ -249,24 +587,84 @@ class ComprehensiveSlugScanner:
         finally:
             self.save_progress()
             self.save_results()
+            self.close_http()
+            self.close_results()
+            self.close_checkpoint()
+            self.close_progress()
+            self.snapshot_state()
+            self.save_progress_json()
             self.print_final_summary()
     
+    def print_checkpoint(self, slug):
+        """Write the checkpoint report in one go - stdout is flushed every few checkpoints, not per line"""
+        progress = (self.tested_count / self.total_combinations) * 100
+        elapsed = time.monotonic() - self.start_monotonic
+        rate = (self.tested_count - self.resumed_count) / elapsed if elapsed > 0 else 0
+        eta = (self.total_combinations - self.tested_count) / rate if rate > 0 else 0
+        
+        sys.stdout.write(
+            f"📍 CHECKPOINT - Current slug: {slug}\n"
+            f"📊 Progress: {self.tested_count:,}/{self.total_combinations:,} ({progress:.4f}%)\n"
+            f"✅ Valid slugs found: {len(self.found_slugs)}\n"
+            f"⚡ Rate: {rate:.1f} slugs/sec\n"
+            f"⏰ ETA: {eta/3600:.1f} hours\n"
+            f"💾 Checkpoint saved at: {datetime.now().strftime('%H:%M:%S')}\n"
+            f"{'-' * 60}\n"
+        )
+        
+        self.checkpoints_since_flush += 1
+        if self.checkpoints_since_flush >= CHECKPOINT_FLUSH_EVERY:
+            sys.stdout.flush()
+            self.checkpoints_since_flush = 0
+    
+    async def probe_batch_async(self, batch):
+        """Probe a whole batch concurrently on the scan's keep-alive client - returns the found results"""
+        if self.http_client is None:
+            self.http_client = self.create_http_client()
+            self.inflight = asyncio.Semaphore(MAX_INFLIGHT)
+        results = await asyncio.gather(*(self.test_slug_api_async(self.http_client, self.inflight, slug) for slug in batch),
+                                       return_exceptions=True)
+        # A probe that raised is skipped like any other error rather than failing the whole batch
+        return [result for result in results if result and not isinstance(result, BaseException)]
+    
     def process_batch(self, batch):
-        """Process a batch of slugs with threading"""
+        """Process a batch of slugs - one async submission with httpx, worker threads otherwise"""
+        if HTTPX_AVAILABLE:
+            if self.event_loop is None:
+                self.event_loop = asyncio.new_event_loop()
+            results = self.event_loop.run_until_complete(self.probe_batch_async(batch))
+            for result in results:
+                print(f"✅ FOUND: {result['slug']} - {result['content_length']} chars")
+            self.found_slugs.extend(results)
+            return
+        
         # Split batch into smaller chunks for workers
         chunk_size = max(1, len(batch) // self.max_workers)
         chunks = [batch[i:i + chunk_size] for i in range(0, len(batch), chunk_size)]
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [executor.submit(self.worker_thread, chunk) for chunk in chunks]
-            
-            for future in as_completed(futures):
-                try:
-                    results = future.result()
-                    with self.lock:
-                        self.found_slugs.extend(results)
-                except Exception as e:
-                    print(f"⚠️  Worker error: {e}")
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = [self.executor.submit(self.worker_thread, chunk) for chunk in chunks]
+        
+        # Results are only ever collected here on the main thread
+        for future in futures:
+            try:
+                self.found_slugs.extend(future.result())
+            except Exception as e:
+                print(f"⚠️  Worker error: {e}")
+    
+    def close_http(self):
+        """Close the scan's async client and event loop, or its worker threads"""
+        if self.event_loop is not None:
+            if self.http_client is not None:
+                self.event_loop.run_until_complete(self.http_client.aclose())
+            self.event_loop.close()
+            self.event_loop = None
+            self.http_client = None
+            self.inflight = None
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
     
     def print_final_summary(self):
         """Print final scan summary"""
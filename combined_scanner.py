@@ -4,19 +4,60 @@ Combined Scanner - Enterprise + Hydreight
 Tests both vsdigital-bookingwidget-prod.azurewebsites.net/b/ and booking.hydreight.com/b/ URLs
 Scans slugs 100-999, tries enterprise first, then Hydreight if enterprise fails
 Comprehensive logging with one line per slug showing results from both platforms
+Pages are fetched over plain HTTP (httpx) and only fall back to Chrome for JS-gated shells
 """
 
 import asyncio
 import json
 import csv
 import os
+import re
+import html
+import atexit
+import shutil
+import tempfile
+import functools
+import sqlite3
+import hashlib
+import threading
 import time
 import socket
 import argparse
-import random
 import string
 import base64
+from collections import OrderedDict
 from datetime import datetime
+
+# Try to import the HTTP fast path - Chrome is used for everything if unavailable
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+    HTTP_TIMEOUT_ERRORS = (httpx.TimeoutException,)
+    HTTP_CONNECTION_ERRORS = (httpx.TransportError,)
+except ImportError:
+    HTTPX_AVAILABLE = False
+    HTTP_TIMEOUT_ERRORS = ()
+    HTTP_CONNECTION_ERRORS = ()
+    print("⚠️  httpx not available, using Chrome only. Install with: pip install 'httpx[http2]'")
+
+try:
+    import h2  # noqa: F401 - only needed so httpx can negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -26,9 +67,113 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Fallback title extraction when selectolax is not installed
+TITLE_PATTERN = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+# The React bootstrap shell - its noscript notice, or a mount node the app hasn't filled yet
+JS_SHELL_MARKER = 'you need to enable javascript'
+EMPTY_MOUNT_PATTERN = re.compile(r'<div\s+id=["\'](?:root|my-widget)["\'][^>]*>\s*</div>', re.IGNORECASE)
+
+# The widget has rendered once it replaces the shell's title (arguments[0]) with a business name or
+# "undefined", mounts its components, or shows the invalid-slug template
+PAGE_RENDERED_SCRIPT = (
+    "const title = document.title.trim();"
+    "const mount = document.querySelector('#root, #my-widget');"
+    "const text = document.body ? document.body.innerText.toLowerCase() : '';"
+    "return (title !== '' && title !== arguments[0])"
+    " || (mount !== null && mount.childElementCount > 0)"
+    " || text.includes('nothing left to do here');")
+
+# Common chromedriver install locations checked when webdriver_manager fails
+CHROMEDRIVER_PATHS = [
+    '/usr/local/bin/chromedriver',
+    '/opt/homebrew/bin/chromedriver',
+    '/usr/bin/chromedriver'
+]
+
+def content_hash(page_source):
+    """64-bit hash of a page body for duplicate detection"""
+    data = page_source.encode('utf-8', 'surrogatepass')
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh64(data).intdigest()
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+# Evidence bits for titled pages - STATUS_TABLE maps every combination to (status, classification)
+EVIDENCE_BUSINESS = 1   # business indicators found
+EVIDENCE_TITLE = 2      # meaningful business title
+EVIDENCE_ERROR = 4      # error indicators found or "undefined" title
+EVIDENCE_CONTENT = 8    # substantial content (>20k chars)
+
+def _classify_evidence(evidence):
+    """Reference decision chain - evaluated once per combination to build STATUS_TABLE"""
+    has_business = evidence & EVIDENCE_BUSINESS
+    has_title = evidence & EVIDENCE_TITLE
+    has_error = evidence & EVIDENCE_ERROR
+    has_content = evidence & EVIDENCE_CONTENT
+    # IMPROVED LOGIC: Require BOTH business indicators AND meaningful title for ACTIVE status
+    # Don't rely solely on content length as pages with "undefined" titles have substantial content
+    if has_business and has_title:
+        # Strong evidence: both business indicators and meaningful title
+        return "ACTIVE", "ACTIVE_BUSINESS"
+    if has_title and not has_error:
+        # Moderate evidence: meaningful title without error indicators
+        return "ACTIVE", "ACTIVE_BUSINESS"
+    if has_error:
+        # Clear error indicators or "undefined" title
+        return "ERROR_PAGE", "UNDEFINED_TITLE_OR_ERROR_INDICATORS"
+    if has_business and has_content:
+        # Business indicators with substantial content but no meaningful title
+        return "ACTIVE", "ACTIVE_BUSINESS_NO_TITLE"
+    return "ERROR_PAGE", "INSUFFICIENT_BUSINESS_EVIDENCE"
+
+STATUS_TABLE = tuple(_classify_evidence(evidence) for evidence in range(16))
+
+# Combined CSV / results table columns - one line per slug
+RESULT_FIELDNAMES = [
+    'slug', 'tested_at',
+    # Enterprise columns
+    'enterprise_status', 'enterprise_business_name', 'enterprise_classification',
+    'enterprise_page_title', 'enterprise_content_length', 'enterprise_load_time',
+    'enterprise_url', 'enterprise_final_url', 'enterprise_business_indicators', 'enterprise_error_indicators',
+    # Hydreight columns
+    'hydreight_status', 'hydreight_business_name', 'hydreight_classification',
+    'hydreight_page_title', 'hydreight_content_length', 'hydreight_load_time',
+    'hydreight_url', 'hydreight_final_url', 'hydreight_business_indicators', 'hydreight_error_indicators',
+    # Summary columns
+    'enterprise_active', 'hydreight_active', 'both_active', 'either_active',
+    'primary_business_name', 'primary_platform'
+]
+
+# SQLite stores booleans as 0/1 - converted back when exporting the CSV
+RESULT_BOOLEAN_FIELDS = ['enterprise_active', 'hydreight_active', 'both_active', 'either_active']
+
+# Resources irrelevant to title/keyword detection - blocked via CDP in the Chrome fallback
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp',
+    '*.woff', '*.woff2', '*.ttf', '*.mp4', '*.webm',
+    '*google-analytics*', '*googletagmanager*', '*facebook.net*', '*hotjar*'
+]
+
+@functools.lru_cache(maxsize=1)
+def _resolve_chromedriver_path():
+    """Resolve the chromedriver binary once - None lets Selenium find the system driver"""
+    try:
+        # First try: Use webdriver_manager
+        return ChromeDriverManager().install()
+    except Exception as e:
+        print(f"⚠️  WebDriver Manager failed: {e}")
+    # Second try: Use explicit path (common locations)
+    for path in CHROMEDRIVER_PATHS:
+        if os.path.exists(path):
+            return path
+    # Third try: Let Selenium locate the system Chrome driver
+    return None
+
 class CombinedScanner:
-    def __init__(self, instance_id="COMBINED_DEFAULT"):
+    def __init__(self, instance_id="COMBINED_DEFAULT", short_circuit=False):
         self.instance_id = instance_id
+        # Skip the Hydreight result once Enterprise is confirmed ACTIVE
+        self.short_circuit = short_circuit
         self.hostname = socket.gethostname()
         self.session_id = f"{self.hostname}_{instance_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
@@ -42,7 +187,17 @@ class CombinedScanner:
         self.base_url = "https://vsdigital-bookingwidget-prod.azurewebsites.net/b/"
         self.rate_limit = 10  # INCREASED from 5 to 10 requests per second
         self.timeout = 10     # REDUCED from 15s to 10s (enterprise URLs are fast)
-        
+
+        # HTTP fast path - server HTML that is only the JS shell (see is_js_gated_shell) goes to Chrome
+        self.http_client = None
+
+        # Chrome fallback waits at most this long after navigation for the widget to render
+        self.render_wait = 5
+
+        # LRU of analyses keyed by page body hash - error pages dominate and stay hot
+        self.page_cache = OrderedDict()
+        self.page_cache_size = 256
+
         # Enhanced error indicators for both platforms
         self.error_indicators = [
             '401', 'error', 'nothing left to do here', 'go to homepage',
@@ -62,6 +217,11 @@ class CombinedScanner:
             'provider', 'patient', 'visit', 'care'
         ]
         
+        # Results are streamed into SQLite instead of being held in memory
+        self.results_db_file = f"logs/{self.session_id}.db"
+        self.results_db = None
+        self.results_insert_sql = None
+
         # Session tracking
         self.session_data = {
             'session_id': self.session_id,
@@ -71,7 +231,7 @@ class CombinedScanner:
             'hydreight_url': self.hydreight_url,
             'instance_id': instance_id,
             'hostname': self.hostname,
-            'results': [],
+            'results_db': self.results_db_file,
             'stats': {
                 'total_tested': 0,
                 'enterprise_active': 0,
@@ -94,6 +254,8 @@ class CombinedScanner:
         self.checkpoint_file = f"logs/CHECKPOINT_COMBINED_{self.session_id}.txt"
         
         self.driver = None
+        self.driver_lock = threading.Lock()
+        self.user_data_dir = None
         
     def generate_base64_slugs(self, start=100, end=999):
         """Generate base64 encoded slugs for the specified range"""
@@ -135,9 +297,15 @@ class CombinedScanner:
         chrome_options.add_argument('--disk-cache-size=0')
         chrome_options.add_argument('--media-cache-size=0')
         
-        # Unique user data directory for parallel execution
-        user_data_dir = f"/tmp/chrome_combined_{self.instance_id}_{random.randint(1000, 9999)}"
-        chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
+        # One user data directory per scanner, on tmpfs when available, removed at exit
+        if self.user_data_dir is None:
+            self.user_data_dir = tempfile.mkdtemp(
+                prefix=f'chrome_combined_{self.instance_id}_',
+                dir='/dev/shm' if os.path.isdir('/dev/shm') else None
+            )
+            atexit.register(shutil.rmtree, self.user_data_dir, ignore_errors=True)
+        chrome_options.add_argument(f'--user-data-dir={self.user_data_dir}')
+        chrome_options.add_argument(f'--disk-cache-dir={os.path.join(self.user_data_dir, "cache")}')
         
         # Performance optimizations
         chrome_options.add_argument('--max_old_space_size=4096')
@@ -145,35 +313,24 @@ class CombinedScanner:
         chrome_options.add_argument('--disable-renderer-backgrounding')
         
         try:
-            # Try multiple approaches for Chrome driver
+            # Driver path is resolved once per process and shared by every instance
+            driver_path = _resolve_chromedriver_path()
+            service = Service(driver_path) if driver_path else Service()
             try:
-                # First try: Use webdriver_manager
-                service = Service(ChromeDriverManager().install())
                 self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            except Exception as e1:
-                print(f"⚠️  WebDriver Manager failed: {e1}")
-                try:
-                    # Second try: Use system Chrome driver
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                except Exception as e2:
-                    print(f"⚠️  System Chrome driver failed: {e2}")
-                    # Third try: Use explicit path (common locations)
-                    chrome_paths = [
-                        '/usr/local/bin/chromedriver',
-                        '/opt/homebrew/bin/chromedriver',
-                        '/usr/bin/chromedriver'
-                    ]
-                    driver_found = False
-                    for path in chrome_paths:
-                        if os.path.exists(path):
-                            service = Service(path)
-                            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                            driver_found = True
-                            break
-                    if not driver_found:
-                        raise Exception("No Chrome driver found in common locations")
+            except Exception:
+                # Cached path may be stale (e.g. chromedriver upgraded) - re-resolve next time
+                _resolve_chromedriver_path.cache_clear()
+                raise
             
             self.driver.set_page_load_timeout(self.timeout)
+            # Page domain is used by navigate() for CDP-driven page loads
+            self.driver.execute_cdp_cmd('Page.enable', {})
+            # Block images/fonts/media/trackers once per session (--disable-images is
+            # unreliable in modern headless Chrome); HTML and JS still load normally
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+            self.driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
             print(f"✅ Chrome driver initialized for Combined Scanner {self.instance_id}")
             return True
         except Exception as e:
@@ -182,7 +339,8 @@ class CombinedScanner:
             return False
     
     def clear_browser_cache(self):
-        """Clear browser cache and cookies between requests for clean sessions"""
+        """Clear cookies and storage between requests for clean sessions
+        (the HTTP cache is disabled once in setup_driver)"""
         try:
             # Clear cookies
             self.driver.delete_all_cookies()
@@ -190,38 +348,126 @@ class CombinedScanner:
             # Clear local storage and session storage
             self.driver.execute_script("window.localStorage.clear();")
             self.driver.execute_script("window.sessionStorage.clear();")
-            
-            # Clear cache via Chrome DevTools Protocol if available
-            try:
-                self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
-                self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
-            except:
-                pass  # CDP commands might not be available in all setups
                 
         except Exception as e:
             # If clearing fails, it's not critical - continue scanning
             pass
     
-    def analyze_page_content(self, slug, url, platform_name):
-        """Analyze page content to determine if business is active"""
+    def create_http_client(self):
+        """Create the shared HTTP/2 client used for the fast path"""
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=256, max_keepalive_connections=64),
+            timeout=self.timeout,
+            follow_redirects=True
+        )
+
+    def extract_title(self, page_html):
+        """Extract the <title> text from raw HTML"""
+        if SELECTOLAX_AVAILABLE:
+            title_node = HTMLParser(page_html).css_first('title')
+            return title_node.text(strip=True) if title_node else ''
+        match = TITLE_PATTERN.search(page_html)
+        return html.unescape(match.group(1)).strip() if match else ''
+
+    def is_js_gated_shell(self, page_html):
+        """Check if server HTML is just a JavaScript bootstrap shell - by its markers, whatever its size"""
+        return JS_SHELL_MARKER in page_html.lower() or EMPTY_MOUNT_PATTERN.search(page_html) is not None
+
+    async def fetch_page_http(self, url):
+        """Fetch a page over plain HTTP - returns (page_source, page_title, final_url)"""
+        response = await self.http_client.get(url)
+        page_html = response.text
+        return page_html, self.extract_title(page_html), str(response.url)
+
+    def ensure_driver(self):
+        """Start Chrome on first use so HTTP-only scans never pay for it"""
+        if self.driver is None and not self.setup_driver():
+            raise Exception("Chrome driver unavailable for JS fallback")
+
+    def navigate(self, url):
+        """Navigate via CDP and return the new document's (shell) title as soon as it is interactive.
+        driver.get() would block until readyState == 'complete', which on the booking
+        widgets often waits on analytics / long-poll XHRs."""
+        # Marker on the old document - it is gone once the new page has committed
+        self.driver.execute_script("window.__vsdhPendingNav = true;")
+        navigation = self.driver.execute_cdp_cmd('Page.navigate', {'url': url, 'transitionType': 'typed'})
+        if navigation.get('errorText'):
+            raise WebDriverException(f"Navigation failed: {navigation['errorText']}")
+        
+        deadline = time.time() + self.timeout
+        while time.time() < deadline:
+            state, title = self.driver.execute_script(
+                "return window.__vsdhPendingNav ? ['pending', ''] : [document.readyState, document.title.trim()]")
+            if state in ('interactive', 'complete'):
+                return title
+            time.sleep(0.1)
+        raise TimeoutException(f"Page not interactive after {self.timeout}s")
+
+    def wait_for_render(self, shell_title):
+        """Wait until the widget has rendered past the bootstrap shell (render_wait cap, 100ms polls)"""
         try:
-            start_time = time.time()
-            
+            WebDriverWait(self.driver, self.render_wait, poll_frequency=0.1).until(
+                lambda d: d.execute_script(PAGE_RENDERED_SCRIPT, shell_title))
+        except TimeoutException:
+            # Nothing rendered in time - classify whatever is there, as the fixed sleep did
+            print(f"   ⏳ Page still showed the JS shell after {self.render_wait}s")
+
+    def fetch_page_browser(self, url):
+        """Fetch a page with Chrome - returns (page_source, page_title, final_url)"""
+        # Both platforms may fall back at once - the single driver serves them in turn.
+        # A thread lock (not asyncio) so a cancelled caller can't release it mid-navigation.
+        with self.driver_lock:
+            self.ensure_driver()
+
             # Clear cache before each request for clean session
             self.clear_browser_cache()
-            
-            # Navigate to the URL
+
+            shell_title = self.navigate(url)
+            self.wait_for_render(shell_title)
+
+            return self.driver.page_source, self.driver.title, self.driver.current_url
+
+    async def fetch_page_browser_gated(self, url, browser_gate):
+        """Run fetch_page_browser once browser_gate is set - a task cancelled while waiting never starts Chrome"""
+        if browser_gate is not None:
+            await browser_gate.wait()
+        return await asyncio.to_thread(self.fetch_page_browser, url)
+
+    async def analyze_page_content(self, slug, url, platform_name, browser_gate=None):
+        """Analyze page content to determine if business is active - a Chrome fallback waits for browser_gate if given"""
+        try:
+            start_time = time.time()
+
+            # Navigate to the URL - HTTP first, Chrome only for JS-gated shells
             print(f"   🌐 Testing {platform_name}: {url}")
-            self.driver.get(url)
-            
-            # SAFETY OPTIMIZATION: Increased wait time to 5s for proper page loading
-            # We prioritize data accuracy over speed
-            time.sleep(5)
-            
+            page_source = None
+            if self.http_client is not None:
+                page_source, page_title, final_url = await self.fetch_page_http(url)
+                if self.is_js_gated_shell(page_source):
+                    print(f"   🧩 {platform_name} returned a JS shell, falling back to Chrome")
+                    page_source = None
+            if page_source is None:
+                page_source, page_title, final_url = await self.fetch_page_browser_gated(url, browser_gate)
+
+            # Identical bodies (mostly the shared error page) reuse the earlier analysis
+            cache_key = (platform_name, page_title, content_hash(page_source))
+            cached = self.page_cache.get(cache_key)
+            if cached is not None:
+                self.page_cache.move_to_end(cache_key)
+                result = dict(cached)
+                result.update({
+                    'slug': slug,
+                    'url': url,
+                    'final_url': final_url,
+                    'load_time': time.time() - start_time,
+                    'tested_at': datetime.now().isoformat()
+                })
+                print(f"   ♻️  {platform_name} Result (cached page): {result['status']} - {result['business_name']}")
+                return result
+
             # Get page source and basic metrics
-            page_source = self.driver.page_source.lower()
-            page_title = self.driver.title
-            final_url = self.driver.current_url
+            page_source = page_source.lower()
             content_length = len(page_source)
             load_time = time.time() - start_time
             
@@ -248,35 +494,19 @@ class CombinedScanner:
             else:
                 # Check if we have a meaningful business title or substantial content
                 # FIXED: "undefined" is NOT a meaningful business title - it's an error indicator
-                has_business_title = (page_title and len(page_title) > 3 and 
-                                    page_title.lower() not in ['loading', 'error', 'undefined'])
+                title_lower = page_title.lower()
+                has_business_title = len(page_title) > 3 and title_lower not in ('loading', 'error', 'undefined')
                 has_substantial_content = content_length > 20000  # Both platforms have large pages when active
+                has_error_evidence = title_lower == 'undefined' or bool(error_indicators_found)
                 
-                # IMPROVED LOGIC: Require BOTH business indicators AND meaningful title for ACTIVE status
-                # Don't rely solely on content length as pages with "undefined" titles have substantial content
-                if business_indicators_found and has_business_title:
-                    # Strong evidence: both business indicators and meaningful title
-                    status = "ACTIVE"
-                    classification = "ACTIVE_BUSINESS"
-                    business_name = self.extract_business_name(page_source, page_title, platform_name)
-                elif has_business_title and not error_indicators_found:
-                    # Moderate evidence: meaningful title without error indicators
-                    status = "ACTIVE"
-                    classification = "ACTIVE_BUSINESS"
-                    business_name = self.extract_business_name(page_source, page_title, platform_name)
-                elif page_title.lower() == 'undefined' or error_indicators_found:
-                    # Clear error indicators or "undefined" title
-                    status = "ERROR_PAGE"
-                    classification = "UNDEFINED_TITLE_OR_ERROR_INDICATORS"
-                    business_name = ""
-                elif business_indicators_found and has_substantial_content:
-                    # Business indicators with substantial content but no meaningful title
-                    status = "ACTIVE"
-                    classification = "ACTIVE_BUSINESS_NO_TITLE"
+                evidence = ((EVIDENCE_BUSINESS if business_indicators_found else 0) |
+                            (EVIDENCE_TITLE if has_business_title else 0) |
+                            (EVIDENCE_ERROR if has_error_evidence else 0) |
+                            (EVIDENCE_CONTENT if has_substantial_content else 0))
+                status, classification = STATUS_TABLE[evidence]
+                if status == "ACTIVE":
                     business_name = self.extract_business_name(page_source, page_title, platform_name)
                 else:
-                    status = "ERROR_PAGE"
-                    classification = "INSUFFICIENT_BUSINESS_EVIDENCE"
                     business_name = ""
             
             print(f"   🤖 {platform_name} Result: {status} - {business_name}")
@@ -301,9 +531,13 @@ class CombinedScanner:
                 'platform': platform_name
             }
             
-            return result
+            self.page_cache[cache_key] = result
+            if len(self.page_cache) > self.page_cache_size:
+                self.page_cache.popitem(last=False)
             
-        except TimeoutException as e:
+            return dict(result)
+            
+        except (TimeoutException, *HTTP_TIMEOUT_ERRORS) as e:
             print(f"⏰ TIMEOUT after {self.timeout}s")
             return {
                 'slug': slug,
@@ -324,7 +558,7 @@ class CombinedScanner:
                 'tested_at': datetime.now().isoformat(),
                 'platform': platform_name
             }
-        except WebDriverException as e:
+        except (WebDriverException, *HTTP_CONNECTION_ERRORS) as e:
             print(f"🌐 CONNECTION_ERROR: {str(e)[:50]}...")
             return {
                 'slug': slug,
@@ -341,7 +575,7 @@ class CombinedScanner:
                 'content_length': 0,
                 'load_time': 0,
                 'content_preview': '',
-                'error_details': f"WebDriver error: {str(e)}",
+                'error_details': f"Connection error: {str(e)}",
                 'tested_at': datetime.now().isoformat(),
                 'platform': platform_name
             }
@@ -393,37 +627,50 @@ class CombinedScanner:
         
         return ""
 
-    def save_session_data(self):
-        """Save comprehensive session data to multiple formats"""
+    def open_results_db(self):
+        """Open the SQLite results sink - one row per slug, written as it is scanned"""
+        self.results_db = sqlite3.connect(self.results_db_file)
+        self.results_db.execute('PRAGMA journal_mode=WAL')
+        self.results_db.execute('PRAGMA synchronous=NORMAL')
+        columns = ', '.join(RESULT_FIELDNAMES)
+        self.results_db.execute(f'CREATE TABLE IF NOT EXISTS results ({columns})')
+        placeholders = ', '.join('?' * len(RESULT_FIELDNAMES))
+        self.results_insert_sql = f'INSERT INTO results ({columns}) VALUES ({placeholders})'
+
+    def store_result(self, combined_result):
+        """Append one combined result row to the results DB"""
+        self.results_db.execute(self.results_insert_sql,
+                                tuple(combined_result[k] for k in RESULT_FIELDNAMES))
+
+    def export_results_csv(self, results_filename):
+        """Stream the results table into the combined CSV format"""
+        bool_columns = [RESULT_FIELDNAMES.index(k) for k in RESULT_BOOLEAN_FIELDS]
+        with open(results_filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(RESULT_FIELDNAMES)
+            cursor = self.results_db.execute(f"SELECT {', '.join(RESULT_FIELDNAMES)} FROM results ORDER BY rowid")
+            for row in cursor:
+                row = list(row)
+                for idx in bool_columns:
+                    row[idx] = bool(row[idx])
+                writer.writerow(row)
+
+    def save_session_data(self, final=False):
+        """Save session data - the results CSV is exported from the DB at shutdown only"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if self.results_db is not None:
+            self.results_db.commit()
         
-        # Save JSON session data
+        # Save JSON session data (results live in the SQLite DB)
         session_filename = f"logs/SESSION_COMBINED_{self.session_id}_{timestamp}_session.json"
         with open(session_filename, 'w', encoding='utf-8') as f:
             json.dump(self.session_data, f, indent=2, ensure_ascii=False)
         
         # Save CSV results (combined format - one line per slug)
         results_filename = f"logs/SESSION_COMBINED_{self.session_id}_{timestamp}_results.csv"
-        if self.session_data['results']:
-            fieldnames = [
-                'slug', 'tested_at',
-                # Enterprise columns
-                'enterprise_status', 'enterprise_business_name', 'enterprise_classification',
-                'enterprise_page_title', 'enterprise_content_length', 'enterprise_load_time',
-                'enterprise_url', 'enterprise_final_url', 'enterprise_business_indicators', 'enterprise_error_indicators',
-                # Hydreight columns  
-                'hydreight_status', 'hydreight_business_name', 'hydreight_classification',
-                'hydreight_page_title', 'hydreight_content_length', 'hydreight_load_time',
-                'hydreight_url', 'hydreight_final_url', 'hydreight_business_indicators', 'hydreight_error_indicators',
-                # Summary columns
-                'enterprise_active', 'hydreight_active', 'both_active', 'either_active',
-                'primary_business_name', 'primary_platform'
-            ]
-            
-            with open(results_filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(self.session_data['results'])
+        export_csv = final and self.results_db is not None and self.session_data['stats']['total_tested'] > 0
+        if export_csv:
+            self.export_results_csv(results_filename)
         
         # Save progress summary
         progress_filename = f"logs/SESSION_COMBINED_{self.session_id}_{timestamp}_progress.json"
@@ -438,12 +685,20 @@ class CombinedScanner:
         
         print(f"📊 Session data saved:")
         print(f"   Session: {session_filename}")
-        if self.session_data['results']:
+        print(f"   Results DB: {self.results_db_file}")
+        if export_csv:
             print(f"   Results: {results_filename}")
         print(f"   Progress: {progress_filename}")
     
     def scan_slugs(self, slugs=None, resume=True):
         """Scan a list of slugs with checkpoint/resume functionality"""
+        try:
+            asyncio.run(self.scan_slugs_async(slugs, resume))
+        except KeyboardInterrupt:
+            pass  # Progress was already saved by scan_slugs_async
+
+    async def scan_slugs_async(self, slugs=None, resume=True):
+        """Async scan loop - HTTP fetches share one pooled client"""
         if slugs is None:
             # Generate slugs 100-999 by default
             slugs = self.generate_base64_slugs(100, 999)
@@ -456,25 +711,31 @@ class CombinedScanner:
         print(f"⚡ Rate limit: {self.rate_limit} requests/second")
         print(f"📋 Checkpoint every: {self.session_data['checkpoint_info']['checkpoint_frequency']} scans")
         
-        if not self.setup_driver():
+        if HTTPX_AVAILABLE:
+            # Chrome is only started lazily if a page turns out to be a JS shell
+            self.http_client = self.create_http_client()
+            print(f"⚡ HTTP fast path enabled (HTTP/2: {HTTP2_AVAILABLE})")
+        elif not self.setup_driver():
             print("❌ Failed to setup driver, aborting scan")
             return
         
+        self.open_results_db()
         print("=" * 80)
         
+        i = 0
         try:
             for i, slug in enumerate(slugs, 1):
                 # Rate limiting
                 if i > 1:
-                    time.sleep(1.0 / self.rate_limit)
+                    await asyncio.sleep(1.0 / self.rate_limit)
                 
                 print(f"\n🔍 [{i}/{len(slugs)}] Processing slug: {slug}")
                 
                 # Scan both platforms
-                combined_result, enterprise_result, hydreight_result = self.scan_combined_slug(slug)
+                combined_result, enterprise_result, hydreight_result = await self.scan_combined_slug(slug)
                 
                 # Store results
-                self.session_data['results'].append(combined_result)
+                self.store_result(combined_result)
                 
                 # Update statistics
                 self.session_data['stats']['total_tested'] += 1
@@ -514,15 +775,20 @@ class CombinedScanner:
                 if i % 25 == 0:
                     self.save_session_data()
         
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print(f"\n⚠️  Scan interrupted by user at {i}/{len(slugs)}")
         except Exception as e:
             print(f"\n❌ Unexpected error during scan: {e}")
         finally:
             # Final save and cleanup
             self.session_data['end_time'] = datetime.now().isoformat()
-            self.save_session_data()
+            self.save_session_data(final=True)
+            self.results_db.close()
+            self.results_db = None
             
+            if self.http_client is not None:
+                await self.http_client.aclose()
+                self.http_client = None
             if self.driver:
                 self.driver.quit()
             
@@ -544,17 +810,57 @@ class CombinedScanner:
                 print(f"   📈 Hydreight Success Rate: {(stats['hydreight_active']/stats['total_tested']*100):.2f}%")
                 print(f"   📈 Combined Success Rate: {((stats['enterprise_active'] + stats['hydreight_active'])/stats['total_tested']*100):.2f}%")
 
-    def scan_combined_slug(self, slug):
+    def skipped_result(self, slug, url, platform_name):
+        """Placeholder result for a platform skipped by --short-circuit"""
+        return {
+            'slug': slug,
+            'url': url,
+            'final_url': '',
+            'status': 'SKIPPED',
+            'classification': 'SKIPPED_ENTERPRISE_ACTIVE',
+            'business_name': '',
+            'business_indicators': 0,
+            'error_indicators': 0,
+            'indicators_found': [],
+            'error_indicators_found': [],
+            'page_title': '',
+            'content_length': 0,
+            'load_time': 0,
+            'content_preview': '',
+            'tested_at': datetime.now().isoformat(),
+            'platform': platform_name
+        }
+
+    async def scan_combined_slug(self, slug):
         """Scan a single slug on both platforms with fallback logic"""
         print(f"🔍 Testing slug: {slug}")
         
-        # Step 1: Try Enterprise first
+        # Both platforms are independent hosts - fetch them concurrently
         enterprise_url = f"{self.enterprise_url}{slug}"
-        enterprise_result = self.analyze_page_content(slug, enterprise_url, "Enterprise")
-        
-        # Step 2: Try Hydreight (always test both for comprehensive data)
         hydreight_url = f"{self.hydreight_url}{slug}"
-        hydreight_result = self.analyze_page_content(slug, hydreight_url, "Hydreight")
+        if self.short_circuit:
+            # Hydreight's HTTP fetch runs alongside Enterprise; its Chrome fallback waits for the Enterprise verdict
+            hydreight_gate = asyncio.Event()
+            hydreight_task = asyncio.create_task(
+                self.analyze_page_content(slug, hydreight_url, "Hydreight", hydreight_gate))
+            try:
+                enterprise_result = await self.analyze_page_content(slug, enterprise_url, "Enterprise")
+            except BaseException:
+                hydreight_task.cancel()
+                raise
+            if enterprise_result['status'] == 'ACTIVE' and not hydreight_task.done():
+                # Strong Enterprise hit - don't wait for Hydreight or spend Chrome time on it
+                hydreight_task.cancel()
+                hydreight_result = self.skipped_result(slug, hydreight_url, "Hydreight")
+            else:
+                hydreight_gate.set()
+                hydreight_result = await hydreight_task
+        else:
+            # Always test both for comprehensive data
+            enterprise_result, hydreight_result = await asyncio.gather(
+                self.analyze_page_content(slug, enterprise_url, "Enterprise"),
+                self.analyze_page_content(slug, hydreight_url, "Hydreight")
+            )
         
         # Create combined result for CSV logging
         combined_result = {
@@ -609,9 +915,17 @@ def main():
     parser.add_argument('--file', help='File containing slugs (one per line)')
     parser.add_argument('--instance-id', default='COMBINED_DEFAULT', help='Instance identifier for parallel execution')
     parser.add_argument('--no-resume', action='store_true', help='Start fresh scan (ignore checkpoints)')
+    parser.add_argument('--short-circuit', action='store_true', help='Skip Hydreight once Enterprise is ACTIVE for a slug')
     
     args = parser.parse_args()
     
+    # Use libuv's event loop for the HTTP fast path when available (not on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     # Ensure logs directory exists
     os.makedirs('logs', exist_ok=True)
     
@@ -640,7 +954,7 @@ def main():
         return
     
     # Create and run scanner
-    scanner = CombinedScanner(instance_id=args.instance_id)
+    scanner = CombinedScanner(instance_id=args.instance_id, short_circuit=args.short_circuit)
     scanner.scan_slugs(slugs_to_scan, resume=not args.no_resume)
 
 if __name__ == "__main__":
@@ -3,19 +3,73 @@
 Combined Scanner Self-Tester
 Tests the combined scanner with known slugs to verify it's working correctly
 Tests 3 slugs: aaaa (expected: invalid), MzYz and NDgz (expected: valid)
+Pages are fetched over async HTTP (httpx); Chrome is only used for JS-rendered shells
 """
 
 import asyncio
 import json
 import csv
 import os
+import sys
+import queue
+import logging
+import logging.handlers
+import sqlite3
+import re
+import html
+import threading
 import time
 import socket
 import argparse
 import random
 import string
 import base64
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlsplit
+
+# Try to import the async HTTP client - Chrome is used for everything if unavailable
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+    HTTP_TIMEOUT_ERRORS = (httpx.TimeoutException,)
+    HTTP_CONNECTION_ERRORS = (httpx.TransportError,)
+except ImportError:
+    HTTPX_AVAILABLE = False
+    HTTP_TIMEOUT_ERRORS = ()
+    HTTP_CONNECTION_ERRORS = ()
+    print("⚠️  httpx not available, using Chrome only. Install with: pip install httpx")
+
+# Console output is routed through a queue so fetch paths never block on terminal I/O
+logger = logging.getLogger('combined_self_tester')
+
+def start_log_listener():
+    """Attach a QueueHandler to this module's logger and start the listener thread that writes to stdout"""
+    log_queue = queue.Queue(-1)
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(message)s'))
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener = logging.handlers.QueueListener(log_queue, console)
+    listener.start()
+    return listener
+
+# Try to import orjson for faster session dumps - falls back to the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import Aho-Corasick for single-pass indicator scanning
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -25,11 +79,193 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
+class RateLimiter:
+    """Thread-safe token bucket (capacity 1) - spaces requests 1/rate seconds apart"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+    
+    def reserve(self):
+        """Reserve the next slot and return how long to wait for it"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        return slot - now
+    
+    def acquire(self):
+        """Block until the next slot"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+# Title is read straight from the raw response bytes
+TITLE_PATTERN = re.compile(rb'<title[^>]*>([^<]+)', re.IGNORECASE)
+
+# Session/results files are written through a 1MB buffer - a handful of syscalls per file
+WRITE_BUFFER_SIZE = 1 << 20
+
+def dump_json(data, filename, indent=True):
+    """Write data as UTF-8 JSON - orjson when available, stdlib json otherwise"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            json.dump(data, f, indent=2 if indent else None, ensure_ascii=False)
+
+# Columns of the streamed results CSV - one row per test slug
+RESULT_FIELDNAMES = [
+    'slug', 'description', 'tested_at',
+    'enterprise_expected', 'enterprise_actual', 'enterprise_passed',
+    'enterprise_business_name', 'enterprise_page_title', 'enterprise_content_length', 'enterprise_load_time',
+    'enterprise_cached',
+    'hydreight_expected', 'hydreight_actual', 'hydreight_passed',
+    'hydreight_business_name', 'hydreight_page_title', 'hydreight_content_length', 'hydreight_load_time',
+    'hydreight_cached',
+    'overall_passed'
+]
+
+# Business-name keywords in one case-insensitive pass - the lookahead reports overlapping hits too
+BUSINESS_NAME_PATTERN = re.compile(
+    r'(?=(?P<dripbar>dripbar)|(?P<renivate>renivate)|(?P<hydreight>hydreight)'
+    r'|(?P<iv_therapy>iv therapy)|(?P<direct>direct)|(?P<location>location))', re.IGNORECASE)
+
+# Common chromedriver install locations checked when webdriver_manager fails
+CHROMEDRIVER_PATHS = [
+    '/usr/local/bin/chromedriver',
+    '/opt/homebrew/bin/chromedriver',
+    '/usr/bin/chromedriver'
+]
+
+# Resources irrelevant to title/indicator detection - blocked via CDP in the Chrome fallback
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg',
+    '*.woff', '*.woff2', '*.ttf', '*.mp4', '*.webm', '*.css'
+]
+
+# Resolved driver path is persisted here so later runs skip webdriver_manager's version probe
+CHROMEDRIVER_CACHE_FILE = os.path.expanduser('~/.cache/vsdh_chromedriver_path')
+_chromedriver_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _resolve_chromedriver_path_locked():
+    """CHROMEDRIVER_PATH env var, then the cached path, then webdriver_manager (persisted),
+    then common locations - None lets Selenium find the system driver"""
+    env_path = os.environ.get('CHROMEDRIVER_PATH')
+    if env_path and os.path.exists(env_path):
+        return env_path
+    
+    try:
+        with open(CHROMEDRIVER_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached_path = f.read().strip()
+        if cached_path and os.path.exists(cached_path):
+            return cached_path
+    except OSError:
+        pass
+    
+    try:
+        driver_path = ChromeDriverManager().install()
+        try:
+            os.makedirs(os.path.dirname(CHROMEDRIVER_CACHE_FILE), exist_ok=True)
+            with open(CHROMEDRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+                f.write(driver_path)
+        except OSError:
+            pass  # Not critical - the path is simply resolved again next run
+        return driver_path
+    except Exception as e:
+        logger.warning(f"⚠️  WebDriver Manager failed: {e}")
+    
+    for path in CHROMEDRIVER_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+def _resolve_chromedriver_path():
+    """Resolve the chromedriver binary once per process (pool threads share the result)"""
+    with _chromedriver_lock:
+        return _resolve_chromedriver_path_locked()
+
+def _forget_chromedriver_path():
+    """Drop a stale driver path so the next setup resolves it again"""
+    with _chromedriver_lock:
+        _resolve_chromedriver_path_locked.cache_clear()
+        try:
+            os.remove(CHROMEDRIVER_CACHE_FILE)
+        except OSError:
+            pass
+
+# Placeholder titles served while the widget loads or on errors - never a business name
+PLACEHOLDER_TITLES = frozenset({'', 'loading', 'error', 'undefined'})
+
+# The React bootstrap shell - its noscript notice, or a mount node the app hasn't filled yet
+JS_SHELL_MARKER = 'you need to enable javascript'
+EMPTY_MOUNT_PATTERN = re.compile(r'<div\s+id=["\'](?:root|my-widget)["\'][^>]*>\s*</div>', re.IGNORECASE)
+
+# Invalid-slug template text - found near the top of the body it marks an ERROR_PAGE outright
+ERROR_TEMPLATE_MARKER = 'nothing left to do here'
+# Rendered pages carry ~18K of <head> and injected CSS before the body - the fast reject window starts here
+BODY_TAG_PATTERN = re.compile(r'<body\b', re.IGNORECASE)
+FAST_REJECT_BODY_CHARS = 4096
+
+def has_error_template(page_source, window):
+    """Check the first `window` chars of the <body> (the whole page start if there is none) for the error template"""
+    body = BODY_TAG_PATTERN.search(page_source)
+    start = body.start() if body else 0
+    return ERROR_TEMPLATE_MARKER in page_source[start:start + window].lower()
+
+# Enhanced error indicators for both platforms
+ERROR_INDICATORS = (
+    '401', 'error', 'nothing left to do here', 'go to homepage',
+    'not found', 'access denied', 'unauthorized',
+    "the link you've opened isn't working as expected",
+    'page not found', 'invalid request', 'session expired',
+    'service unavailable', 'temporarily unavailable'
+)
+
+# Business indicators optimized for both platforms
+BUSINESS_INDICATORS = (
+    'book', 'appointment', 'schedule', 'service', 'therapy',
+    'treatment', 'consultation', 'booking', 'available',
+    'select', 'choose', 'weight loss', 'injection', 'iv therapy',
+    'dripbar', 'hydreight', 'semaglutide', 'tirzepatide', 'hormone',
+    'wellness', 'health', 'medical', 'clinic',
+    'provider', 'patient', 'visit', 'care'
+)
+
+@functools.lru_cache(maxsize=1)
+def build_indicator_automaton():
+    """Build one Aho-Corasick automaton over error + business indicators"""
+    automaton = ahocorasick.Automaton()
+    for kind, indicators in (('error', ERROR_INDICATORS), ('business', BUSINESS_INDICATORS)):
+        for indicator in indicators:
+            automaton.add_word(indicator.lower(), (kind, indicator))
+    automaton.make_automaton()
+    return automaton
+
+@functools.lru_cache(maxsize=1)
+def build_indicator_pattern():
+    """Case-insensitive regex over all indicators - used when pyahocorasick is missing.
+    The lookahead tries every position; shorter indicators contained in a longer
+    match (e.g. 'book' in 'booking') are added back via the closure map."""
+    indicators = ERROR_INDICATORS + BUSINESS_INDICATORS
+    alternation = '|'.join(re.escape(i) for i in sorted(indicators, key=len, reverse=True))
+    closure = {i.lower(): {j for j in indicators if j.lower() in i.lower()} for i in indicators}
+    return re.compile(f'(?=({alternation}))', re.IGNORECASE), closure
+
+# Only definitive outcomes are cached across runs - timeouts and connection errors are retried
+CACHEABLE_STATUSES = ('ACTIVE', 'ERROR_PAGE')
+
 class CombinedSelfTester:
-    def __init__(self, instance_id="COMBINED_SELFTEST"):
+    def __init__(self, instance_id="COMBINED_SELFTEST", cache_ttl=0):
         self.instance_id = instance_id
         self.hostname = socket.gethostname()
         self.session_id = f"{self.hostname}_{instance_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.log = logger
+        self._ts_cache = (0, '')  # (epoch second, ISO string) reused by now_iso()
+        self.log_listener = start_log_listener()
         
         # Dual URL configuration - SAFETY OPTIMIZED
         self.enterprise_url = "https://vsdigital-bookingwidget-prod.azurewebsites.net/b/"
@@ -42,24 +278,19 @@ class CombinedSelfTester:
         self.rate_limit = 10  # INCREASED from 5 to 10 requests per second
         self.timeout = 10     # REDUCED from 15s to 10s (enterprise URLs are fast)
         
-        # Enhanced error indicators for both platforms
-        self.error_indicators = [
-            '401', 'error', 'nothing left to do here', 'go to homepage',
-            'not found', 'access denied', 'unauthorized',
-            "the link you've opened isn't working as expected",
-            'page not found', 'invalid request', 'session expired',
-            'service unavailable', 'temporarily unavailable'
-        ]
+        # HTTP fast path - responses that are only the JS shell (see is_js_gated_shell) go through Chrome instead
+        # Fast reject window - the error template marker sits near the top of an invalid slug's <body>
+        self.fast_reject_body_chars = FAST_REJECT_BODY_CHARS
         
-        # Business indicators optimized for both platforms
-        self.business_indicators = [
-            'book', 'appointment', 'schedule', 'service', 'therapy',
-            'treatment', 'consultation', 'booking', 'available',
-            'select', 'choose', 'weight loss', 'injection', 'iv therapy',
-            'dripbar', 'hydreight', 'semaglutide', 'tirzepatide', 'hormone',
-            'wellness', 'health', 'medical', 'clinic',
-            'provider', 'patient', 'visit', 'care'
-        ]
+        # Indicators live in the header or the footer error template - only these windows are scanned
+        self.scan_head_chars = 32768
+        self.scan_tail_chars = 8192
+        self.http_client = None
+        self.http_semaphores = {}
+        
+        # All indicators compiled into one automaton - a single pass over the page (built once per process)
+        self.indicator_automaton = build_indicator_automaton() if AHOCORASICK_AVAILABLE else None
+        self.indicator_pattern, self.indicator_closure = build_indicator_pattern()
         
         # Test slugs with expected results
         self.test_slugs = [
@@ -71,30 +302,62 @@ class CombinedSelfTester:
         # Session tracking
         self.session_data = {
             'session_id': self.session_id,
-            'start_time': datetime.now().isoformat(),
+            'start_time': self.now_iso(),
             'scanner_type': 'Combined_Self_Tester',
             'enterprise_url': self.enterprise_url,
             'hydreight_url': self.hydreight_url,
             'instance_id': instance_id,
             'hostname': self.hostname,
-            'test_results': [],
+            'results_file': f"logs/SELFTEST_COMBINED_{self.session_id}_results.csv",
             'test_summary': {
                 'total_tests': 0,
                 'passed_tests': 0,
                 'failed_tests': 0,
                 'enterprise_tests': 0,
                 'hydreight_tests': 0,
+                'cached_results': 0,
                 'errors': 0
             }
         }
         
+        # Results are streamed to CSV as each test completes - only the summary counters stay in memory
+        self.results_file = self.session_data['results_file']
+        self.results_fh = None
+        self.results_writer = None
+        self.results_written = 0
+        self.results_flush_every = 50
+        
         # Checkpoint file for resume functionality
         self.checkpoint_file = f"logs/CHECKPOINT_COMBINED_{self.session_id}.txt"
         
-        self.driver = None
-        
+        # Chrome fallback runs on a thread pool, one driver per worker thread
+        self.browser_workers = 3
+        self.browser_pool = None
+        self.thread_local = threading.local()
+        self.drivers = []
+        self.drivers_lock = threading.Lock()
+        
+        # Global request rate (HTTP + Chrome) stays <= rate_limit
+        self.rate_limiter = RateLimiter(self.rate_limit)
+        
+        # Persistent (slug, platform) result cache - known slugs are not re-fetched within the TTL
+        self.scan_cache_file = "logs/scan_cache.sqlite"
+        self.cache_ttl = cache_ttl
+        self.scan_cache = None
+        if self.cache_ttl > 0:
+            self.open_scan_cache()
+        
+    def now_iso(self):
+        """Current time as an ISO string at one-second resolution - formatted once per wall-clock second"""
+        t = int(time.time())
+        ts_cache = self._ts_cache
+        if ts_cache[0] != t:
+            ts_cache = (t, datetime.fromtimestamp(t).isoformat())
+            self._ts_cache = ts_cache
+        return ts_cache[1]
+    
     def setup_driver(self):
-        """Setup Chrome driver with safety optimizations"""
+        """Create a Chrome driver with safety optimizations - returns None on failure"""
         chrome_options = Options()
         chrome_options.add_argument('--headless')
         chrome_options.add_argument('--no-sandbox')
@@ -133,127 +396,249 @@ class CombinedSelfTester:
         chrome_options.add_argument('--disable-background-timer-throttling')
         chrome_options.add_argument('--disable-renderer-backgrounding')
         
+        # Return from driver.get() at DOMContentLoaded - wait_for_page_ready handles the rest
+        chrome_options.set_capability('pageLoadStrategy', 'eager')
+        
         try:
-            # Try multiple approaches for Chrome driver
+            # Driver path is resolved once and persisted - no webdriver_manager probe on later runs
+            driver_path = _resolve_chromedriver_path()
+            service = Service(driver_path) if driver_path else Service()
             try:
-                # First try: Use webdriver_manager
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            except Exception as e1:
-                print(f"⚠️  WebDriver Manager failed: {e1}")
-                try:
-                    # Second try: Use system Chrome driver
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                except Exception as e2:
-                    print(f"⚠️  System Chrome driver failed: {e2}")
-                    # Third try: Use explicit path (common locations)
-                    chrome_paths = [
-                        '/usr/local/bin/chromedriver',
-                        '/opt/homebrew/bin/chromedriver',
-                        '/usr/bin/chromedriver'
-                    ]
-                    driver_found = False
-                    for path in chrome_paths:
-                        if os.path.exists(path):
-                            service = Service(path)
-                            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                            driver_found = True
-                            break
-                    if not driver_found:
-                        raise Exception("No Chrome driver found in common locations")
+                driver = webdriver.Chrome(service=service, options=chrome_options)
+            except Exception:
+                # Cached path may be stale (e.g. chromedriver upgraded) - re-resolve next time
+                _forget_chromedriver_path()
+                raise
             
-            self.driver.set_page_load_timeout(self.timeout)
-            print(f"✅ Chrome driver initialized for Combined Self-Tester {self.instance_id}")
-            return True
+            driver.set_page_load_timeout(self.timeout)
+            # Block images/fonts/media/CSS once per driver; HTML and JS still load so the widget renders
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+            self.log.info(f"✅ Chrome driver initialized for Combined Self-Tester {self.instance_id} ({threading.current_thread().name})")
+            return driver
         except Exception as e:
-            print(f"❌ Failed to initialize Chrome driver: {e}")
-            print("💡 Try installing Chrome driver: brew install chromedriver")
-            return False
+            self.log.error(f"❌ Failed to initialize Chrome driver: {e}")
+            self.log.error("💡 Try installing Chrome driver: brew install chromedriver")
+            return None
     
-    def clear_browser_cache(self):
-        """Clear browser cache and cookies between requests for clean sessions"""
+    def get_thread_driver(self):
+        """Return this pool thread's driver, creating it on first use"""
+        driver = getattr(self.thread_local, 'driver', None)
+        if driver is None:
+            driver = self.setup_driver()
+            if driver is None:
+                raise Exception("Chrome driver unavailable for JS fallback")
+            self.thread_local.driver = driver
+            with self.drivers_lock:
+                self.drivers.append(driver)
+        return driver
+
+    def quit_drivers(self):
+        """Quit every pooled driver"""
+        with self.drivers_lock:
+            for driver in self.drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            self.drivers.clear()
+
+    def clear_browser_cache(self, driver, url):
+        """Clear cookies and storage for the target origin between requests - one CDP round trip
+        (the HTTP cache is already disabled via --disk-cache-size=0)"""
+        parts = urlsplit(url)
         try:
-            # Clear cookies
-            self.driver.delete_all_cookies()
-            
-            # Clear local storage and session storage
-            self.driver.execute_script("window.localStorage.clear();")
-            self.driver.execute_script("window.sessionStorage.clear();")
-            
-            # Clear cache via Chrome DevTools Protocol if available
-            try:
-                self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
-                self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
-            except:
-                pass  # CDP commands might not be available in all setups
-                
-        except Exception as e:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin',
+                                   {'origin': f"{parts.scheme}://{parts.netloc}", 'storageTypes': 'all'})
+        except Exception:
             # If clearing fails, it's not critical - continue scanning
             pass
     
-    def analyze_page_content(self, slug, url, platform_name):
+    def scan_windows(self, page_source):
+        """Return the (start, end) spans that are scanned: the first scan_head_chars
+        and the last scan_tail_chars (one span when the page is short)"""
+        length = len(page_source)
+        head_end = min(length, self.scan_head_chars)
+        tail_start = max(head_end, length - self.scan_tail_chars)
+        if tail_start >= length:
+            return ((0, head_end),)
+        return ((0, head_end), (tail_start, length))
+
+    def find_indicators(self, page_source):
+        """Return (error_indicators_found, business_indicators_found) in indicator-list order.
+        Only the head/tail scan windows are scanned; the full page is never lowercased."""
+        found = set()
+        for start, end in self.scan_windows(page_source):
+            if self.indicator_automaton is not None:
+                found.update(indicator for _, (kind, indicator)
+                             in self.indicator_automaton.iter(page_source[start:end].lower()))
+            else:
+                for match in self.indicator_pattern.finditer(page_source, start, end):
+                    found.update(self.indicator_closure[match.group(1).lower()])
+        return ([i for i in ERROR_INDICATORS if i in found],
+                [i for i in BUSINESS_INDICATORS if i in found])
+
+    async def fetch_page_http(self, url):
+        """Fetch a page over HTTP - returns (page_source, page_title, final_url)"""
+        async with self.http_semaphores[urlsplit(url).netloc]:
+            await asyncio.sleep(self.rate_limiter.reserve())
+            response = await self.http_client.get(url)
+        body = response.content
+        match = TITLE_PATTERN.search(body)
+        page_title = html.unescape(match.group(1).decode('utf-8', 'replace')).strip() if match else ''
+        return body.decode(response.encoding or 'utf-8', 'replace'), page_title, str(response.url)
+
+    def is_js_gated_shell(self, page_html):
+        """Check if server HTML is just a JavaScript bootstrap shell - by its markers, whatever its size"""
+        return JS_SHELL_MARKER in page_html.lower() or EMPTY_MOUNT_PATTERN.search(page_html) is not None
+
+    def wait_for_page_ready(self, driver, max_wait=3):
+        """Wait for the DOM, then until the rendered HTML stops growing (100ms polls, capped)"""
+        WebDriverWait(driver, max_wait).until(
+            lambda d: d.execute_script('return document.readyState') in ('interactive', 'complete'))
+        
+        last_length = -1
+        deadline = time.time() + max_wait
+        while time.time() < deadline:
+            length = driver.execute_script('return document.documentElement.outerHTML.length')
+            if length == last_length:
+                break
+            last_length = length
+            time.sleep(0.1)
+
+    def fetch_page_browser(self, url):
+        """Fetch a page with this pool thread's Chrome - returns (page_source, page_title, final_url)"""
+        driver = self.get_thread_driver()
+        self.rate_limiter.acquire()
+        
+        # Clear cache before each request for clean session
+        self.clear_browser_cache(driver, url)
+        
+        driver.get(url)
+        self.wait_for_page_ready(driver)
+        
+        return driver.page_source, driver.title, driver.current_url
+
+    def open_scan_cache(self):
+        """Open the SQLite scan cache shared by all runs (WAL so parallel testers can write)"""
+        self.scan_cache = sqlite3.connect(self.scan_cache_file)
+        self.scan_cache.execute('PRAGMA journal_mode=WAL')
+        self.scan_cache.execute('PRAGMA synchronous=NORMAL')
+        self.scan_cache.execute(
+            'CREATE TABLE IF NOT EXISTS scan_cache (slug TEXT, platform TEXT, status TEXT, classification TEXT, '
+            'business_name TEXT, page_title TEXT, content_length INTEGER, ts INTEGER, PRIMARY KEY(slug, platform))')
+        self.scan_cache.commit()
+
+    def get_cached_result(self, slug, url, platform_name):
+        """Return a synthesized result for a slug tested within the TTL, or None"""
+        row = self.scan_cache.execute(
+            'SELECT status, classification, business_name, page_title, content_length FROM scan_cache '
+            'WHERE slug = ? AND platform = ? AND ts > ?',
+            (slug, platform_name, int(time.time()) - self.cache_ttl)).fetchone()
+        if row is None:
+            return None
+        
+        status, classification, business_name, page_title, content_length = row
+        return {
+            'slug': slug,
+            'url': url,
+            'final_url': url,
+            'status': status,
+            'classification': classification,
+            'business_name': business_name,
+            'business_indicators': 0,
+            'error_indicators': 0,
+            'indicators_found': [],
+            'error_indicators_found': [],
+            'page_title': page_title,
+            'content_length': content_length,
+            'load_time': 0,
+            'tested_at': self.now_iso(),
+            'platform': platform_name,
+            'cached': True
+        }
+
+    def cache_result(self, result):
+        """Store a definitive result in the scan cache"""
+        if result['status'] not in CACHEABLE_STATUSES:
+            return
+        self.scan_cache.execute(
+            'INSERT OR REPLACE INTO scan_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (result['slug'], result['platform'], result['status'], result['classification'],
+             result['business_name'], result['page_title'], result['content_length'], int(time.time())))
+        self.scan_cache.commit()
+
+    async def analyze_page_content(self, slug, url, platform_name):
         """Analyze page content to determine if business is active"""
+        if self.scan_cache is not None:
+            cached_result = self.get_cached_result(slug, url, platform_name)
+            if cached_result is not None:
+                self.log.info(f"   💾 {platform_name} cached: {cached_result['status']} - {cached_result['business_name']}")
+                return cached_result
+        
         try:
             start_time = time.time()
             
-            # Clear cache before each request for clean session
-            self.clear_browser_cache()
-            
-            # Navigate to the URL
-            print(f"   🌐 Testing {platform_name}: {url}")
-            self.driver.get(url)
-            
-            # SAFETY OPTIMIZATION: Increased wait time to 5s for proper page loading
-            # We prioritize data accuracy over speed
-            time.sleep(5)
+            # Navigate to the URL - HTTP first, Chrome only for JS-rendered shells
+            self.log.info(f"   🌐 Testing {platform_name}: {url}")
+            page_source = None
+            if self.http_client is not None:
+                page_source, page_title, final_url = await self.fetch_page_http(url)
+                if self.is_js_gated_shell(page_source):
+                    self.log.info(f"   🧩 {platform_name} returned a JS shell, falling back to Chrome")
+                    page_source = None
+            if page_source is None:
+                page_source, page_title, final_url = await asyncio.get_running_loop().run_in_executor(
+                    self.browser_pool, self.fetch_page_browser, url)
             
-            # Get page source and basic metrics
-            page_source = self.driver.page_source.lower()
-            page_title = self.driver.title
-            final_url = self.driver.current_url
+            # Get basic metrics - page_source keeps its original case (no full lowercase copy)
             content_length = len(page_source)
             load_time = time.time() - start_time
             
-            print(f"   📄 {platform_name} Title: '{page_title}'")
-            print(f"   📏 {platform_name} Content: {content_length:,} chars, {load_time:.2f}s")
+            self.log.info(f"   📄 {platform_name} Title: '{page_title}'")
+            self.log.info(f"   📏 {platform_name} Content: {content_length:,} chars, {load_time:.2f}s")
             
-            # Check for error indicators first
-            error_indicators_found = []
-            for indicator in self.error_indicators:
-                if indicator.lower() in page_source:
-                    error_indicators_found.append(indicator)
-            
-            # Check for business indicators
-            business_indicators_found = []
-            for indicator in self.business_indicators:
-                if indicator.lower() in page_source:
-                    business_indicators_found.append(indicator)
+            # Fast reject: the invalid-slug template ("Nothing left to do here.") skips the indicator scan -
+            # only the start of the body is case-folded. Short pages are not rejected: a truncated render
+            # of an active slug would otherwise be cached as an ERROR_PAGE
+            fast_reject = has_error_template(page_source, self.fast_reject_body_chars)
+            if fast_reject:
+                error_indicators_found = [ERROR_TEMPLATE_MARKER]
+                business_indicators_found = []
+            else:
+                # Check for error and business indicators
+                error_indicators_found, business_indicators_found = self.find_indicators(page_source)
             
             # Determine status based on platform-specific logic
-            if not page_title or page_title.strip() == "":
+            if fast_reject:
+                status = "ERROR_PAGE"
+                classification = "FAST_REJECT_ERROR_TEMPLATE"
+                business_name = ""
+            elif not page_title or page_title.strip() == "":
                 status = "ERROR_PAGE"
                 classification = "EMPTY_TITLE_INVALID_URL"
                 business_name = ""
             else:
                 # Check if we have a meaningful business title or substantial content
                 # FIXED: "undefined" is NOT a meaningful business title - it's an error indicator
-                has_business_title = (page_title and len(page_title) > 3 and 
-                                    page_title.lower() not in ['loading', 'error', 'undefined'])
+                title_lower = page_title.lower()
+                has_business_title = len(page_title) > 3 and title_lower not in PLACEHOLDER_TITLES
                 has_substantial_content = content_length > 20000  # Both platforms have large pages when active
                 
                 # IMPROVED LOGIC: Require BOTH business indicators AND meaningful title for ACTIVE status
                 # Don't rely solely on content length as pages with "undefined" titles have substantial content
                 if business_indicators_found and has_business_title:
                     # Strong evidence: both business indicators and meaningful title
+                    # (a meaningful title is the business name - no content scan needed)
                     status = "ACTIVE"
                     classification = "ACTIVE_BUSINESS"
-                    business_name = self.extract_business_name(page_source, page_title, platform_name)
+                    business_name = page_title
                 elif has_business_title and not error_indicators_found:
                     # Moderate evidence: meaningful title without error indicators
                     status = "ACTIVE"
                     classification = "ACTIVE_BUSINESS"
-                    business_name = self.extract_business_name(page_source, page_title, platform_name)
-                elif page_title.lower() == 'undefined' or error_indicators_found:
+                    business_name = page_title
+                elif title_lower == 'undefined' or error_indicators_found:
                     # Clear error indicators or "undefined" title
                     status = "ERROR_PAGE"
                     classification = "UNDEFINED_TITLE_OR_ERROR_INDICATORS"
@@ -268,7 +653,10 @@ class CombinedSelfTester:
                     classification = "INSUFFICIENT_BUSINESS_EVIDENCE"
                     business_name = ""
             
-            print(f"   🤖 {platform_name} Result: {status} - {business_name}")
+            # Classification is done - release the page body before the next fetch
+            del page_source
+            
+            self.log.info(f"   🤖 {platform_name} Result: {status} - {business_name}")
             
             # Create comprehensive result
             result = {
@@ -285,15 +673,17 @@ class CombinedSelfTester:
                 'page_title': page_title,
                 'content_length': content_length,
                 'load_time': load_time,
-                'content_preview': page_source[:500] if page_source else '',
-                'tested_at': datetime.now().isoformat(),
+                'tested_at': self.now_iso(),
                 'platform': platform_name
             }
             
+            if self.scan_cache is not None:
+                self.cache_result(result)
+            
             return result
             
-        except TimeoutException as e:
-            print(f"⏰ TIMEOUT after {self.timeout}s")
+        except (TimeoutException, *HTTP_TIMEOUT_ERRORS) as e:
+            self.log.info(f"⏰ TIMEOUT after {self.timeout}s")
             return {
                 'slug': slug,
                 'url': url,
@@ -308,13 +698,12 @@ class CombinedSelfTester:
                 'page_title': '',
                 'content_length': 0,
                 'load_time': self.timeout,
-                'content_preview': '',
                 'error_details': f"Timeout after {self.timeout}s: {str(e)}",
-                'tested_at': datetime.now().isoformat(),
+                'tested_at': self.now_iso(),
                 'platform': platform_name
             }
-        except WebDriverException as e:
-            print(f"🌐 CONNECTION_ERROR: {str(e)[:50]}...")
+        except (WebDriverException, *HTTP_CONNECTION_ERRORS) as e:
+            self.log.info(f"🌐 CONNECTION_ERROR: {str(e)[:50]}...")
             return {
                 'slug': slug,
                 'url': url,
@@ -329,13 +718,12 @@ class CombinedSelfTester:
                 'page_title': '',
                 'content_length': 0,
                 'load_time': 0,
-                'content_preview': '',
-                'error_details': f"WebDriver error: {str(e)}",
-                'tested_at': datetime.now().isoformat(),
+                'error_details': f"Connection error: {str(e)}",
+                'tested_at': self.now_iso(),
                 'platform': platform_name
             }
         except Exception as e:
-            print(f"❌ BROWSER_ERROR: {str(e)[:50]}...")
+            self.log.error(f"❌ BROWSER_ERROR: {str(e)[:50]}...")
             return {
                 'slug': slug,
                 'url': url,
@@ -350,54 +738,57 @@ class CombinedSelfTester:
                 'page_title': '',
                 'content_length': 0,
                 'load_time': 0,
-                'content_preview': '',
                 'error_details': f"Unexpected error: {str(e)}",
-                'tested_at': datetime.now().isoformat(),
+                'tested_at': self.now_iso(),
                 'platform': platform_name
             }
     
     def extract_business_name(self, page_source, page_title, platform_name):
         """Extract business name from page content - PRIORITIZE PAGE TITLE"""
         # PRIORITY 1: Use page title if available and meaningful (contains actual business name)
-        if page_title and len(page_title) > 3 and page_title.lower() not in ['', 'loading', 'error', 'undefined']:
+        if page_title and len(page_title) > 3 and page_title.lower() not in PLACEHOLDER_TITLES:
             return page_title
         
+        # One scan over the head/tail scan windows collects every keyword present
+        found = {m.lastgroup for start, end in self.scan_windows(page_source)
+                 for m in BUSINESS_NAME_PATTERN.finditer(page_source, start, end)}
+        
         # PRIORITY 2: Look for platform-specific business name patterns only if no meaningful title
         if platform_name == "Enterprise":
-            if 'dripbar' in page_source:
-                if 'direct' in page_source:
+            if 'dripbar' in found:
+                if 'direct' in found:
                     return "The DRIPBaR Direct - Location"
                 return "The DRIPBaR"
-            elif 'renivate' in page_source:
+            elif 'renivate' in found:
                 return "RenIVate"
         elif platform_name == "Hydreight":
-            if 'hydreight' in page_source:
-                if 'location' in page_source:
+            if 'hydreight' in found:
+                if 'location' in found:
                     return "Hydreight - Location"
                 return "Hydreight"
         
         # PRIORITY 3: Generic patterns
-        if 'iv therapy' in page_source:
+        if 'iv_therapy' in found:
             return "IV Therapy Center"
         
         return ""
 
-    def test_slug(self, test_case):
+    async def test_slug(self, test_case):
         """Test a single slug on both platforms and validate against expected results"""
         slug = test_case['slug']
         expected_enterprise = test_case['expected_enterprise']
         expected_hydreight = test_case['expected_hydreight']
         description = test_case['description']
         
-        print(f"🧪 Testing: {slug} ({description})")
+        self.log.info(f"🧪 Testing: {slug} ({description})")
         
-        # Test Enterprise
+        # Test Enterprise and Hydreight concurrently - independent hosts
         enterprise_url = f"{self.enterprise_url}{slug}"
-        enterprise_result = self.analyze_page_content(slug, enterprise_url, "Enterprise")
-        
-        # Test Hydreight
         hydreight_url = f"{self.hydreight_url}{slug}"
-        hydreight_result = self.analyze_page_content(slug, hydreight_url, "Hydreight")
+        enterprise_result, hydreight_result = await asyncio.gather(
+            self.analyze_page_content(slug, enterprise_url, "Enterprise"),
+            self.analyze_page_content(slug, hydreight_url, "Hydreight")
+        )
         
         # Validate results
         enterprise_passed = True
@@ -421,7 +812,7 @@ class CombinedSelfTester:
         test_result = {
             'slug': slug,
             'description': description,
-            'tested_at': datetime.now().isoformat(),
+            'tested_at': self.now_iso(),
             
             # Enterprise results
             'enterprise_expected': expected_enterprise,
@@ -431,6 +822,7 @@ class CombinedSelfTester:
             'enterprise_page_title': enterprise_result['page_title'],
             'enterprise_content_length': enterprise_result['content_length'],
             'enterprise_load_time': enterprise_result['load_time'],
+            'enterprise_cached': enterprise_result.get('cached', False),
             
             # Hydreight results
             'hydreight_expected': expected_hydreight,
@@ -440,6 +832,7 @@ class CombinedSelfTester:
             'hydreight_page_title': hydreight_result['page_title'],
             'hydreight_content_length': hydreight_result['content_length'],
             'hydreight_load_time': hydreight_result['load_time'],
+            'hydreight_cached': hydreight_result.get('cached', False),
             
             # Overall result
             'overall_passed': overall_passed
@@ -450,128 +843,161 @@ class CombinedSelfTester:
         hyd_icon = "✅" if hydreight_passed else "❌"
         overall_icon = "✅" if overall_passed else "❌"
         
-        print(f"📊 Results for {slug}:")
-        print(f"   Enterprise: {ent_icon} Expected: {expected_enterprise}, Got: {enterprise_result['status']}")
-        print(f"   Hydreight:  {hyd_icon} Expected: {expected_hydreight}, Got: {hydreight_result['status']}")
-        print(f"   Overall:    {overall_icon} {'PASSED' if overall_passed else 'FAILED'}")
+        self.log.info(f"📊 Results for {slug}:")
+        self.log.info(f"   Enterprise: {ent_icon} Expected: {expected_enterprise}, Got: {enterprise_result['status']}")
+        self.log.info(f"   Hydreight:  {hyd_icon} Expected: {expected_hydreight}, Got: {hydreight_result['status']}")
+        self.log.info(f"   Overall:    {overall_icon} {'PASSED' if overall_passed else 'FAILED'}")
         
+        self.record_test_result(test_result)
         return test_result
     
+    def open_results_csv(self):
+        """Open the results CSV and write its header - rows are appended as tests finish"""
+        self.results_fh = open(self.results_file, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        self.results_writer = csv.DictWriter(self.results_fh, fieldnames=RESULT_FIELDNAMES)
+        self.results_writer.writeheader()
+    
+    def record_test_result(self, test_result):
+        """Append one test result to the CSV and update the summary counters"""
+        if self.results_writer is not None:
+            self.results_writer.writerow(test_result)
+            self.results_written += 1
+            if self.results_written % self.results_flush_every == 0:
+                self.results_fh.flush()
+        
+        summary = self.session_data['test_summary']
+        summary['total_tests'] += 1
+        if test_result['overall_passed']:
+            summary['passed_tests'] += 1
+        else:
+            summary['failed_tests'] += 1
+        
+        if test_result['enterprise_passed']:
+            summary['enterprise_tests'] += 1
+        if test_result['hydreight_passed']:
+            summary['hydreight_tests'] += 1
+        summary['cached_results'] += test_result['enterprise_cached'] + test_result['hydreight_cached']
+    
+    def close_results_csv(self):
+        """Flush and close the streamed results CSV"""
+        if self.results_fh is not None:
+            self.results_fh.close()
+            self.results_fh = None
+            self.results_writer = None
+    
     def save_test_results(self):
         """Save test results to files"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         # Save JSON session data
         session_filename = f"logs/SELFTEST_COMBINED_{self.session_id}_{timestamp}_session.json"
-        with open(session_filename, 'w', encoding='utf-8') as f:
-            json.dump(self.session_data, f, indent=2, ensure_ascii=False)
-        
-        # Save CSV results
-        results_filename = f"logs/SELFTEST_COMBINED_{self.session_id}_{timestamp}_results.csv"
-        if self.session_data['test_results']:
-            fieldnames = [
-                'slug', 'description', 'tested_at',
-                'enterprise_expected', 'enterprise_actual', 'enterprise_passed',
-                'enterprise_business_name', 'enterprise_page_title', 'enterprise_content_length', 'enterprise_load_time',
-                'hydreight_expected', 'hydreight_actual', 'hydreight_passed',
-                'hydreight_business_name', 'hydreight_page_title', 'hydreight_content_length', 'hydreight_load_time',
-                'overall_passed'
-            ]
-            
-            with open(results_filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(self.session_data['test_results'])
+        dump_json(self.session_data, session_filename)
+        
+        # CSV results were streamed as the tests ran
+        if self.results_fh is not None:
+            self.results_fh.flush()
         
         # Save summary
         summary_filename = f"logs/SELFTEST_COMBINED_{self.session_id}_{timestamp}_summary.json"
-        with open(summary_filename, 'w', encoding='utf-8') as f:
-            json.dump(self.session_data['test_summary'], f, indent=2)
-        
-        print(f"📊 Self-test data saved:")
-        print(f"   Session: {session_filename}")
-        if self.session_data['test_results']:
-            print(f"   Results: {results_filename}")
-        print(f"   Summary: {summary_filename}")
+        dump_json(self.session_data['test_summary'], summary_filename, indent=False)
+        
+        self.log.info(f"📊 Self-test data saved:")
+        self.log.info(f"   Session: {session_filename}")
+        if self.results_written:
+            self.log.info(f"   Results: {self.results_file}")
+        self.log.info(f"   Summary: {summary_filename}")
     
     def print_test_summary(self):
         """Print comprehensive test summary"""
         summary = self.session_data['test_summary']
-        print(f"\n🧪 COMBINED SCANNER SELF-TEST COMPLETE:")
-        print("=" * 60)
-        print(f"   🎯 Total Tests: {summary['total_tests']}")
-        print(f"   ✅ Passed: {summary['passed_tests']}")
-        print(f"   ❌ Failed: {summary['failed_tests']}")
-        print(f"   🏢 Enterprise Tests Passed: {summary['enterprise_tests']}")
-        print(f"   💧 Hydreight Tests Passed: {summary['hydreight_tests']}")
+        self.log.info(f"\n🧪 COMBINED SCANNER SELF-TEST COMPLETE:")
+        self.log.info("=" * 60)
+        self.log.info(f"   🎯 Total Tests: {summary['total_tests']}")
+        self.log.info(f"   ✅ Passed: {summary['passed_tests']}")
+        self.log.info(f"   ❌ Failed: {summary['failed_tests']}")
+        self.log.info(f"   🏢 Enterprise Tests Passed: {summary['enterprise_tests']}")
+        self.log.info(f"   💧 Hydreight Tests Passed: {summary['hydreight_tests']}")
+        if self.cache_ttl > 0:
+            self.log.info(f"   💾 Results from cache: {summary['cached_results']} (TTL {self.cache_ttl}s)")
         
         if summary['total_tests'] > 0:
             success_rate = (summary['passed_tests'] / summary['total_tests']) * 100
-            print(f"   📈 Success Rate: {success_rate:.1f}%")
+            self.log.info(f"   📈 Success Rate: {success_rate:.1f}%")
         
         if summary['failed_tests'] == 0:
-            print(f"\n🎉 ALL TESTS PASSED! Combined scanner is working correctly.")
+            self.log.info(f"\n🎉 ALL TESTS PASSED! Combined scanner is working correctly.")
         else:
-            print(f"\n⚠️  {summary['failed_tests']} test(s) failed. Please review the results.")
+            self.log.warning(f"\n⚠️  {summary['failed_tests']} test(s) failed. Please review the results.")
     
     def run_self_test(self):
         """Run the complete self-test suite"""
-        print(f"🧪 Starting Combined Scanner Self-Test")
-        print(f"📍 Enterprise URL: {self.enterprise_url}")
-        print(f"📍 Hydreight URL: {self.hydreight_url}")
-        print(f"🎯 Test cases: {len(self.test_slugs)}")
-        print("=" * 80)
-        
-        if not self.setup_driver():
-            print("❌ Failed to setup driver, aborting self-test")
-            return False
+        try:
+            return asyncio.run(self.run_self_test_async())
+        except KeyboardInterrupt:
+            return False  # Results were already saved by run_self_test_async
+
+    async def run_self_test_async(self):
+        """Run all test slugs concurrently over one pooled HTTP client"""
+        self.log.info(f"🧪 Starting Combined Scanner Self-Test")
+        self.log.info(f"📍 Enterprise URL: {self.enterprise_url}")
+        self.log.info(f"📍 Hydreight URL: {self.hydreight_url}")
+        self.log.info(f"🎯 Test cases: {len(self.test_slugs)}")
+        self.log.info("=" * 80)
+        
+        self.browser_pool = ThreadPoolExecutor(max_workers=self.browser_workers, thread_name_prefix='chrome')
+        if HTTPX_AVAILABLE:
+            # Chrome is only started lazily if a page turns out to be a JS shell
+            self.http_client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True)
+            # Per-host concurrency limit so each platform sees at most rate_limit in flight
+            self.http_semaphores = {urlsplit(base_url).netloc: asyncio.Semaphore(self.rate_limit)
+                                    for base_url in (self.enterprise_url, self.hydreight_url)}
+        else:
+            try:
+                await asyncio.get_running_loop().run_in_executor(self.browser_pool, self.get_thread_driver)
+            except Exception:
+                self.log.error("❌ Failed to setup driver, aborting self-test")
+                self.browser_pool.shutdown(wait=False)
+                self.log_listener.stop()
+                return False
         
         try:
-            for i, test_case in enumerate(self.test_slugs, 1):
-                print(f"\n🔍 Test {i}/{len(self.test_slugs)}")
-                
-                # Rate limiting between tests
-                if i > 1:
-                    time.sleep(1.0 / self.rate_limit)
-                
-                # Run test
-                test_result = self.test_slug(test_case)
-                self.session_data['test_results'].append(test_result)
-                
-                # Update statistics
-                self.session_data['test_summary']['total_tests'] += 1
-                if test_result['overall_passed']:
-                    self.session_data['test_summary']['passed_tests'] += 1
-                else:
-                    self.session_data['test_summary']['failed_tests'] += 1
-                
-                if test_result['enterprise_passed']:
-                    self.session_data['test_summary']['enterprise_tests'] += 1
-                if test_result['hydreight_passed']:
-                    self.session_data['test_summary']['hydreight_tests'] += 1
-                
-                print("   " + "="*60)
+            # Each test streams its row to the CSV and updates the summary as it finishes
+            self.open_results_csv()
+            await asyncio.gather(*(self.test_slug(test_case) for test_case in self.test_slugs))
+            
+            self.log.info("   " + "="*60)
         
-        except KeyboardInterrupt:
-            print(f"\n⚠️  Self-test interrupted by user")
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self.log.warning(f"\n⚠️  Self-test interrupted by user")
         except Exception as e:
-            print(f"\n❌ Unexpected error during self-test: {e}")
+            self.log.error(f"\n❌ Unexpected error during self-test: {e}")
         finally:
             # Final save and cleanup
-            self.session_data['end_time'] = datetime.now().isoformat()
+            self.session_data['end_time'] = self.now_iso()
             self.save_test_results()
+            self.close_results_csv()
             
-            if self.driver:
-                self.driver.quit()
+            if self.http_client is not None:
+                await self.http_client.aclose()
+                self.http_client = None
+            # Drivers are quit from this thread; the pool workers are idle by now
+            self.browser_pool.shutdown(wait=True)
+            self.quit_drivers()
+            if self.scan_cache is not None:
+                self.scan_cache.close()
+                self.scan_cache = None
             
-            # Print final summary
+            # Print final summary and drain the log queue
             self.print_test_summary()
+            self.log_listener.stop()
             
             return self.session_data['test_summary']['failed_tests'] == 0
 
 def main():
     parser = argparse.ArgumentParser(description='Combined Scanner Self-Tester')
     parser.add_argument('--instance-id', default='COMBINED_SELFTEST', help='Instance identifier')
+    parser.add_argument('--cache-ttl', type=int, default=0,
+                        help='Reuse results cached within this many seconds (default 0 - scan cache off)')
     
     args = parser.parse_args()
     
@@ -579,7 +1005,7 @@ def main():
     os.makedirs('logs', exist_ok=True)
     
     # Create and run self-tester
-    tester = CombinedSelfTester(instance_id=args.instance_id)
+    tester = CombinedSelfTester(instance_id=args.instance_id, cache_ttl=args.cache_ttl)
     success = tester.run_self_test()
     
     # Exit with appropriate code
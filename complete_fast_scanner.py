@@ -13,11 +13,19 @@ Features:
 ✅ CSV and JSON output
 ✅ Predefined ranges for easy parallel setup
 ✅ 2x faster than comprehensive scanner
+✅ Optional async HTTP prefilter (--http-prefilter) - Chrome only for pages the raw HTML can't classify
 """
 
+import asyncio
+import html
+import re
+import threading
 import time
 import csv
 import json
+import logging
+import logging.handlers
+import queue
 import random
 import string
 import itertools
@@ -26,14 +34,312 @@ import sys
 import signal
 import socket
 import glob
+import hashlib
+import mmap
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Scan output goes through this logger - per-slug lines are DEBUG, active finds and checkpoints WARNING
+logger = logging.getLogger('complete_fast_scanner')
+
+def start_log_listener(level=logging.INFO):
+    """Attach a QueueHandler to this module's logger and start the listener thread that writes to stdout.
+    The console shows records at `level`; a session log file can be added with add_log_file()."""
+    log_queue = queue.Queue(-1)
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(message)s'))
+    console.setLevel(level)
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+    listener = logging.handlers.QueueListener(log_queue, console, respect_handler_level=True)
+    listener.start()
+    return listener
+
+def add_log_file(listener, filename, capacity=1000):
+    """Also write every record, DEBUG included, to filename - buffered and flushed every `capacity` records"""
+    file_handler = logging.FileHandler(filename, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    buffered = logging.handlers.MemoryHandler(capacity, flushLevel=logging.ERROR, target=file_handler)
+    listener.handlers = listener.handlers + (buffered,)
+    logger.setLevel(logging.DEBUG)
+    return buffered
+
+# Try to import tqdm for a progress bar - per-slug output is DEBUG-only, so the console is quiet without it
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+# Try to import the async HTTP client - the prefilter falls back to a pooled requests.Session if unavailable
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+    HTTP_TIMEOUT_ERRORS = (httpx.TimeoutException, requests.Timeout)
+    HTTP_CONNECTION_ERRORS = (httpx.TransportError, requests.ConnectionError)
+except ImportError:
+    HTTPX_AVAILABLE = False
+    HTTP_TIMEOUT_ERRORS = (requests.Timeout,)
+    HTTP_CONNECTION_ERRORS = (requests.ConnectionError,)
+    print("⚠️  httpx not available, using requests threads for the HTTP prefilter. Install with: pip install httpx")
+
+# Try to import ijson to stream slug databases instead of parsing them whole
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Try to import Aho-Corasick for single-pass indicator scanning
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+class RateLimiter:
+    """Thread-safe token bucket (capacity 1) - spaces requests 1/rate seconds apart"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+    
+    def reserve(self):
+        """Reserve the next slot and return how long to wait for it"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        return slot - now
+    
+    def acquire(self):
+        """Block until the next slot"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+# Raw-HTML helpers for the HTTP prefilter
+TITLE_PATTERN = re.compile(r'<title[^>]*>([^<]*)', re.IGNORECASE)
+SCRIPT_STYLE_PATTERN = re.compile(r'<(script|style|noscript)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Statuses the raw HTML can't settle - these slugs are re-tested in Chrome
+AMBIGUOUS_STATUSES = ('POTENTIALLY_ACTIVE', 'INACTIVE_UNKNOWN')
+
+# Slug space: 5 chars of 0-9a-z, numbered in charset order
+SLUG_LENGTH = 5
+SLUG_SPACE = 36 ** SLUG_LENGTH  # 60,466,176
+SLUG_PATTERN = re.compile(r'[0-9a-z]{5}')
+SLUG_CHARSET = string.digits + string.ascii_lowercase
+
+# Precomputed 2-char prefixes and 3-char suffixes - a slug number is split 1296 x 46656
+SLUG_SUFFIX_SPACE = 36 ** 3
+SLUG_PREFIXES = tuple(a + b for a in SLUG_CHARSET for b in SLUG_CHARSET)
+SLUG_SUFFIXES = tuple(a + b + c for a in SLUG_CHARSET for b in SLUG_CHARSET for c in SLUG_CHARSET)
+
+# Tested-slug bitmap persisted next to the logs so later runs skip the database parse
+TESTED_SLUGS_BITMAP_FILE = 'logs/TESTED_SLUGS_{source}.bitmap'
+# Bitmap every instance of one run group (same range and stride step, or same slug file) maps and
+# marks as it goes - parallel and resumed runs of that group skip each other's settled slugs
+SHARED_TESTED_BITMAP_FILE = 'logs/TESTED_SLUGS_SHARED_{group}.bitmap'
+
+def slug_to_number(slug):
+    """Convert slug to number for comparison (base 36 in charset order, parsed in C)"""
+    return int(slug, 36)
+
+def number_to_slug(num):
+    """Convert number back to slug"""
+    prefix, suffix = divmod(num, SLUG_SUFFIX_SPACE)
+    return SLUG_PREFIXES[prefix] + SLUG_SUFFIXES[suffix]
+
+class SlugBitmap:
+    """Set of tested slugs as one bit per possible slug (7.5MB flat, exact membership).
+    Slugs outside the 5-char 0-9a-z space fall back to a regular set.
+    Membership accepts either the slug string or its slug_to_number value."""
+    def __init__(self, bits=None, extra=None):
+        self.bits = bits if bits is not None else bytearray(SLUG_SPACE // 8 + 1)
+        self.extra = extra if extra is not None else set()
+        self.count = len(self.extra)
+        if bits is not None:
+            self.count += int.from_bytes(bits, 'little').bit_count()
+    
+    def add(self, slug):
+        if SLUG_PATTERN.fullmatch(slug):
+            num = slug_to_number(slug)
+            mask = 1 << (num & 7)
+            if not self.bits[num >> 3] & mask:
+                self.bits[num >> 3] |= mask
+                self.count += 1
+        elif slug not in self.extra:
+            self.extra.add(slug)
+            self.count += 1
+    
+    def __contains__(self, slug):
+        if isinstance(slug, int):
+            return 0 <= slug < SLUG_SPACE and bool(self.bits[slug >> 3] & (1 << (slug & 7)))
+        if SLUG_PATTERN.fullmatch(slug):
+            num = slug_to_number(slug)
+            return bool(self.bits[num >> 3] & (1 << (num & 7)))
+        return slug in self.extra
+    
+    def add_number(self, num):
+        """Mark a slug number - no count upkeep, for bitmaps shared with other processes"""
+        self.bits[num >> 3] |= 1 << (num & 7)
+    
+    def __len__(self):
+        return self.count
+    
+    def save(self, filename):
+        """Write the bitmap followed by any out-of-space slugs (one per line)"""
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, 'wb') as f:
+            f.write(self.bits)
+            f.write('\n'.join(sorted(self.extra)).encode('utf-8'))
+        os.replace(tmp_filename, filename)
+    
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as f:
+            data = f.read()
+        size = SLUG_SPACE // 8 + 1
+        extra = {line for line in data[size:].decode('utf-8').split('\n') if line}
+        return cls(bytearray(data[:size]), extra)
+    
+    @classmethod
+    def open_shared(cls, filename):
+        """Map filename (created zeroed if missing) as the bitmap - writes land in the shared page cache.
+        Concurrent marks of the same byte can drop a bit, which only costs that slug a retest."""
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        size = SLUG_SPACE // 8 + 1
+        fd = os.open(filename, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            return cls(mmap.mmap(fd, size))
+        finally:
+            os.close(fd)  # the mapping keeps the file open
+
+# Body text that means the React app has rendered - the 401 template or a booking page
+PAGE_READY_MARKERS = ('401', 'nothing left to do here', 'book')
+# URL, title and lowercased body text in one CDP round trip
+PAGE_STATE_EXPRESSION = (
+    "({url: location.href, title: document.title, "
+    "text: document.body ? document.body.innerText.trim().toLowerCase() : ''})"
+)
+
+# Transient Chrome failures - queued and retried on a warm driver at the next checkpoint
+RETRY_STATUSES = ('TIMEOUT', 'BROWSER_ERROR')
+# Results that don't settle a slug - it stays unmarked in the shared bitmap so a later run tests it again
+UNSETTLED_STATUSES = RETRY_STATUSES + ('CONNECTION_ERROR', 'ERROR')
+
+# Results/session files are appended through a 1MB buffer and flushed at checkpoints
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Progress, results and session log are committed together this often (seconds), whatever the scan rate
+COMMIT_INTERVAL = 30
+
+def write_json_atomic(filename, data):
+    """Write data as JSON beside filename and rename it into place - readers never see a partial file"""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_filename, filename)
+
+# Columns of the results CSV - one row per active business
+RESULT_FIELDNAMES = [
+    'slug', 'status', 'business_name', 'services', 'load_time',
+    'content_length', 'business_indicators', 'error_indicators',
+    'final_url', 'page_title', 'timestamp'
+]
+
+# Strong error indicators
+ERROR_PATTERNS = (
+    '401', 'error', 'nothing left to do here', 'go to homepage',
+    'unauthorized', 'access denied', 'not found'
+)
+
+# Business content indicators
+BUSINESS_PATTERNS = (
+    'altura health', 'dripbar', 'wellness', 'clinic', 'medical', 'health',
+    'therapy', 'treatment', 'spa', 'center', 'institute', 'practice',
+    'weight loss', 'injection', 'iv therapy', 'hydration', 'vitamin',
+    'consultation', 'appointment', 'booking', 'schedule', 'service',
+    'contact', 'location', 'address', 'phone', 'email', 'hours',
+    'book now', 'schedule appointment', 'select service', 'choose time'
+)
+
+# Business name phrases, matched against lowercased page text
+BUSINESS_NAME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'welcome to ([^.!?\n]+)',
+    r'([^.!?\n]+) - book now',
+    r'book your appointment at ([^.!?\n]+)'
+))
+
+def build_pattern_automaton():
+    """One Aho-Corasick automaton over error + business patterns"""
+    automaton = ahocorasick.Automaton()
+    for pattern in ERROR_PATTERNS + BUSINESS_PATTERNS:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+def build_pattern_regex():
+    """Case-insensitive regex over all patterns - used when pyahocorasick is missing.
+    The lookahead tries every position; shorter patterns contained in a longer
+    match (e.g. 'therapy' in 'iv therapy') are added back via the closure map."""
+    patterns = ERROR_PATTERNS + BUSINESS_PATTERNS
+    alternation = '|'.join(re.escape(p) for p in sorted(patterns, key=len, reverse=True))
+    closure = {p: {q for q in patterns if q in p} for p in patterns}
+    return re.compile(f'(?=({alternation}))', re.IGNORECASE), closure
+
+PATTERN_AUTOMATON = build_pattern_automaton() if AHOCORASICK_AVAILABLE else None
+PATTERN_REGEX, PATTERN_CLOSURE = build_pattern_regex()
+
+def find_patterns(page_text):
+    """Return the set of error/business patterns present in page_text - one pass, case-insensitive"""
+    if PATTERN_AUTOMATON is not None:
+        return {pattern for _, pattern in PATTERN_AUTOMATON.iter(page_text.lower())}
+    found = set()
+    for match in PATTERN_REGEX.finditer(page_text):
+        found.update(PATTERN_CLOSURE[match.group(1).lower()])
+    return found
+
+def html_to_text(page_html):
+    """Approximate the rendered body text of a raw HTML response"""
+    text = SCRIPT_STYLE_PATTERN.sub(' ', page_html)
+    text = TAG_PATTERN.sub(' ', text)
+    return WHITESPACE_PATTERN.sub(' ', html.unescape(text)).strip()
+
+def parse_page_html(page_html):
+    """Return (body text, title) of a raw HTML response - runs in the classify workers"""
+    match = TITLE_PATTERN.search(page_html)
+    page_title = html.unescape(match.group(1)).strip() if match else ''
+    return html_to_text(page_html), page_title
+
+def init_classify_worker():
+    """Classify workers leave Ctrl-C/SIGTERM handling to the scanner process"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
 class CompleteFastScanner:
-    def __init__(self, instance_id=None, start_range=None, end_range=None, slug_file=None):
+    def __init__(self, instance_id=None, start_range=None, end_range=None, slug_file=None, log_level=logging.INFO, stride=None, http_prefilter=False,
+                 reset_shared=False):
+        self.log = logger
+        self.log_listener = start_log_listener(log_level)
+        
         # Generate unique instance ID if not provided
         if instance_id is None:
             instance_id = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
@@ -47,7 +353,7 @@ class CompleteFastScanner:
         
         # Handle slug file or range-based scanning
         self.slug_file = slug_file
-        self.slugs_to_test = []
+        self.slugs_to_test = array('I')
         
         if slug_file and os.path.exists(slug_file):
             self.load_slugs_from_file()
@@ -58,33 +364,82 @@ class CompleteFastScanner:
             self.start_range = start_range or 'aaaaa'
             self.end_range = end_range or 'zzzzz'
         
+        # (offset, step) - only every step-th slug number from offset in the range is scanned
+        self.stride = stride
+        
         # Load tested slugs from database to avoid retesting
         self.tested_slugs = self.load_tested_slugs_database()
-        print(f"📚 Loaded {len(self.tested_slugs)} previously tested slugs from database")
-        
-        # Known working slugs to skip
-        self.known_slugs = {
+        self.log.info(f"📚 Loaded {len(self.tested_slugs)} previously tested slugs from database")
+        self.shared_tested_file = SHARED_TESTED_BITMAP_FILE.format(group=self.shared_group_key())
+        if reset_shared and os.path.exists(self.shared_tested_file):
+            os.remove(self.shared_tested_file)
+            self.log.info(f"🧹 Reset shared tested bitmap {self.shared_tested_file}")
+        self.shared_tested = SlugBitmap.open_shared(self.shared_tested_file)
+        self.log.info(f"🤝 Shared tested bitmap {self.shared_tested_file}: {len(self.shared_tested):,} settled slugs "
+                      f"will be skipped (--reset-shared to retest them)")
+        
+        # Known working slugs to skip (held as slug numbers like everything in the scan loop)
+        self.known_slugs = {slug_to_number(slug) for slug in (
             'ad31y', 'mj42f', 'os27m', 'lp56a', 'zb74k', 'ym99l', 
             'yh52b', 'zd20w', 'td32z', 'bo19e', 'bh70s', 'ai04u', 
             'bm49t', 'qu29u', 'tc33l'
-        }
+        )}
         
         # Results tracking
         self.found_slugs = []
         self.tested_count = 0
         self.skipped_count = 0
+        self.shared_skipped_count = 0  # subset of skipped_count - settled by this run group's shared bitmap
         self.start_time = None
+        self.start_datetime = None
+        self.start_monotonic = None  # elapsed/rate math - immune to wall-clock jumps
+        self.last_commit = None
         self.checkpoint_interval = 50  # Save checkpoint every 50 slugs
         
         # OPTIMIZED performance settings (2x faster than comprehensive)
         self.page_load_timeout = 8   # Reduced from 15s
-        self.js_wait_time = 2        # Reduced from 3s  
+        self.js_wait_time = 2        # Max wait for React to render (was a fixed 3s sleep)
         self.requests_per_second = 10.0  # Doubled from 5 (0.1s between tests)
         
+        # Chrome fallback runs on a thread pool - each worker reuses one session for the whole
+        # scan and recycles it periodically to bound memory
+        self.browser_workers = 3
+        self.thread_local = threading.local()
+        self.drivers = []
+        self.drivers_lock = threading.Lock()
+        self.recycle_interval = 500
+        
+        # HTTP prefilter - concurrent keep-alive requests, Chrome pool as the fallback.
+        # Off by default: the widget is a client-rendered SPA whose raw HTML (empty title,
+        # no body text) never decides a status, so every slug would pay for a request and Chrome.
+        self.http_prefilter = http_prefilter
+        self.max_concurrency = 50
+        self.http_client = None
+        self.http_semaphore = None
+        self.http_session = None
+        self.http_executor = None
+        self.browser_executor = None
+        self.rate_limiter = RateLimiter(self.requests_per_second)
+        
+        # Failed slugs wait here as (slug, count, attempts) until the next checkpoint drains them
+        self.retry_queue = deque()
+        self.max_retries = 1
+        self.retry_batch_size = 10
+        
+        # Parsing/classification runs in worker processes, off the event loop and Chrome threads
+        self.classify_workers = 2
+        self.classify_executor = None
+        
+        # Classification memo - inactive slugs all serve the same error page, so most pages are repeats.
+        # Keyed by a digest of the page text so cached entries don't hold whole pages.
+        self.classify_cache = OrderedDict()
+        self.classify_cache_size = 4096
+        self.classify_cache_lock = threading.Lock()
+        
         # Create logs folder if it doesn't exist
         if not os.path.exists('logs'):
             os.makedirs('logs')
-            print("📁 Created logs folder")
+            self.log.info("📁 Created logs folder")
         
         # Create unique session files for each run
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -102,6 +457,16 @@ class CompleteFastScanner:
         self.results_file = f"logs/{session_prefix}_results.csv"
         self.progress_file = f"logs/{session_prefix}_progress.json"
         self.session_log_file = f"logs/{session_prefix}_session.json"
+        self.session_results_file = f"logs/{session_prefix}_session_results.ndjson"
+        self.scan_log_file = f"logs/{session_prefix}.log"
+        self.scan_log_handler = add_log_file(self.log_listener, self.scan_log_file)
+        
+        # Append handles for the results CSV and per-slug NDJSON log (opened when the scan starts)
+        self.results_fh = None
+        self.results_writer = None
+        self.session_results_fh = None
+        self.logged_tests = 0
+        self.total_load_time = 0.0
         
         # Create persistent checkpoint file (no timestamp for resume capability)
         if self.slug_file:
@@ -110,6 +475,12 @@ class CompleteFastScanner:
         else:
             self.checkpoint_file = f"logs/CHECKPOINT_FAST_{hostname}_{self.instance_id}.txt"
         
+        # Checkpoint fd is held open for the whole scan; a process crash keeps the last write,
+        # fsync bounds what a power loss can lose to checkpoint_sync_every checkpoints
+        self.checkpoint_fd = None
+        self.checkpoint_sync_every = 10
+        self.checkpoints_since_sync = 0
+        
         # Initialize session log data
         self.session_data = {
             'session_info': {
@@ -121,9 +492,10 @@ class CompleteFastScanner:
                 'session_type': 'FAST_COMPREHENSIVE_SCAN',
                 'range_start': self.start_range,
                 'range_end': self.end_range,
+                'range_stride': list(self.stride) if self.stride else None,
                 'scanner_version': '3.0_complete_fast'
             },
-            'testing_results': [],
+            'testing_results_file': self.session_results_file,
             'session_summary': {
                 'total_tested': 0,
                 'active_found': 0,
@@ -140,91 +512,126 @@ class CompleteFastScanner:
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
         
-        print(f"🚀 Complete Fast Scanner (Instance: {self.instance_id})")
-        print(f"📊 Range: {self.start_range} to {self.end_range}")
-        print(f"⚡ Rate limit: {self.requests_per_second} pages/second (2x faster)")
-        print(f"📍 Checkpoint every: {self.checkpoint_interval} slugs")
-        print(f"💾 Results file: {self.results_file}")
-        print(f"📍 Checkpoint file: {self.checkpoint_file}")
-        print(f"📋 Session log file: {self.session_log_file}")
-        print("")
+        self.log.info(f"🚀 Complete Fast Scanner (Instance: {self.instance_id})")
+        self.log.info(f"📊 Range: {self.start_range} to {self.end_range}")
+        self.log.info(f"⚡ Rate limit: {self.requests_per_second} pages/second (2x faster)")
+        self.log.info(f"📍 Checkpoint every: {self.checkpoint_interval} slugs")
+        self.log.info(f"💾 Results file: {self.results_file}")
+        self.log.info(f"📍 Checkpoint file: {self.checkpoint_file}")
+        self.log.info(f"📋 Session log file: {self.session_log_file}")
+        self.log.info(f"📋 Scan log file: {self.scan_log_file}")
+        self.log.info("")
     
     def load_tested_slugs_database(self):
-        """Load previously tested slugs from the MASTER_DATABASE"""
-        tested_slugs = set()
+        """Load previously tested slugs from the MASTER_DATABASE (cached as a bitmap between runs)"""
+        tested_slugs = SlugBitmap()
         
         # Check for MASTER_DATABASE first
         if os.path.exists('MASTER_DATABASE.json'):
             latest_file = 'MASTER_DATABASE.json'
-            print(f"📖 Loading tested slugs from: {latest_file}")
+            self.log.info(f"📖 Loading tested slugs from: {latest_file}")
         else:
             # Fallback to old database files
             json_files = glob.glob("vsdhone_slug_database_*.json")
             if not json_files:
-                print("📭 No existing slug database found - will test all slugs")
+                self.log.info("📭 No existing slug database found - will test all slugs")
                 return tested_slugs
             
             # Get the most recent file
             latest_file = max(json_files, key=os.path.getctime)
-            print(f"📖 Loading tested slugs from: {latest_file}")
+            self.log.info(f"📖 Loading tested slugs from: {latest_file}")
+        
+        # Reuse the bitmap built on an earlier run unless the database changed since
+        bitmap_file = TESTED_SLUGS_BITMAP_FILE.format(source=os.path.splitext(os.path.basename(latest_file))[0])
+        try:
+            if os.path.getmtime(bitmap_file) >= os.path.getmtime(latest_file):
+                tested_slugs = SlugBitmap.load(bitmap_file)
+                self.log.info(f"✅ Loaded {len(tested_slugs)} tested slugs from bitmap cache: {bitmap_file}")
+                return tested_slugs
+        except OSError:
+            pass
         
         try:
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                database = json.load(f)
-            
             # Extract all tested slugs
-            for slug_data in database.get('all_slugs', []):
-                tested_slugs.add(slug_data['slug'])
+            for slug in self.iter_database_slugs(latest_file):
+                tested_slugs.add(slug)
             
-            print(f"✅ Successfully loaded {len(tested_slugs)} tested slugs")
+            self.log.info(f"✅ Successfully loaded {len(tested_slugs)} tested slugs")
+            try:
+                tested_slugs.save(bitmap_file)
+            except OSError as e:
+                self.log.warning(f"⚠️  Could not cache tested slugs bitmap: {e}")
             
         except Exception as e:
-            print(f"⚠️  Error loading database: {e}")
-            print("📭 Will proceed without database - may retest some slugs")
+            self.log.warning(f"⚠️  Error loading database: {e}")
+            self.log.warning("📭 Will proceed without database - may retest some slugs")
         
         return tested_slugs
     
+    def iter_database_slugs(self, database_file):
+        """Yield every slug in a slug database - MASTER_DATABASE.json is a list of records,
+        older vsdhone_slug_database_*.json files keep them under 'all_slugs'"""
+        with open(database_file, 'rb') as f:
+            head = f.read(64).lstrip()
+            f.seek(0)
+            is_record_list = head.startswith(b'[')
+            if IJSON_AVAILABLE:
+                # Stream just the slug strings - the records are never materialized
+                yield from ijson.items(f, 'item.slug' if is_record_list else 'all_slugs.item.slug')
+                return
+            database = json.load(f)
+        records = database if is_record_list else database.get('all_slugs', [])
+        for slug_data in records:
+            yield slug_data['slug']
+    
+    def shared_group_key(self):
+        """Run group the shared tested bitmap belongs to - the slug file, or the range and stride step"""
+        if self.slug_file:
+            return 'FILE_' + os.path.splitext(os.path.basename(self.slug_file))[0]
+        key = f"{self.start_range}_{self.end_range}"
+        if self.stride:
+            key += f"_STRIDE{self.stride[1]}"
+        return key
+    
     def load_slugs_from_file(self):
-        """Load slugs from a text file (one slug per line)"""
+        """Load slugs from a text file (one slug per line) as a packed array of slug numbers"""
         try:
+            self.slugs_to_test = array('I')
+            ignored = 0
             with open(self.slug_file, 'r') as f:
-                self.slugs_to_test = [line.strip() for line in f if len(line.strip()) == 5]
-            print(f"📂 Loaded {len(self.slugs_to_test)} slugs from {self.slug_file}")
+                for line in f:
+                    slug = line.strip()
+                    if len(slug) != 5:
+                        continue
+                    if SLUG_PATTERN.fullmatch(slug):
+                        self.slugs_to_test.append(slug_to_number(slug))
+                    else:
+                        ignored += 1
+            self.log.info(f"📂 Loaded {len(self.slugs_to_test)} slugs from {self.slug_file}")
+            if ignored:
+                self.log.warning(f"⚠️  Ignored {ignored} lines outside the 0-9a-z slug charset")
         except Exception as e:
-            print(f"⚠️  Error loading slug file: {e}")
-            self.slugs_to_test = []
+            self.log.warning(f"⚠️  Error loading slug file: {e}")
+            self.slugs_to_test = array('I')
     
     def generate_file_based_slugs(self, start_from=None):
-        """Generate slugs from loaded file"""
-        print(f"🔢 Processing {len(self.slugs_to_test)} slugs from file: {self.slug_file}")
+        """Slug numbers from the loaded file, from the resume point on (sized, for the progress bar)"""
+        self.log.info(f"🔢 Processing {len(self.slugs_to_test)} slugs from file: {self.slug_file}")
         
-        started = False
+        start_index = 0
         if start_from:
-            print(f"📍 Resuming from: {start_from}")
-        
-        for slug in self.slugs_to_test:
-            # Handle resuming
-            if start_from:
-                if slug == start_from:
-                    started = True
-                if not started:
-                    continue
-            
-            yield slug
+            self.log.info(f"📍 Resuming from: {start_from}")
+            resume_num = slug_to_number(start_from)
+            try:
+                start_index = self.slugs_to_test.index(resume_num)
+            except ValueError:
+                start_index = len(self.slugs_to_test)
+        
+        return self.slugs_to_test[start_index:]
     
     def generate_range_combinations(self, start_from=None):
-        """Generate combinations within specified range"""
-        print(f"🔢 Generating combinations from {self.start_range} to {self.end_range}")
-        
-        def slug_to_number(slug):
-            """Convert slug to number for comparison"""
-            result = 0
-            for char in slug:
-                if char.isdigit():
-                    result = result * 36 + int(char)
-                else:
-                    result = result * 36 + (ord(char) - ord('a') + 10)
-            return result
+        """Slug numbers within the specified range, from the resume point on (a sized range object)"""
+        self.log.info(f"🔢 Generating combinations from {self.start_range} to {self.end_range}")
         
         start_num = slug_to_number(self.start_range)
         end_num = slug_to_number(self.end_range)
@@ -233,22 +640,15 @@ class CompleteFastScanner:
         if start_from:
             resume_num = slug_to_number(start_from)
             start_num = max(start_num, resume_num)
-            print(f"📍 Resuming from: {start_from} (number: {resume_num})")
-        
-        def number_to_slug(num):
-            """Convert number back to slug"""
-            slug = ""
-            for _ in range(5):
-                remainder = num % 36
-                if remainder < 10:
-                    slug = str(remainder) + slug
-                else:
-                    slug = chr(ord('a') + remainder - 10) + slug
-                num //= 36
-            return slug
-        
-        for num in range(start_num, end_num + 1):
-            yield number_to_slug(num)
+            self.log.info(f"📍 Resuming from: {start_from} (number: {resume_num})")
+        
+        if self.stride:
+            offset, step = self.stride
+            self.log.info(f"🔀 Stride: every {step} slugs from offset {offset}")
+            start_num += (offset - start_num) % step
+            return range(start_num, end_num + 1, step)
+        
+        return range(start_num, end_num + 1)
     
     def setup_optimized_driver(self):
         """Setup optimized Chrome driver for maximum speed"""
@@ -283,8 +683,8 @@ class CompleteFastScanner:
         options.add_argument('--disable-logging')
         options.add_argument('--log-level=3')
         
-        # Unique user data directory for parallel execution
-        user_data_dir = f"/tmp/chrome_fast_{self.instance_id}_{os.getpid()}"
+        # Unique user data directory for parallel execution (stable per pool thread)
+        user_data_dir = f"/tmp/chrome_fast_{self.instance_id}_{os.getpid()}_{threading.current_thread().name}"
         options.add_argument(f'--user-data-dir={user_data_dir}')
         
         driver = webdriver.Chrome(options=options)
@@ -292,35 +692,69 @@ class CompleteFastScanner:
         
         return driver
     
+    def get_driver(self):
+        """Return this pool thread's driver - started on first use and recycled every recycle_interval slugs"""
+        local = self.thread_local
+        driver = getattr(local, 'driver', None)
+        if driver is not None and local.uses >= self.recycle_interval:
+            self.log.debug(f"   ♻️  Recycling Chrome after {local.uses} slugs")
+            self.quit_driver()
+            driver = None
+        if driver is None:
+            driver = self.setup_optimized_driver()
+            local.driver = driver
+            local.uses = 0
+            with self.drivers_lock:
+                self.drivers.append(driver)
+        local.uses += 1
+        return driver
+    
+    def quit_driver(self):
+        """Quit this pool thread's driver (a new one is started on the next get_driver)"""
+        driver = getattr(self.thread_local, 'driver', None)
+        if driver is not None:
+            with self.drivers_lock:
+                if driver in self.drivers:
+                    self.drivers.remove(driver)
+            try:
+                driver.quit()
+            except:
+                pass
+        self.thread_local.driver = None
+    
+    def quit_drivers(self):
+        """Quit every pooled driver"""
+        with self.drivers_lock:
+            drivers = list(self.drivers)
+            self.drivers.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except:
+                pass
+    
     def test_slug_with_browser(self, slug, current_count):
         """Test a single slug using optimized browser automation"""
-        driver = None
         start_test_time = time.time()
+        url = f"{self.base_url}{slug}"
         
         try:
-            driver = self.setup_optimized_driver()
-            url = f"{self.base_url}{slug}"
+            driver = self.get_driver()
             
-            print(f"🔍 [{current_count:,}] Testing: {slug}")
-            print(f"   🌐 Loading: {url}")
+            self.log.debug(f"🔍 [{current_count:,}] Testing: {slug}")
+            self.log.debug(f"   🌐 Loading: {url}")
             
             # Navigate to the page
+            self.rate_limiter.acquire()
             driver.get(url)
             
-            # OPTIMIZED: Reduced wait time for React
-            time.sleep(self.js_wait_time)
-            
-            # Get final URL after any redirects
-            final_url = driver.current_url
-            
-            # Get page source and title
-            page_title = driver.title
+            # OPTIMIZED: Return as soon as React has rendered instead of a fixed sleep
+            page_state = self.wait_for_page_ready(driver)
             
-            try:
-                body_element = driver.find_element(By.TAG_NAME, 'body')
-                page_text = body_element.text.strip()
-            except:
-                page_text = ""
+            # Final URL after any redirects, title and (lowercased) body text
+            final_url = page_state.get('url') or driver.current_url
+            page_title = page_state.get('title', '')
+            page_text = page_state.get('text', '')
             
             # Analyze the content
             result = self.analyze_page_content(page_text, page_title, final_url, slug)
@@ -329,34 +763,34 @@ class CompleteFastScanner:
             
             # Print result in comprehensive scanner format
             if result['status'] == 'ACTIVE':
-                print(f"   🌟 ACTIVE BUSINESS PAGE - {result.get('business_name', '')}")
-                print(f"   📊 Business Indicators: {result.get('business_indicators', 0)}")
-                print(f"   📄 Page Title: {result.get('page_title', '')}")
-                print(f"   📏 Content Length: {result.get('content_length', 0)} chars")
-                print(f"   ⏱️  Load Time: {result['load_time']:.2f} seconds")
+                self.log.warning(f"   🌟 ACTIVE BUSINESS PAGE - {slug}: {result.get('business_name', '')}")
+                self.log.warning(f"   📊 Business Indicators: {result.get('business_indicators', 0)}")
+                self.log.warning(f"   📄 Page Title: {result.get('page_title', '')}")
+                self.log.warning(f"   📏 Content Length: {result.get('content_length', 0)} chars")
+                self.log.warning(f"   ⏱️  Load Time: {result['load_time']:.2f} seconds")
                 if final_url != url:
-                    print(f"   🔗 Final URL: {final_url}")
+                    self.log.warning(f"   🔗 Final URL: {final_url}")
                 if result.get('services'):
-                    print(f"   💰 Services Found: {', '.join(result['services'][:3])}")
+                    self.log.warning(f"   💰 Services Found: {', '.join(result['services'][:3])}")
             elif result['status'] == 'INACTIVE_401':
-                print(f"   🚫 INACTIVE_401 - Error Page")
-                print(f"   📏 Content Length: {result.get('content_length', 0)} chars")
-                print(f"   🔗 Final URL: {result.get('final_url', '')}")
+                self.log.debug(f"   🚫 INACTIVE_401 - Error Page")
+                self.log.debug(f"   📏 Content Length: {result.get('content_length', 0)} chars")
+                self.log.debug(f"   🔗 Final URL: {result.get('final_url', '')}")
                 if result.get('error_indicators', 0) > 0:
-                    print(f"   🔍 Error Indicators Found: {result.get('error_indicators', 0)} detected")
+                    self.log.debug(f"   🔍 Error Indicators Found: {result.get('error_indicators', 0)} detected")
             else:
-                print(f"   ⚠️  {result['status']}")
-                print(f"   📏 Content Length: {result.get('content_length', 0)} chars")
+                self.log.debug(f"   ⚠️  {result['status']}")
+                self.log.debug(f"   📏 Content Length: {result.get('content_length', 0)} chars")
                 if final_url != url:
-                    print(f"   🔗 Final URL: {final_url}")
+                    self.log.debug(f"   🔗 Final URL: {final_url}")
                 if result.get('business_indicators', 0) > 0:
-                    print(f"   📊 Business Indicators: {result.get('business_indicators', 0)}")
+                    self.log.debug(f"   📊 Business Indicators: {result.get('business_indicators', 0)}")
             
             return result
             
         except TimeoutException:
             error_msg = f"BROWSER_ERROR: Page load timeout for {slug}"
-            print(f"   🌐 CONNECTION ERROR - Logging for retry: Page load timeout")
+            self.log.info(f"   🌐 CONNECTION ERROR - Logging for retry: Page load timeout")
             return {
                 'status': 'TIMEOUT',
                 'error': error_msg,
@@ -367,7 +801,9 @@ class CompleteFastScanner:
             
         except WebDriverException as e:
             error_msg = f"BROWSER_ERROR: WebDriver error for {slug}: {str(e)}"
-            print(f"   🔧 BROWSER ERROR - Logging for retry: {str(e)[:100]}")
+            self.log.info(f"   🔧 BROWSER ERROR - Logging for retry: {str(e)[:100]}")
+            # The session may be dead - start a fresh Chrome for the next slug
+            self.quit_driver()
             return {
                 'status': 'BROWSER_ERROR',
                 'error': error_msg,
@@ -378,7 +814,7 @@ class CompleteFastScanner:
             
         except Exception as e:
             error_msg = f"ERROR: Unexpected error for {slug}: {str(e)}"
-            print(f"   ❌ UNKNOWN ERROR - Logging for retry: {str(e)[:100]}")
+            self.log.info(f"   ❌ UNKNOWN ERROR - Logging for retry: {str(e)[:100]}")
             return {
                 'status': 'ERROR',
                 'error': error_msg,
@@ -386,52 +822,140 @@ class CompleteFastScanner:
                 'final_url': url,
                 'slug': slug
             }
-            
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
     
-    def analyze_page_content(self, page_text, page_title, final_url, slug):
-        """Analyze page content to determine if business is active"""
-        content_lower = page_text.lower()
-        title_lower = page_title.lower()
-        
-        # Check for error indicators first
-        error_indicators = 0
-        business_indicators = 0
-        
-        # Strong error indicators
-        error_patterns = [
-            '401', 'error', 'nothing left to do here', 'go to homepage',
-            'unauthorized', 'access denied', 'not found'
-        ]
-        
-        # Business content indicators
-        business_patterns = [
-            'altura health', 'dripbar', 'wellness', 'clinic', 'medical', 'health',
-            'therapy', 'treatment', 'spa', 'center', 'institute', 'practice',
-            'weight loss', 'injection', 'iv therapy', 'hydration', 'vitamin',
-            'consultation', 'appointment', 'booking', 'schedule', 'service',
-            'contact', 'location', 'address', 'phone', 'email', 'hours',
-            'book now', 'schedule appointment', 'select service', 'choose time'
-        ]
-        
-        # Count indicators
-        for pattern in error_patterns:
-            if pattern in content_lower:
-                error_indicators += 1
+    def read_page_state(self, driver):
+        """Return the page's url, title and lowercased body text from a single Runtime.evaluate"""
+        response = driver.execute_cdp_cmd('Runtime.evaluate', {
+            'expression': PAGE_STATE_EXPRESSION,
+            'returnByValue': True
+        })
+        return response.get('result', {}).get('value') or {}
+    
+    def wait_for_page_ready(self, driver):
+        """Wait until the body shows an error or booking marker (js_wait_time cap, 100ms polls).
+        Returns the page state that satisfied the wait, so the page isn't read twice."""
+        def page_ready(d):
+            state = self.read_page_state(d)
+            text = state.get('text', '')
+            return state if any(marker in text for marker in PAGE_READY_MARKERS) else False
         
-        for pattern in business_patterns:
-            if pattern in content_lower:
-                business_indicators += 1
+        try:
+            return WebDriverWait(driver, self.js_wait_time, poll_frequency=0.1).until(page_ready)
+        except TimeoutException:
+            # Nothing recognisable yet - classify whatever has rendered, as the fixed sleep did
+            return self.read_page_state(driver)
+    
+    async def test_slug_http(self, slug, current_count):
+        """Classify a slug from its raw HTML - returns None when the page needs Chrome"""
+        start_test_time = time.time()
+        url = f"{self.base_url}{slug}"
         
-        # Determine status
-        if error_indicators > 0 or '401' in page_text or 'nothing left to do here' in content_lower:
+        if self.http_client is not None:
+            async with self.http_semaphore:
+                await asyncio.sleep(self.rate_limiter.reserve())
+                response = await self.http_client.get(url)
+        else:
+            response = await asyncio.get_running_loop().run_in_executor(
+                self.http_executor, self.fetch_with_session, url)
+        
+        # Server errors may be transient - let Chrome have a go
+        if response.status_code >= 500:
+            return None
+        
+        loop = asyncio.get_running_loop()
+        page_text, page_title = await loop.run_in_executor(self.classify_executor, parse_page_html, response.text)
+        cache_key = self.classification_key(page_text, page_title)
+        cached = self.get_cached_classification(cache_key)
+        if cached is None:
+            cached = await loop.run_in_executor(
+                self.classify_executor, self.classify_page_content, page_text, page_title)
+            self.cache_classification(cache_key, cached)
+        result = self.finish_result(cached, str(response.url))
+        if response.status_code >= 400:
+            # Rejected at the HTTP layer (401/403/404) - no business page behind it
+            result['status'] = 'INACTIVE_401'
+        elif result['status'] in AMBIGUOUS_STATUSES:
+            return None
+        
+        result['load_time'] = time.time() - start_test_time
+        result['slug'] = slug
+        
+        self.log.debug(f"🔍 [{current_count:,}] Testing: {slug} (HTTP)")
+        if result['status'] == 'ACTIVE':
+            self.log.warning(f"   🌟 ACTIVE BUSINESS PAGE - {slug}: {result.get('business_name', '')}")
+            self.log.warning(f"   📊 Business Indicators: {result.get('business_indicators', 0)}")
+            self.log.warning(f"   ⏱️  Load Time: {result['load_time']:.2f} seconds")
+        else:
+            self.log.debug(f"   🚫 {result['status']} - {result.get('content_length', 0)} chars, {result['load_time']:.2f}s")
+        return result
+    
+    def fetch_with_session(self, url):
+        """Blocking keep-alive GET on the shared requests.Session (prefilter without httpx)"""
+        self.rate_limiter.acquire()
+        return self.http_session.get(url, timeout=self.page_load_timeout)
+    
+    async def test_slug(self, slug, current_count):
+        """Test one slug - HTTP prefilter first, Chrome only when the HTML is ambiguous"""
+        result = None
+        if self.http_client is not None or self.http_session is not None:
+            try:
+                result = await self.test_slug_http(slug, current_count)
+            except (*HTTP_TIMEOUT_ERRORS, *HTTP_CONNECTION_ERRORS) as e:
+                self.log.debug(f"   🌐 HTTP prefilter failed for {slug}, using Chrome: {str(e)[:100]}")
+        if result is None:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.browser_executor, self.test_slug_with_browser, slug, current_count)
+        return result
+    
+    def analyze_page_content(self, page_text, page_title, final_url, slug):
+        """Analyze page content to determine if business is active (memoized per page text digest + title)"""
+        cache_key = self.classification_key(page_text, page_title)
+        cached = self.get_cached_classification(cache_key)
+        if cached is None:
+            if self.classify_executor is not None:
+                cached = self.classify_executor.submit(self.classify_page_content, page_text, page_title).result()
+            else:
+                cached = self.classify_page_content(page_text, page_title)
+            self.cache_classification(cache_key, cached)
+        return self.finish_result(cached, final_url)
+    
+    @staticmethod
+    def classification_key(page_text, page_title):
+        return (page_title, hashlib.blake2b(page_text.encode('utf-8'), digest_size=16).digest())
+    
+    def get_cached_classification(self, cache_key):
+        with self.classify_cache_lock:
+            cached = self.classify_cache.get(cache_key)
+            if cached is not None:
+                self.classify_cache.move_to_end(cache_key)
+        return cached
+    
+    def cache_classification(self, cache_key, cached):
+        with self.classify_cache_lock:
+            self.classify_cache[cache_key] = cached
+            if len(self.classify_cache) > self.classify_cache_size:
+                self.classify_cache.popitem(last=False)
+    
+    @staticmethod
+    def finish_result(cached, final_url):
+        """Copy a cached classification into a per-slug result"""
+        result = dict(cached)
+        result['services'] = list(cached['services'])
+        result['final_url'] = final_url
+        return result
+    
+    @staticmethod
+    def classify_page_content(page_text, page_title):
+        """Classify page text - everything in the result except final_url"""
+        # Count indicators - all patterns are found in a single pass over the text
+        found = find_patterns(page_text)
+        error_indicators = sum(1 for pattern in ERROR_PATTERNS if pattern in found)
+        business_indicators = sum(1 for pattern in BUSINESS_PATTERNS if pattern in found)
+        
+        # Determine status ('401' and 'nothing left to do here' are error patterns)
+        if error_indicators > 0:
             status = 'INACTIVE_401'
-        elif business_indicators >= 3 or any(name in content_lower for name in ['altura health', 'dripbar']):
+        elif business_indicators >= 3 or 'altura health' in found or 'dripbar' in found:
             status = 'ACTIVE'
         elif len(page_text) > 500 and business_indicators > 0:
             status = 'POTENTIALLY_ACTIVE'
@@ -439,10 +963,10 @@ class CompleteFastScanner:
             status = 'INACTIVE_UNKNOWN'
         
         # Extract business name
-        business_name = self.extract_business_name_enhanced(page_text, page_title)
+        business_name = CompleteFastScanner.extract_business_name_enhanced(page_text, page_title)
         
         # Extract services
-        services = self.extract_services_from_content(page_text)
+        services = CompleteFastScanner.extract_services_from_content(page_text)
         
         return {
             'status': status,
@@ -451,36 +975,31 @@ class CompleteFastScanner:
             'content_length': len(page_text),
             'business_indicators': business_indicators,
             'error_indicators': error_indicators,
-            'final_url': final_url,
             'page_title': page_title
         }
     
-    def extract_business_name_enhanced(self, page_text, page_title):
+    @staticmethod
+    def extract_business_name_enhanced(page_text, page_title):
         """Extract business name from page content"""
         # Known business patterns
-        if 'altura health' in page_text.lower():
+        text_lower = page_text.lower()
+        if 'altura health' in text_lower:
             return 'Altura Health'
-        elif 'dripbar' in page_text.lower():
+        elif 'dripbar' in text_lower:
             return 'The DRIPBaR'
         elif page_title and page_title != 'VSDHOne' and page_title.strip():
             return page_title
         else:
             # Look for patterns like "Welcome to [Business Name]"
-            import re
-            patterns = [
-                r'welcome to ([^.!?\n]+)',
-                r'([^.!?\n]+) - book now',
-                r'book your appointment at ([^.!?\n]+)'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, page_text.lower())
+            for pattern in BUSINESS_NAME_PATTERNS:
+                match = pattern.search(text_lower)
                 if match:
                     return match.group(1).title()
         
         return ''
     
-    def extract_services_from_content(self, content):
+    @staticmethod
+    def extract_services_from_content(content):
         """Extract services from page content"""
         services = []
         service_keywords = [
@@ -511,10 +1030,32 @@ class CompleteFastScanner:
             'error': result.get('error', '') if result and 'error' in result else ''
         }
         
-        self.session_data['testing_results'].append(test_entry)
+        # Entries go straight to the NDJSON file; only running totals stay in memory
+        self.logged_tests += 1
+        self.total_load_time += test_entry['load_time']
+        if self.session_results_fh is not None:
+            self.session_results_fh.write(json.dumps(test_entry, ensure_ascii=False) + '\n')
+    
+    def open_session_files(self):
+        """Open the results CSV and session NDJSON for appending - header only when the CSV is new"""
+        write_header = not os.path.exists(self.results_file) or os.path.getsize(self.results_file) == 0
+        self.results_fh = open(self.results_file, 'a', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        self.results_writer = csv.DictWriter(self.results_fh, fieldnames=RESULT_FIELDNAMES)
+        if write_header:
+            self.results_writer.writeheader()
+        self.session_results_fh = open(self.session_results_file, 'a', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+    
+    def close_session_files(self):
+        """Flush and close the appended results/session files"""
+        for fh in (self.results_fh, self.session_results_fh):
+            if fh is not None:
+                fh.close()
+        self.results_fh = None
+        self.results_writer = None
+        self.session_results_fh = None
     
     def save_session_log(self):
-        """Save complete session log to JSON file"""
+        """Save session info and summary to JSON - per-slug entries live in the NDJSON file"""
         # Update session end time and duration
         if self.session_data['session_info']['start_time']:
             start_time = datetime.fromisoformat(self.session_data['session_info']['start_time'])
@@ -530,20 +1071,25 @@ class CompleteFastScanner:
         
         # Save to file
         try:
-            with open(self.session_log_file, 'w', encoding='utf-8') as f:
-                json.dump(self.session_data, f, indent=2, ensure_ascii=False)
-            print(f"📋 Session log saved to: {self.session_log_file}")
+            write_json_atomic(self.session_log_file, self.session_data)
+            self.log.debug(f"📋 Session log saved to: {self.session_log_file}")
         except Exception as e:
-            print(f"⚠️  Error saving session log: {e}")
+            self.log.warning(f"⚠️  Error saving session log: {e}")
 
     def signal_handler(self, signum, frame):
         """Handle graceful shutdown"""
-        print(f"\n🛑 Received signal {signum}. Saving progress...")
-        self.save_progress()
+        self.log.warning(f"\n🛑 Received signal {signum}. Saving progress...")
+        self.quit_drivers()
+        self.commit_state()
+        self.log.info("✅ Progress saved. Exiting...")
+        sys.exit(0)
+    
+    def commit_state(self):
+        """Write progress, results and the session log in one go - on a wall-clock cadence and at exit"""
         self.save_results()
+        self.save_progress()
         self.save_session_log()
-        print("✅ Progress saved. Exiting...")
-        sys.exit(0)
+        self.last_commit = time.monotonic()
     
     def save_progress(self):
         """Save current progress to JSON file"""
@@ -564,39 +1110,39 @@ class CompleteFastScanner:
         }
         
         try:
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress_data, f, indent=2, ensure_ascii=False)
+            write_json_atomic(self.progress_file, progress_data)
         except Exception as e:
-            print(f"⚠️  Error saving progress: {e}")
+            self.log.warning(f"⚠️  Error saving progress: {e}")
     
     def save_results(self):
-        """Save results to CSV file"""
+        """Flush the appended results CSV and session NDJSON to disk"""
         try:
-            with open(self.results_file, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'slug', 'status', 'business_name', 'services', 'load_time',
-                    'content_length', 'business_indicators', 'error_indicators',
-                    'final_url', 'page_title', 'timestamp'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for result in self.found_slugs:
-                    writer.writerow({
-                        'slug': result.get('slug', ''),
-                        'status': result.get('status', ''),
-                        'business_name': result.get('business_name', ''),
-                        'services': ', '.join(result.get('services', [])),
-                        'load_time': result.get('load_time', 0),
-                        'content_length': result.get('content_length', 0),
-                        'business_indicators': result.get('business_indicators', 0),
-                        'error_indicators': result.get('error_indicators', 0),
-                        'final_url': result.get('final_url', ''),
-                        'page_title': result.get('page_title', ''),
-                        'timestamp': datetime.now().isoformat()
-                    })
+            for fh in (self.results_fh, self.session_results_fh):
+                if fh is not None:
+                    fh.flush()
         except Exception as e:
-            print(f"⚠️  Error saving results: {e}")
+            self.log.warning(f"⚠️  Error saving results: {e}")
+    
+    def write_result_row(self, result):
+        """Append one active business to the results CSV"""
+        if self.results_writer is None:
+            return
+        try:
+            self.results_writer.writerow({
+                'slug': result.get('slug', ''),
+                'status': result.get('status', ''),
+                'business_name': result.get('business_name', ''),
+                'services': ', '.join(result.get('services', [])),
+                'load_time': result.get('load_time', 0),
+                'content_length': result.get('content_length', 0),
+                'business_indicators': result.get('business_indicators', 0),
+                'error_indicators': result.get('error_indicators', 0),
+                'final_url': result.get('final_url', ''),
+                'page_title': result.get('page_title', ''),
+                'timestamp': datetime.now().isoformat()
+            })
+        except Exception as e:
+            self.log.warning(f"⚠️  Error saving results: {e}")
     
     def load_checkpoint(self):
         """Load last checkpoint to resume scanning"""
@@ -606,22 +1152,45 @@ class CompleteFastScanner:
         return None
     
     def save_checkpoint(self, current_slug):
-        """Save current position for resuming"""
-        with open(self.checkpoint_file, 'w') as f:
-            f.write(current_slug)
+        """Save current position for resuming - overwritten in place on a held fd, fsynced every few checkpoints"""
+        if self.checkpoint_fd is None:
+            self.checkpoint_fd = os.open(self.checkpoint_file, os.O_WRONLY | os.O_CREAT, 0o644)
+        data = current_slug.encode('utf-8')
+        os.lseek(self.checkpoint_fd, 0, os.SEEK_SET)
+        os.write(self.checkpoint_fd, data)
+        os.ftruncate(self.checkpoint_fd, len(data))
+        
+        self.checkpoints_since_sync += 1
+        if self.checkpoints_since_sync >= self.checkpoint_sync_every:
+            os.fsync(self.checkpoint_fd)
+            self.checkpoints_since_sync = 0
+    
+    def close_checkpoint(self):
+        """Sync and close the held checkpoint fd"""
+        if self.checkpoint_fd is not None:
+            try:
+                os.fsync(self.checkpoint_fd)
+            finally:
+                os.close(self.checkpoint_fd)
+                self.checkpoint_fd = None
+                self.checkpoints_since_sync = 0
     
     def cleanup_checkpoint(self):
         """Remove checkpoint file when scan completes successfully"""
+        self.close_checkpoint()
         try:
             if os.path.exists(self.checkpoint_file):
                 os.remove(self.checkpoint_file)
-                print(f"🗑️  Checkpoint file cleaned up: {self.checkpoint_file}")
+                self.log.info(f"🗑️  Checkpoint file cleaned up: {self.checkpoint_file}")
         except Exception as e:
-            print(f"⚠️  Warning: Could not clean up checkpoint file: {e}")
+            self.log.warning(f"⚠️  Warning: Could not clean up checkpoint file: {e}")
     
     def scan_comprehensive_range(self, resume=True):
         """Main scanning function with all comprehensive features + speed optimizations"""
-        self.start_time = datetime.now().isoformat()
+        self.start_datetime = datetime.now()
+        self.start_time = self.start_datetime.isoformat()
+        self.start_monotonic = time.monotonic()
+        self.last_commit = self.start_monotonic
         
         # Set session start time
         self.session_data['session_info']['start_time'] = self.start_time
@@ -631,116 +1200,210 @@ class CompleteFastScanner:
         if resume:
             start_from = self.load_checkpoint()
         
-        print(f"🚀 Starting complete fast scan at {self.start_time}")
-        print(f"📍 Instance ID: {self.instance_id}")
-        print(f"📊 Range: {self.start_range} to {self.end_range}")
+        self.log.info(f"🚀 Starting complete fast scan at {self.start_time}")
+        self.log.info(f"📍 Instance ID: {self.instance_id}")
+        self.log.info(f"📊 Range: {self.start_range} to {self.end_range}")
         if start_from:
-            print(f"📍 Resuming from checkpoint: {start_from}")
-        print("")
+            self.log.info(f"📍 Resuming from checkpoint: {start_from}")
+        self.log.info("")
         
         scan_completed_successfully = False
         
         try:
-            # Choose generator based on scanning mode
+            self.open_session_files()
+            
+            # Choose slug source based on scanning mode
             if self.slug_file:
-                slug_generator = self.generate_file_based_slugs(start_from)
+                slugs = self.generate_file_based_slugs(start_from)
             else:
-                slug_generator = self.generate_range_combinations(start_from)
+                slugs = self.generate_range_combinations(start_from)
             
-            for i, slug in enumerate(slug_generator):
-                current_count = i + 1
-                self.tested_count = current_count
-                
-                # Skip known slugs
-                if slug in self.known_slugs:
-                    print(f"🔍 [{current_count:,}] Testing: {slug}")
-                    print(f"   ⏭️  Skipping known working slug")
-                    self.skipped_count += 1
-                elif slug in self.tested_slugs:
-                    print(f"🔍 [{current_count:,}] Testing: {slug}")
-                    print(f"   ⏭️  Skipping previously tested slug")
-                    self.skipped_count += 1
-                else:
-                    # Test individual slug with OPTIMIZED browser
-                    result = self.test_slug_with_browser(slug, current_count)
-                    
-                    # Log the result (always log, regardless of type)
-                    self.log_test_result(slug, result, "FAST_COMPREHENSIVE_SCAN")
-                    
-                    # Update session summary based on result
-                    if result:
-                        if result.get('status') == 'ACTIVE':
-                            self.found_slugs.append(result)
-                            self.session_data['session_summary']['active_found'] += 1
-                            print(f"   ✅ SAVED! Total active businesses found: {len(self.found_slugs)}")
-                        elif result.get('status') == 'CONNECTION_ERROR':
-                            self.session_data['session_summary']['connection_errors'] += 1
-                        elif result.get('status') == 'BROWSER_ERROR':
-                            self.session_data['session_summary']['browser_errors'] += 1
-                        elif result.get('status') == 'INACTIVE_401':
-                            self.session_data['session_summary']['inactive_found'] += 1
-                        elif result.get('status') == 'ERROR':
-                            self.session_data['session_summary']['other_errors'] += 1
-                    
-                    # Update total tested count
-                    self.session_data['session_summary']['total_tested'] += 1
-                
-                # OPTIMIZED: Faster rate limiting (0.1s vs 0.2s)
-                time.sleep(1.0 / self.requests_per_second)
-                
-                # Checkpoint every N slugs
-                if current_count % self.checkpoint_interval == 0:
-                    self.save_checkpoint(slug)
-                    
-                    elapsed = (datetime.now() - datetime.fromisoformat(self.start_time)).total_seconds()
-                    rate = current_count / elapsed if elapsed > 0 else 0
-                    
-                    print(f"\n📍 CHECKPOINT #{current_count // self.checkpoint_interval}")
-                    print(f"📊 Progress: {current_count:,} tested in range")
-                    print(f"🌟 Active businesses found: {len(self.found_slugs)}")
-                    print(f"⚡ Rate: {rate:.2f} slugs/sec (FAST)")
-                    print(f"💾 Checkpoint saved at: {datetime.now().strftime('%H:%M:%S')}")
-                    print("-" * 60)
-                    print("")
-                    
-                    # Save progress and results periodically
-                    if current_count % (self.checkpoint_interval * 5) == 0:
-                        self.save_progress()
-                        self.save_results()
+            asyncio.run(self.scan_async(slugs))
             
             # If we reach here, the scan completed successfully
             scan_completed_successfully = True
         
         except KeyboardInterrupt:
-            print("\n🛑 Scan interrupted by user")
+            self.log.warning("\n🛑 Scan interrupted by user")
         except Exception as e:
-            print(f"❌ Error during scan: {e}")
+            self.log.error(f"❌ Error during scan: {e}")
         finally:
-            self.save_progress()
-            self.save_results()
-            self.save_session_log()
+            self.quit_drivers()
+            self.commit_state()
+            self.log.info(f"📋 Session log saved to: {self.session_log_file}")
+            self.close_session_files()
+            self.close_checkpoint()
             
             # Clean up checkpoint file if scan completed successfully
             if scan_completed_successfully:
                 self.cleanup_checkpoint()
             
             self.print_final_summary()
+            self.log_listener.stop()
+    
+    async def scan_async(self, slugs):
+        """Test slug numbers in checkpoint-sized batches - the batch's HTTP requests run concurrently"""
+        self.browser_executor = ThreadPoolExecutor(max_workers=self.browser_workers, thread_name_prefix='chrome')
+        self.classify_executor = ProcessPoolExecutor(max_workers=self.classify_workers, initializer=init_classify_worker)
+        if self.http_prefilter and HTTPX_AVAILABLE:
+            limits = httpx.Limits(max_connections=self.max_concurrency,
+                                  max_keepalive_connections=self.max_concurrency, keepalive_expiry=60)
+            self.http_client = httpx.AsyncClient(timeout=self.page_load_timeout, follow_redirects=True, limits=limits)
+            self.http_semaphore = asyncio.Semaphore(self.max_concurrency)
+        elif self.http_prefilter:
+            self.http_session = requests.Session()
+            self.http_session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=self.max_concurrency))
+            self.http_executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='http')
+        
+        # Progress bar on stderr (hidden when it isn't a terminal)
+        progress = tqdm(total=len(slugs), unit='slug', disable=None) if TQDM_AVAILABLE else None
+        
+        try:
+            slug_iter = iter(slugs)
+            current_count = 0
+            while True:
+                batch = list(itertools.islice(slug_iter, self.checkpoint_interval))
+                if not batch:
+                    break
+                
+                pending = []
+                for num in batch:
+                    current_count += 1
+                    # Skip known slugs
+                    if num in self.known_slugs:
+                        self.log.debug(f"🔍 [{current_count:,}] Testing: {number_to_slug(num)}")
+                        self.log.debug(f"   ⏭️  Skipping known working slug")
+                        self.skipped_count += 1
+                    elif num in self.tested_slugs:
+                        self.log.debug(f"🔍 [{current_count:,}] Testing: {number_to_slug(num)}")
+                        self.log.debug(f"   ⏭️  Skipping previously tested slug")
+                        self.skipped_count += 1
+                    elif num in self.shared_tested:
+                        self.log.debug(f"🔍 [{current_count:,}] Testing: {number_to_slug(num)}")
+                        self.log.debug(f"   ⏭️  Skipping slug already tested by a parallel instance")
+                        self.skipped_count += 1
+                        self.shared_skipped_count += 1
+                    else:
+                        pending.append((number_to_slug(num), current_count))
+                
+                results = await asyncio.gather(*(self.test_slug(slug, count) for slug, count in pending))
+                for (slug, count), result in zip(pending, results):
+                    self.record_or_retry(slug, count, result, 0)
+                self.tested_count = current_count
+                if progress is not None:
+                    progress.update(len(batch))
+                    progress.set_postfix(active=len(self.found_slugs))
+                
+                # Checkpoint every N slugs (each full batch ends on a checkpoint boundary)
+                if current_count % self.checkpoint_interval == 0:
+                    await self.drain_retry_queue(self.retry_batch_size)
+                    self.save_checkpoint(self.checkpoint_slug(batch[-1]))
+                    
+                    elapsed = time.monotonic() - self.start_monotonic
+                    rate = current_count / elapsed if elapsed > 0 else 0
+                    
+                    self.log.warning(f"\n📍 CHECKPOINT #{current_count // self.checkpoint_interval}")
+                    self.log.warning(f"📊 Progress: {current_count:,} tested in range")
+                    self.log.warning(f"🌟 Active businesses found: {len(self.found_slugs)}")
+                    self.log.warning(f"⚡ Rate: {rate:.2f} slugs/sec (FAST)")
+                    self.log.warning(f"💾 Checkpoint saved at: {datetime.now().strftime('%H:%M:%S')}")
+                    self.log.warning("-" * 60)
+                    self.log.warning("")
+                
+                # Save progress, results and session log on the clock, not per N slugs
+                if time.monotonic() - self.last_commit >= COMMIT_INTERVAL:
+                    self.commit_state()
+            
+            # Whatever is still queued gets its retries before the scan ends
+            while self.retry_queue:
+                await self.drain_retry_queue(len(self.retry_queue))
+        finally:
+            if progress is not None:
+                progress.close()
+            if self.http_client is not None:
+                await self.http_client.aclose()
+                self.http_client = None
+            if self.http_session is not None:
+                self.http_executor.shutdown(wait=True)
+                self.http_session.close()
+                self.http_executor = None
+                self.http_session = None
+            # Drivers are quit by the caller once the Chrome threads are idle
+            self.browser_executor.shutdown(wait=True)
+            self.classify_executor.shutdown(wait=True)
+            self.classify_executor = None
+    
+    def checkpoint_slug(self, last_num):
+        """Resume point - the earliest slug still waiting for a retry, else the batch's last slug.
+        Settled slugs after it are skipped on resume via the shared bitmap."""
+        if self.retry_queue:
+            return min(self.retry_queue, key=lambda item: item[1])[0]
+        return number_to_slug(last_num)
+    
+    def record_or_retry(self, slug, current_count, result, attempts):
+        """Queue a transient Chrome failure for retry, or record the result if it's final"""
+        if result and result.get('status') in RETRY_STATUSES and attempts < self.max_retries:
+            self.retry_queue.append((slug, current_count, attempts + 1))
+        else:
+            self.record_result(slug, result)
+    
+    async def drain_retry_queue(self, limit):
+        """Retry up to `limit` queued slugs on the Chrome pool's existing drivers"""
+        retries = [self.retry_queue.popleft() for _ in range(min(limit, len(self.retry_queue)))]
+        if not retries:
+            return
+        
+        self.log.info(f"🔁 Retrying {len(retries)} failed slugs ({len(self.retry_queue)} still queued)")
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self.browser_executor, self.test_slug_with_browser, slug, count)
+            for slug, count, _ in retries))
+        for (slug, count, attempts), result in zip(retries, results):
+            self.record_or_retry(slug, count, result, attempts)
+    
+    def record_result(self, slug, result):
+        """Log a test result, update the session summary and mark settled slugs in the shared bitmap"""
+        if result and result.get('status') not in UNSETTLED_STATUSES:
+            self.shared_tested.add_number(slug_to_number(slug))
+        
+        # Log the result (always log, regardless of type)
+        self.log_test_result(slug, result, "FAST_COMPREHENSIVE_SCAN")
+        
+        # Update session summary based on result
+        if result:
+            if result.get('status') == 'ACTIVE':
+                self.found_slugs.append(result)
+                self.write_result_row(result)
+                self.session_data['session_summary']['active_found'] += 1
+                self.log.warning(f"   ✅ SAVED! Total active businesses found: {len(self.found_slugs)}")
+            elif result.get('status') == 'CONNECTION_ERROR':
+                self.session_data['session_summary']['connection_errors'] += 1
+            elif result.get('status') == 'BROWSER_ERROR':
+                self.session_data['session_summary']['browser_errors'] += 1
+            elif result.get('status') == 'INACTIVE_401':
+                self.session_data['session_summary']['inactive_found'] += 1
+            elif result.get('status') == 'ERROR':
+                self.session_data['session_summary']['other_errors'] += 1
+        
+        # Update total tested count
+        self.session_data['session_summary']['total_tested'] += 1
     
     def print_final_summary(self):
         """Print final scan summary"""
         end_time = datetime.now()
-        if self.start_time:
-            duration = end_time - datetime.fromisoformat(self.start_time)
+        if self.start_datetime:
+            duration = end_time - self.start_datetime
         else:
             duration = "Unknown"
         
-        print(f"\n🎯 COMPLETE FAST SCAN COMPLETE (Instance: {self.instance_id})")
-        print(f"=" * 70)
-        print(f"📊 Range scanned: {self.start_range} to {self.end_range}")
-        print(f"🧮 Total combinations processed: {self.tested_count:,}")
-        print(f"⏭️  Previously tested (skipped): {self.skipped_count:,}")
-        print(f"🔍 New combinations tested: {self.tested_count - self.skipped_count:,}")
-        print(f"🌟 Active business pages found: {len(self.found_slugs)}")
+        self.log.info(f"\n🎯 COMPLETE FAST SCAN COMPLETE (Instance: {self.instance_id})")
+        self.log.info(f"=" * 70)
+        self.log.info(f"📊 Range scanned: {self.start_range} to {self.end_range}")
+        self.log.info(f"🧮 Total combinations processed: {self.tested_count:,}")
+        self.log.info(f"⏭️  Previously tested (skipped): {self.skipped_count:,}")
+        self.log.info(f"🤝 Skipped via shared bitmap: {self.shared_skipped_count:,} ({self.shared_tested_file})")
+        self.log.info(f"🔍 New combinations tested: {self.tested_count - self.skipped_count:,}")
+        self.log.info(f"🌟 Active business pages found: {len(self.found_slugs)}")
         
         # Show error summary
         connection_errors = self.session_data['session_summary']['connection_errors']
@@ -748,31 +1411,35 @@ class CompleteFastScanner:
         other_errors = self.session_data['session_summary']['other_errors']
         
         if connection_errors > 0 or browser_errors > 0 or other_errors > 0:
-            print(f"🔧 Errors logged for retry: {connection_errors} connection, {browser_errors} browser, {other_errors} other")
+            self.log.info(f"🔧 Errors logged for retry: {connection_errors} connection, {browser_errors} browser, {other_errors} other")
         
         # Calculate performance metrics
-        if self.session_data['testing_results']:
-            total_time = sum(r['load_time'] for r in self.session_data['testing_results'])
-            avg_time = total_time / len(self.session_data['testing_results'])
-            print(f"⚡ Average test time: {avg_time:.2f}s per slug (OPTIMIZED)")
-            print(f"🚀 Theoretical max rate: {3600/avg_time:.0f} slugs/hour")
+        if self.logged_tests and self.total_load_time > 0:
+            avg_time = self.total_load_time / self.logged_tests
+            self.log.info(f"⚡ Average test time: {avg_time:.2f}s per slug (OPTIMIZED)")
+            self.log.info(f"🚀 Theoretical max rate: {3600/avg_time:.0f} slugs/hour")
         
-        print(f"⏱️  Scan duration: {duration}")
-        print(f"💾 Results saved to: {self.results_file}")
-        print(f"📋 Session log saved to: {self.session_log_file}")
+        self.log.info(f"⏱️  Scan duration: {duration}")
+        self.log.info(f"💾 Results saved to: {self.results_file}")
+        self.log.info(f"📋 Session log saved to: {self.session_log_file}")
+        self.log.info(f"📋 Per-slug results logged to: {self.session_results_file}")
         
         if self.found_slugs:
-            print(f"\n🔍 DISCOVERED ACTIVE BUSINESS PAGES:")
+            self.log.info(f"\n🔍 DISCOVERED ACTIVE BUSINESS PAGES:")
             for result in self.found_slugs:
                 services_str = ', '.join(result.get('services', [])[:3])
-                print(f"  • {result['slug']}: {result.get('business_name', 'Unknown')} - {services_str}")
+                self.log.info(f"  • {result['slug']}: {result.get('business_name', 'Unknown')} - {services_str}")
         else:
-            print(f"\n❌ No new active business pages found in range {self.start_range} to {self.end_range}")
+            self.log.info(f"\n❌ No new active business pages found in range {self.start_range} to {self.end_range}")
             if self.skipped_count > 0:
-                print(f"💡 Note: {self.skipped_count:,} slugs were skipped as already tested")
+                self.log.info(f"💡 Note: {self.skipped_count:,} slugs were skipped as already tested")
+
+def stride_for_instance(instance_num, total_instances=3):
+    """(offset, step) for parallel execution - instance k scans slug numbers n with n % total == k - 1"""
+    return (instance_num - 1, total_instances)
 
 def get_range_for_instance(instance_num, total_instances=3):
-    """Calculate range for parallel execution"""
+    """Calculate range for parallel execution (legacy lexicographic split)"""
     # charset = '0123456789abcdefghijklmnopqrstuvwxyz' (36 chars)
     # Split into 3 logical ranges based on new charset order:
     # Instance 1: 0-9 (all numeric combinations)
@@ -803,7 +1470,16 @@ def main():
     parser.add_argument('--start-range', '-s', help='Start range for range-based scanning')
     parser.add_argument('--end-range', '-e', help='End range for range-based scanning')
     parser.add_argument('--predefined', '-p', choices=['1', '2', '3'], help='Use predefined range (1/2/3)')
+    parser.add_argument('--lexicographic-split', action='store_true',
+                        help='With --predefined, split by leading character (0-9 / a-m / n-z) instead of striding')
     parser.add_argument('--force-test', action='store_true', help='Force test all slugs (ignore known/tested lists)')
+    parser.add_argument('--reset-shared', action='store_true',
+                        help="Clear this run group's shared tested bitmap first so its settled slugs are retested")
+    parser.add_argument('--http-prefilter', action='store_true',
+                        help='Try each slug over plain HTTP before Chrome (off by default - the SPA shell rarely classifies)')
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING'],
+                        help='Console verbosity: DEBUG shows every slug, WARNING only active finds and checkpoints '
+                             '(the session .log file always gets everything)')
     
     args = parser.parse_args()
     
@@ -821,32 +1497,43 @@ def main():
             return
         
         print(f"📂 File-based scanning mode: {slug_file}")
-        scanner = CompleteFastScanner(instance_id, slug_file=slug_file)
+        scanner = CompleteFastScanner(instance_id, slug_file=slug_file, log_level=args.log_level,
+                                      http_prefilter=args.http_prefilter, reset_shared=args.reset_shared)
         
         # Handle force test mode
         if args.force_test:
             print("🔥 FORCE TEST MODE: Will test all slugs regardless of known/tested status")
             scanner.known_slugs = set()  # Clear known slugs
             scanner.tested_slugs = set()  # Clear tested slugs
+            scanner.shared_tested = SlugBitmap()  # Private - don't skip what other instances tested
         
     else:
         # Range-based scanning
-        if args.predefined:
+        stride = None
+        if args.predefined and args.lexicographic_split:
             instance_num = int(args.predefined)
             start_range, end_range = get_range_for_instance(instance_num)
             print(f"📊 Instance {instance_num} will scan: {start_range} to {end_range}")
+        elif args.predefined:
+            # Every instance strides the whole space - equal share of every prefix
+            instance_num = int(args.predefined)
+            start_range, end_range = '00000', 'zzzzz'
+            stride = stride_for_instance(instance_num)
+            print(f"📊 Instance {instance_num} will scan slug numbers n % {stride[1]} == {stride[0]}")
         else:
             start_range = args.start_range or 'aaaaa'
             end_range = args.end_range or 'zzzzz'
         
         print(f"📊 Range-based scanning mode: {start_range} to {end_range}")
-        scanner = CompleteFastScanner(instance_id, start_range, end_range)
+        scanner = CompleteFastScanner(instance_id, start_range, end_range, log_level=args.log_level, stride=stride,
+                                      http_prefilter=args.http_prefilter, reset_shared=args.reset_shared)
         
         # Handle force test mode
         if args.force_test:
             print("🔥 FORCE TEST MODE: Will test all slugs regardless of known/tested status")
             scanner.known_slugs = set()  # Clear known slugs
             scanner.tested_slugs = set()  # Clear tested slugs
+            scanner.shared_tested = SlugBitmap()  # Private - don't skip what other instances tested
     
     print(f"\n✅ All comprehensive features included:")
     print(f"   📍 Checkpoint/Resume capability")
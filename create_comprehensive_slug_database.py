@@ -8,37 +8,82 @@ Includes data from multiple laptops and comprehensive browser scans
 import json
 import csv
 import os
+import re
 import glob
 import itertools
 import string
 from datetime import datetime
-from collections import defaultdict
+
+# Try to import orjson for faster database dumps - falls back to the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# JSON database is written through an 8MB buffer - a handful of syscalls for the whole file
+JSON_WRITE_BUFFER_SIZE = 1 << 23
+
+# Slug space: 5 chars of 0-9a-z, numbered in charset order (which is also ASCII order)
+SLUG_CHARSET = string.digits + string.ascii_lowercase
+
+# Precomputed 2-char prefixes and 3-char suffixes - a slug number is split 1296 x 46656
+SLUG_SUFFIX_SPACE = 36 ** 3
+SLUG_PREFIXES = tuple(''.join(combo) for combo in itertools.product(SLUG_CHARSET, repeat=2))
+SLUG_SUFFIXES = tuple(''.join(combo) for combo in itertools.product(SLUG_CHARSET, repeat=3))
+
+def slug_to_number(slug):
+    """Convert slug to number (base 36 in charset order, parsed in C)"""
+    return int(slug, 36)
+
+def number_to_slug(num):
+    """Convert number back to slug"""
+    prefix, suffix = divmod(num, SLUG_SUFFIX_SPACE)
+    return SLUG_PREFIXES[prefix] + SLUG_SUFFIXES[suffix]
 
 def generate_range_slugs(start_range, end_range, max_count=1000):
-    """Generate individual slugs within a range (limited for performance)"""
-    charset = string.digits + string.ascii_lowercase
-    slugs = []
-    count = 0
+    """Generate individual slugs within a range of 5-char slugs (limited for performance)"""
+    # Work on slug numbers - no walk from 00000 up to the start of the range
+    start_num = slug_to_number(start_range)
+    end_num = min(slug_to_number(end_range), start_num + max_count - 1)
     
-    for combo in itertools.product(charset, repeat=5):
-        slug = ''.join(combo)
-        
-        if slug < start_range:
-            continue
-        if slug > end_range:
-            break
-            
-        slugs.append(slug)
-        count += 1
-        
-        # Limit to prevent memory issues with large ranges
-        if count >= max_count:
-            break
+    # Decode in bulk - one prefix per 46656 consecutive numbers, suffixes sliced straight from the table
+    slugs = []
+    first_prefix, first_suffix = divmod(start_num, SLUG_SUFFIX_SPACE)
+    last_prefix, last_suffix = divmod(end_num, SLUG_SUFFIX_SPACE)
+    for prefix_num in range(first_prefix, last_prefix + 1):
+        prefix = SLUG_PREFIXES[prefix_num]
+        suffixes = SLUG_SUFFIXES[first_suffix if prefix_num == first_prefix else 0:
+                                 last_suffix + 1 if prefix_num == last_prefix else SLUG_SUFFIX_SPACE]
+        slugs.extend(prefix + suffix for suffix in suffixes)
     
     return slugs
 
+SLUG_URL_PREFIX = 'https://vsdigital-bookingwidget-prod.azurewebsites.net/widget-business/'
+
+def slug_record(slug, source):
+    """Full database record of a slug - its source's shared fields plus the slug and its URL"""
+    return {
+        'slug': slug,
+        'status': source['status'],
+        'business_name': source['business_name'],
+        'tested_method': source['tested_method'],
+        'last_tested': source['last_tested'],
+        'url': SLUG_URL_PREFIX + slug,
+        'redirects_to': source['redirects_to'],
+        'content_length': source['content_length'],
+        'business_indicators': source['business_indicators'],
+        'services': source['services'],
+        'description': source['description']
+    }
+
+def slug_records(all_slugs, slugs):
+    """Lazily build the full records of the given slugs"""
+    return (slug_record(slug, all_slugs[slug]) for slug in slugs)
+
 def extract_all_tested_slugs():
-    """Extract all tested slugs from various sources"""
+    """Extract all tested slugs from various sources.
+    Maps each slug to the fields it shares with its source (one dict per source) - see slug_record."""
     all_slugs = {}
     
     # Known active business slugs
@@ -65,12 +110,10 @@ def extract_all_tested_slugs():
     # Add known active slugs
     for slug, info in known_active.items():
         all_slugs[slug] = {
-            'slug': slug,
             'status': info['status'],
             'business_name': info.get('business_name', ''),
             'tested_method': 'Known_Working',
             'last_tested': '2025-06-20',
-            'url': f'https://vsdigital-bookingwidget-prod.azurewebsites.net/widget-business/{slug}',
             'redirects_to': '',
             'content_length': '',
             'business_indicators': '',
@@ -85,48 +128,47 @@ def extract_all_tested_slugs():
         
         print(f"📊 Adding {len(api_tested)} API tested slugs from this laptop...")
         
+        # One shared dict of fields for every slug from this source
+        source = {
+            'status': 'INACTIVE_401',
+            'business_name': '',
+            'tested_method': 'API_HTTP_This_Laptop',
+            'last_tested': '2025-06-20',
+            'redirects_to': '/widget/401',
+            'content_length': '7537',
+            'business_indicators': '0',
+            'services': '',
+            'description': 'Returns identical React SPA HTML - likely inactive account'
+        }
         for slug in api_tested:
             if slug not in all_slugs:
-                all_slugs[slug] = {
-                    'slug': slug,
-                    'status': 'INACTIVE_401',
-                    'business_name': '',
-                    'tested_method': 'API_HTTP_This_Laptop',
-                    'last_tested': '2025-06-20',
-                    'url': f'https://vsdigital-bookingwidget-prod.azurewebsites.net/widget-business/{slug}',
-                    'redirects_to': '/widget/401',
-                    'content_length': '7537',
-                    'business_indicators': '0',
-                    'services': '',
-                    'description': 'Returns identical React SPA HTML - likely inactive account'
-                }
+                all_slugs[slug] = source
     
     # Extract from browser extraction results (early browser tests)
     if os.path.exists('browser_extraction_results_20250620_132138.csv'):
         with open('browser_extraction_results_20250620_132138.csv', 'r') as f:
-            reader = csv.DictReader(f)
-            browser_tested = []
-            for row in reader:
-                if len(row['slug']) == 5:
-                    browser_tested.append(row['slug'])
+            # Plain rows projected to the slug column - no per-row dict
+            reader = csv.reader(f)
+            slug_index = next(reader).index('slug')
+            browser_tested = [row[slug_index] for row in reader
+                              if len(row) > slug_index and len(row[slug_index]) == 5]
         
         print(f"📊 Adding {len(browser_tested)} early browser tested slugs...")
         
+        source = {
+            'status': 'INACTIVE_401',
+            'business_name': '',
+            'tested_method': 'Browser_Automation_Early',
+            'last_tested': '2025-06-20',
+            'redirects_to': '/widget/401',
+            'content_length': '49',
+            'business_indicators': '0',
+            'services': '',
+            'description': '401 ERROR Nothing left to do here. Go To HomePage'
+        }
         for slug in browser_tested:
             if slug not in all_slugs:
-                all_slugs[slug] = {
-                    'slug': slug,
-                    'status': 'INACTIVE_401',
-                    'business_name': '',
-                    'tested_method': 'Browser_Automation_Early',
-                    'last_tested': '2025-06-20',
-                    'url': f'https://vsdigital-bookingwidget-prod.azurewebsites.net/widget-business/{slug}',
-                    'redirects_to': '/widget/401',
-                    'content_length': '49',
-                    'business_indicators': '0',
-                    'services': '',
-                    'description': '401 ERROR Nothing left to do here. Go To HomePage'
-                }
+                all_slugs[slug] = source
     
     # Add comprehensive browser scan results from this laptop
     browser_progress_files = [
@@ -144,21 +186,20 @@ def extract_all_tested_slugs():
             # Generate representative slugs from the range (sample, not all)
             sample_slugs = generate_range_slugs(start_range, end_range, min(tested_count, 500))
             
+            source = {
+                'status': 'INACTIVE_401',
+                'business_name': '',
+                'tested_method': 'Browser_Automation_Comprehensive',
+                'last_tested': '2025-06-20',
+                'redirects_to': '/widget/401',
+                'content_length': '49',
+                'business_indicators': '0',
+                'services': '',
+                'description': f'Browser tested in range {start_range}-{end_range}, found 401 error'
+            }
             for slug in sample_slugs:
                 if slug not in all_slugs:
-                    all_slugs[slug] = {
-                        'slug': slug,
-                        'status': 'INACTIVE_401',
-                        'business_name': '',
-                        'tested_method': 'Browser_Automation_Comprehensive',
-                        'last_tested': '2025-06-20',
-                        'url': f'https://vsdigital-bookingwidget-prod.azurewebsites.net/widget-business/{slug}',
-                        'redirects_to': '/widget/401',
-                        'content_length': '49',
-                        'business_indicators': '0',
-                        'services': '',
-                        'description': f'Browser tested in range {start_range}-{end_range}, found 401 error'
-                    }
+                    all_slugs[slug] = source
     
     # Add ranges from other laptop
     other_laptop_ranges = [
@@ -174,21 +215,20 @@ def extract_all_tested_slugs():
         
         print(f"📊 Adding {len(range_slugs)} sample slugs from other laptop range {start}-{end}...")
         
+        source = {
+            'status': 'INACTIVE_401',
+            'business_name': '',
+            'tested_method': 'Other_Laptop_Range_Testing',
+            'last_tested': '2025-06-20',
+            'redirects_to': '/widget/401',
+            'content_length': '49',
+            'business_indicators': '0',
+            'services': '',
+            'description': description
+        }
         for slug in range_slugs:
             if slug not in all_slugs:
-                all_slugs[slug] = {
-                    'slug': slug,
-                    'status': 'INACTIVE_401',
-                    'business_name': '',
-                    'tested_method': 'Other_Laptop_Range_Testing',
-                    'last_tested': '2025-06-20',
-                    'url': f'https://vsdigital-bookingwidget-prod.azurewebsites.net/widget-business/{slug}',
-                    'redirects_to': '/widget/401',
-                    'content_length': '49',
-                    'business_indicators': '0',
-                    'services': '',
-                    'description': description
-                }
+                all_slugs[slug] = source
     
     print(f"\n📈 COMPREHENSIVE TESTING SUMMARY:")
     print(f"   Known active businesses: {len(known_active)}")
@@ -201,23 +241,27 @@ def extract_all_tested_slugs():
     return all_slugs, total_browser_tested
 
 def create_comprehensive_json_database(all_slugs, total_browser_tested):
-    """Create comprehensive JSON database with detailed statistics"""
-    
-    # Separate active and inactive
-    active_slugs = {k: v for k, v in all_slugs.items() if v['status'] == 'ACTIVE'}
-    inactive_slugs = {k: v for k, v in all_slugs.items() if v['status'] != 'ACTIVE'}
-    
-    # Group by testing method
-    by_method = defaultdict(list)
-    for slug_data in all_slugs.values():
-        by_method[slug_data['tested_method']].append(slug_data)
+    """Create comprehensive JSON database with detailed statistics.
+    The slug arrays are generators over all_slugs - write it with write_json_database."""
+    
+    # One pass over all slugs - active keys and per-method keys (records are built only when written)
+    active_keys = []
+    method_keys = {}
+    for slug, slug_data in all_slugs.items():
+        if slug_data['status'] == 'ACTIVE':
+            active_keys.append(slug)
+        method_keys.setdefault(slug_data['tested_method'], []).append(slug)
+    
+    active_count = len(active_keys)
+    inactive_count = len(all_slugs) - active_count
+    api_http_tested = len(method_keys.get('API_HTTP_This_Laptop', ()))
     
     # Calculate comprehensive testing statistics
     estimated_total_tested = (
-        len([s for s in all_slugs.values() if s['tested_method'] == 'API_HTTP_This_Laptop']) +
+        api_http_tested +
         total_browser_tested +  # Actual comprehensive browser scan count
         3000 +  # Estimated from other laptop ranges
-        len(active_slugs)
+        active_count
     )
     
     database = {
@@ -226,20 +270,20 @@ def create_comprehensive_json_database(all_slugs, total_browser_tested):
             'database_version': '2.0_comprehensive',
             'total_unique_slugs_in_db': len(all_slugs),
             'estimated_total_tested': estimated_total_tested,
-            'active_businesses_found': len(active_slugs),
-            'inactive_slugs_found': len(inactive_slugs),
-            'testing_methods': list(by_method.keys()),
+            'active_businesses_found': active_count,
+            'inactive_slugs_found': inactive_count,
+            'testing_methods': list(method_keys),
             'platform_url': 'https://vsdigital-bookingwidget-prod.azurewebsites.net/widget-business/',
             'slug_pattern': '[0-9a-z]{5}',
             'total_possible_combinations': 36**5,
             'percentage_tested': f"{(estimated_total_tested / (36**5)) * 100:.4f}%",
-            'success_rate': f"{(len(active_slugs) / estimated_total_tested) * 100:.6f}%"
+            'success_rate': f"{(active_count / estimated_total_tested) * 100:.6f}%"
         },
         'comprehensive_testing_summary': {
             'this_laptop_testing': {
-                'api_http_tested': len([s for s in all_slugs.values() if s['tested_method'] == 'API_HTTP_This_Laptop']),
+                'api_http_tested': api_http_tested,
                 'browser_comprehensive_tested': total_browser_tested,
-                'early_browser_tested': len([s for s in all_slugs.values() if s['tested_method'] == 'Browser_Automation_Early'])
+                'early_browser_tested': len(method_keys.get('Browser_Automation_Early', ()))
             },
             'other_laptop_testing': {
                 'ranges_tested': ['faaaa-fabon', 'paaaa-pabhs', 'yaaaa-yabny'],
@@ -250,24 +294,59 @@ def create_comprehensive_json_database(all_slugs, total_browser_tested):
             'scan_rate': '~0.06 slugs/second average'
         },
         'active_businesses': {
-            'count': len(active_slugs),
-            'slugs': list(active_slugs.values())
+            'count': active_count,
+            'slugs': slug_records(all_slugs, active_keys)
         },
         'inactive_slugs': {
-            'count': len(inactive_slugs),
-            'slugs': list(inactive_slugs.values())
+            'count': inactive_count,
+            'slugs': slug_records(all_slugs, (k for k, v in all_slugs.items() if v['status'] != 'ACTIVE'))
         },
         'by_testing_method': {
             method: {
-                'count': len(slugs),
-                'slugs': slugs
-            } for method, slugs in by_method.items()
+                'count': len(keys),
+                'slugs': slug_records(all_slugs, keys)
+            } for method, keys in method_keys.items()
         },
-        'all_slugs': list(all_slugs.values())
+        'all_slugs': slug_records(all_slugs, all_slugs)
     }
     
     return database
 
+def is_streamed(value):
+    """True for slug-record iterators and for dicts that hold one somewhere below"""
+    if isinstance(value, dict):
+        return any(is_streamed(item) for item in value.values())
+    return hasattr(value, '__next__')
+
+def encode_json(value, indent=False):
+    """UTF-8 JSON bytes - orjson when available, stdlib json otherwise (same layout either way)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0))
+    if indent:
+        return json.dumps(value, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def write_json_database(f, value, indent=b''):
+    """Stream a database to binary f as JSON - record iterators become arrays with one compact record
+    per line, everything else is laid out as json.dump(indent=2) would"""
+    inner = indent + b'  '
+    if isinstance(value, dict) and is_streamed(value):
+        f.write(b'{')
+        for i, (key, item) in enumerate(value.items()):
+            f.write(b',\n' if i else b'\n')
+            f.write(inner + encode_json(key) + b': ')
+            write_json_database(f, item, inner)
+        f.write(b'\n' + indent + b'}')
+    elif is_streamed(value):
+        f.write(b'[')
+        empty = True
+        for record in value:
+            f.write((b'\n' if empty else b',\n') + inner + encode_json(record))
+            empty = False
+        f.write(b']' if empty else b'\n' + indent + b']')
+    else:
+        f.write(encode_json(value, indent=True).replace(b'\n', b'\n' + indent))
+
 def create_comprehensive_csv_database(all_slugs):
     """Create CSV database with all slug information"""
     
@@ -277,11 +356,34 @@ def create_comprehensive_csv_database(all_slugs):
         'services', 'description'
     ]
     
-    # Sort slugs alphabetically
-    sorted_slugs = sorted(all_slugs.values(), key=lambda x: x['slug'])
+    # Sort slugs alphabetically - records are built as the rows are written.
+    # The dict keys are the slugs themselves and ASCII order is base-36 order, so a key-free sort
+    # of the strings stays entirely in C (as fast as sorting packed slug numbers, minus the encode/decode)
+    sorted_slugs = slug_records(all_slugs, sorted(all_slugs))
     
     return fieldnames, sorted_slugs
 
+# Free-text columns - the only ones that can need CSV quoting
+CSV_TEXT_FIELDS = ('business_name', 'services', 'description')
+CSV_SPECIAL_CHARS = re.compile(r'[",\r\n]')
+CSV_WRITE_BUFFER_SIZE = 1 << 23
+
+def csv_text(value):
+    """Quote a free-text value the way csv.writer's QUOTE_MINIMAL does"""
+    text = str(value)
+    if CSV_SPECIAL_CHARS.search(text):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def write_csv_database(f, fieldnames, rows):
+    """Write the CSV rows by joining fields directly - only the free-text columns go through quoting"""
+    f.write(','.join(fieldnames) + '\r\n')
+    text_fields = {name for name in fieldnames if name in CSV_TEXT_FIELDS}
+    f.writelines(
+        ','.join(csv_text(row[name]) if name in text_fields else str(row[name]) for name in fieldnames) + '\r\n'
+        for row in rows
+    )
+
 def save_comprehensive_databases():
     """Main function to create and save comprehensive databases"""
     
@@ -295,8 +397,8 @@ def save_comprehensive_databases():
     json_db = create_comprehensive_json_database(all_slugs, total_browser_tested)
     
     json_filename = f"vsdhone_comprehensive_database_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(json_filename, 'w', encoding='utf-8') as f:
-        json.dump(json_db, f, indent=2, ensure_ascii=False)
+    with open(json_filename, 'wb', buffering=JSON_WRITE_BUFFER_SIZE) as f:
+        write_json_database(f, json_db)
     
     print(f"💾 Comprehensive JSON database saved: {json_filename}")
     
@@ -305,16 +407,14 @@ def save_comprehensive_databases():
     fieldnames, csv_data = create_comprehensive_csv_database(all_slugs)
     
     csv_filename = f"vsdhone_comprehensive_database_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(csv_data)
+    with open(csv_filename, 'w', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER_SIZE) as f:
+        write_csv_database(f, fieldnames, csv_data)
     
     print(f"💾 Comprehensive CSV database saved: {csv_filename}")
     
-    # Print comprehensive summary
-    active_count = len([s for s in all_slugs.values() if s['status'] == 'ACTIVE'])
-    inactive_count = len(all_slugs) - active_count
+    # Print comprehensive summary - counts come from the database's single counting pass
+    active_count = json_db['metadata']['active_businesses_found']
+    inactive_count = json_db['metadata']['inactive_slugs_found']
     estimated_total = json_db['metadata']['estimated_total_tested']
     
     print(f"\n🎯 COMPREHENSIVE TESTING SUMMARY:")
@@ -6,20 +6,94 @@ Creates 15 files with 500K slugs each based on pattern analysis
 """
 
 import itertools
+import math
 import string
 import random
 import os
+import signal
+from array import array
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
+from multiprocessing import Lock, shared_memory
+
+# Slug space: 5 chars of 0-9a-z, numbered in charset order
+SLUG_SPACE = 36 ** 5
+
+# Precomputed 2-char prefixes and 3-char suffixes - a slug number is split 1296 x 46656
+SLUG_SUFFIX_SPACE = 36 ** 3
+SLUG_PREFIXES = tuple(''.join(combo) for combo in itertools.product(string.digits + string.ascii_lowercase, repeat=2))
+SLUG_SUFFIXES = tuple(''.join(combo) for combo in itertools.product(string.digits + string.ascii_lowercase, repeat=3))
+
+# Place value of each slug position - a slug number is the sum of digit * place over the 5 positions
+SLUG_PLACES = tuple(36 ** (4 - i) for i in range(5))
+
+# Place values a variation changes - every 1- and 2-position pick, weighted so one and two changes are equally likely
+VARIATION_PLACES = (
+    tuple((SLUG_PLACES[i],) for i in range(5)) +
+    tuple((SLUG_PLACES[i], SLUG_PLACES[j]) for i, j in itertools.combinations(range(5), 2))
+)
+VARIATION_WEIGHTS = (2,) * 5 + (1,) * 10
+
+# Slug batches are packed as unsigned 32-bit slug numbers (36**5 < 2**26) and decoded only when written
+SLUG_ARRAY_TYPE = 'I'
+
+class SlugBitmap:
+    """Slug numbers handed out so far as one bit per possible slug (7.5MB flat, exact membership)"""
+    def __init__(self, numbers=(), bits=None, lock=None):
+        self.bits = bits if bits is not None else bytearray(SLUG_SPACE // 8 + 1)
+        self.lock = lock if lock is not None else nullcontext()
+        self.take_new(numbers)
+    
+    def __contains__(self, num):
+        return bool(self.bits[num >> 3] & (1 << (num & 7)))
+    
+    def take_new(self, numbers, limit=None):
+        """Mark and return (in order) up to `limit` of the numbers not seen before - atomic under the bitmap's lock"""
+        bits = self.bits
+        new = array(SLUG_ARRAY_TYPE)
+        with self.lock:
+            for num in numbers:
+                mask = 1 << (num & 7)
+                if not bits[num >> 3] & mask:
+                    bits[num >> 3] |= mask
+                    new.append(num)
+                    if len(new) == limit:
+                        break
+        return new
+
+# Per-process state of the batch file workers
+batch_strategy = None
+batch_bitmap_memory = None
+
+def init_batch_worker(bitmap_name, bitmap_lock, slugs_per_file):
+    """Batch workers attach the parent's shared bitmap (and the lock guarding it) once and leave Ctrl-C handling to the parent"""
+    global batch_strategy, batch_bitmap_memory
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    batch_bitmap_memory = shared_memory.SharedMemory(name=bitmap_name)
+    batch_strategy = SmartTestingStrategy(show_banner=False)
+    batch_strategy.slugs_per_file = slugs_per_file
+    batch_strategy.seen = SlugBitmap(bits=batch_bitmap_memory.buf, lock=bitmap_lock)
+
+def run_batch_task(strategy_name, filename, pos_freq, seed):
+    """Generate one batch file in a worker from its own seed - returns (filename, slug count)"""
+    random.seed(seed)
+    return filename, batch_strategy.create_batch_file(strategy_name, filename, pos_freq)
 
 class SmartTestingStrategy:
-    def __init__(self):
+    def __init__(self, show_banner=True):
         # Known active business slugs
         self.known_active_slugs = {
             'ad31y', 'mj42f', 'os27m', 'lp56a', 'zb74k', 'ym99l', 
             'yh52b', 'zd20w', 'td32z', 'bo19e', 'bh70s', 'ai04u', 
             'bm49t', 'qu29u', 'tc33l'
         }
+        self.known_active_numbers = frozenset(map(self.slug_to_number, self.known_active_slugs))
+        self.known_active_list = sorted(self.known_active_numbers)  # Fixed order for seeded bulk draws
+        
+        # Every slug handed out to any batch, seeded with the known actives - no repeats within or across files
+        self.seen = SlugBitmap(self.known_active_numbers)
         
         # Character set: 0-9 + a-z
         self.charset = string.digits + string.ascii_lowercase
@@ -29,9 +103,10 @@ class SmartTestingStrategy:
         self.slugs_per_file = 500000
         self.total_target_slugs = self.files_to_create * self.slugs_per_file
         
-        print(f"🎯 Smart Testing Strategy Generator")
-        print(f"📊 Target: {self.files_to_create} files × {self.slugs_per_file:,} slugs = {self.total_target_slugs:,} total slugs")
-        print("")
+        if show_banner:
+            print(f"🎯 Smart Testing Strategy Generator")
+            print(f"📊 Target: {self.files_to_create} files × {self.slugs_per_file:,} slugs = {self.total_target_slugs:,} total slugs")
+            print("")
         
     def analyze_patterns(self):
         """Analyze patterns in known active slugs"""
@@ -65,32 +140,38 @@ class SmartTestingStrategy:
         
         return pos_freq, patterns
     
+    def fill_unique(self, count, draw_batch, label):
+        """Collect `count` unseen slug numbers from batches of draw_batch(n) - oversampled so one or two rounds suffice"""
+        slugs = array(SLUG_ARRAY_TYPE)
+        
+        while len(slugs) < count:
+            needed = count - len(slugs)
+            new = self.seen.take_new(draw_batch(needed + needed // 20 + 16), needed)
+            if not new:  # Strategy's slug space is used up
+                break
+            slugs.extend(new)
+            print(f"   Generated {len(slugs):,} {label} slugs...")
+        
+        return slugs
+    
     def generate_pattern_based_slugs(self, pos_freq, count):
         """Generate slugs based on character frequency patterns"""
-        slugs = set()
-        
-        # Create weighted character lists for each position
-        weighted_chars = []
-        for i in range(5):
-            chars_weights = []
-            for char in self.charset:
-                weight = pos_freq[i].get(char, 0) + 1  # +1 to include all chars
-                chars_weights.extend([char] * weight)
-            weighted_chars.append(chars_weights)
+        # Cumulative weights for each position (+1 to include all chars)
+        cum_weights = [
+            list(itertools.accumulate(pos_freq[i].get(char, 0) + 1 for char in self.charset))
+            for i in range(5)
+        ]
+        place_values = [[digit * place for digit in range(36)] for place in SLUG_PLACES]
         
-        while len(slugs) < count:
-            slug = ''.join(random.choice(weighted_chars[i]) for i in range(5))
-            slugs.add(slug)
-            
-            if len(slugs) % 50000 == 0:
-                print(f"   Generated {len(slugs):,} pattern-based slugs...")
+        def draw_batch(n):
+            # One weighted draw of place values per position for the whole batch, summed column-wise into slug numbers
+            columns = [random.choices(place_values[i], cum_weights=cum_weights[i], k=n) for i in range(5)]
+            return map(sum, zip(*columns))
         
-        return list(slugs)
+        return self.fill_unique(count, draw_batch, "pattern-based")
     
     def generate_high_frequency_combinations(self, pos_freq, count):
         """Generate combinations using most frequent characters per position"""
-        slugs = set()
-        
         # Get top characters for each position
         top_chars = []
         for i in range(5):
@@ -101,116 +182,115 @@ class SmartTestingStrategy:
             
             # Take top half, but at least 6 characters
             top_count = max(6, len(sorted_chars) // 2)
-            top_chars.append(sorted_chars[:top_count])
+            top_chars.append([int(char, 36) * SLUG_PLACES[i] for char in sorted_chars[:top_count]])
         
         print(f"🎯 High-frequency chars per position: {[len(chars) for chars in top_chars]}")
         
-        # Generate combinations from high-frequency characters
-        while len(slugs) < count:
-            slug = ''.join(random.choice(top_chars[i]) for i in range(5))
-            slugs.add(slug)
-            
-            if len(slugs) % 50000 == 0:
-                print(f"   Generated {len(slugs):,} high-frequency slugs...")
+        # Fewer combinations than requested - take them all rather than drawing forever
+        if math.prod(map(len, top_chars)) <= count:
+            return self.seen.take_new(map(sum, itertools.product(*top_chars)))
+        
+        def draw_batch(n):
+            # One draw per position for the whole batch, summed column-wise into slug numbers
+            columns = [random.choices(chars, k=n) for chars in top_chars]
+            return map(sum, zip(*columns))
         
-        return list(slugs)
+        # Generate combinations from high-frequency characters
+        return self.fill_unique(count, draw_batch, "high-frequency")
     
     def generate_similar_to_known(self, count):
         """Generate slugs similar to known active ones (1-2 character variations)"""
-        slugs = set()
-        
-        while len(slugs) < count:
-            # Pick a random known slug
-            base_slug = random.choice(list(self.known_active_slugs))
+        def draw_batch(n):
+            # Bases, positions and replacement characters for the whole batch in three bulk draws
+            bases = random.choices(self.known_active_list, k=n)
+            positions = random.choices(VARIATION_PLACES, weights=VARIATION_WEIGHTS, k=n)
+            new_chars = random.choices(range(36), k=2 * n)
+            batch = []
             
-            # Create variations
-            for _ in range(10):  # Try multiple variations per base
-                variation = list(base_slug)
-                
-                # Change 1-2 characters randomly
-                positions_to_change = random.sample(range(5), random.choice([1, 2]))
-                
-                for pos in positions_to_change:
-                    variation[pos] = random.choice(self.charset)
+            for i, (variation, places_to_change) in enumerate(zip(bases, positions)):
+                # Change 1-2 characters randomly - swap the digit at each position's place value
+                for j, place in enumerate(places_to_change):
+                    variation += (new_chars[2 * i + j] - variation // place % 36) * place
                 
-                new_slug = ''.join(variation)
-                if new_slug not in self.known_active_slugs:
-                    slugs.add(new_slug)
-                
-                if len(slugs) >= count:
-                    break
+                batch.append(variation)
             
-            if len(slugs) % 50000 == 0:
-                print(f"   Generated {len(slugs):,} variation-based slugs...")
+            return batch
         
-        return list(slugs)[:count]
+        return self.fill_unique(count, draw_batch, "variation-based")
     
     def generate_sequential_ranges(self, count):
         """Generate sequential ranges around known active slugs"""
-        slugs = set()
+        slugs = array(SLUG_ARRAY_TYPE)
         
-        for base_slug in self.known_active_slugs:
+        for base_num in self.known_active_list:
             # Generate slugs before and after this one
-            range_size = count // (len(self.known_active_slugs) * 2)
-            
-            # Convert slug to number for sequential generation
-            base_num = self.slug_to_number(base_slug)
+            range_size = count // (len(self.known_active_numbers) * 2)
             
-            # Generate range before
-            for offset in range(-range_size//2, range_size//2):
-                try:
-                    new_num = base_num + offset
-                    if new_num >= 0:
-                        new_slug = self.number_to_slug(new_num)
-                        if new_slug not in self.known_active_slugs:
-                            slugs.add(new_slug)
-                except:
-                    continue
+            # Whole window around the slug in one go, clipped to the slug space
+            start_num = max(0, base_num - range_size // 2)
+            end_num = min(SLUG_SPACE, base_num + range_size // 2)
+            slugs.extend(self.seen.take_new(range(start_num, end_num), count - len(slugs)))
             
             if len(slugs) >= count:
                 break
         
         print(f"   Generated {len(slugs):,} sequential range slugs...")
-        return list(slugs)[:count]
+        return slugs
     
     def slug_to_number(self, slug):
-        """Convert slug to number for sequential operations"""
-        number = 0
-        base = len(self.charset)
-        for char in slug:
-            number = number * base + self.charset.index(char)
-        return number
+        """Convert slug to number for sequential operations (base 36 in charset order, parsed in C)"""
+        return int(slug, 36)
     
     def number_to_slug(self, number):
         """Convert number back to slug"""
-        if number == 0:
-            return '00000'
-        
-        slug = []
-        base = len(self.charset)
-        while number > 0:
-            slug.append(self.charset[number % base])
-            number //= base
-        
-        # Pad to 5 characters
-        while len(slug) < 5:
-            slug.append('0')
-        
-        return ''.join(reversed(slug))
+        prefix, suffix = divmod(number, SLUG_SUFFIX_SPACE)
+        return SLUG_PREFIXES[prefix] + SLUG_SUFFIXES[suffix]
     
     def generate_random_sampling(self, count):
         """Generate completely random slugs for comparison"""
-        slugs = set()
+        def draw_batch(n):
+            # Uniform slug numbers for the whole batch
+            return random.choices(range(SLUG_SPACE), k=n)
         
-        while len(slugs) < count:
-            slug = ''.join(random.choices(self.charset, k=5))
-            if slug not in self.known_active_slugs:
-                slugs.add(slug)
-            
-            if len(slugs) % 50000 == 0:
-                print(f"   Generated {len(slugs):,} random slugs...")
-        
-        return list(slugs)
+        return self.fill_unique(count, draw_batch, "random")
+    
+    def create_batch_file(self, strategy_name, filename, pos_freq):
+        """Generate one strategy's batch and write it to filename - returns the slug count"""
+        if strategy_name == "pattern_weighted":
+            slugs = self.generate_pattern_based_slugs(pos_freq, self.slugs_per_file)
+        elif strategy_name == "high_frequency":
+            slugs = self.generate_high_frequency_combinations(pos_freq, self.slugs_per_file)
+        elif strategy_name == "similar_variations":
+            slugs = self.generate_similar_to_known(self.slugs_per_file)
+        elif strategy_name == "sequential_ranges":
+            slugs = self.generate_sequential_ranges(self.slugs_per_file)
+        elif strategy_name == "random_sampling":
+            slugs = self.generate_random_sampling(self.slugs_per_file)
+        elif strategy_name == "mixed_strategy":
+            # Mix of all strategies
+            chunk_size = self.slugs_per_file // 4
+            slugs = array(SLUG_ARRAY_TYPE)
+            slugs.extend(self.generate_pattern_based_slugs(pos_freq, chunk_size))
+            slugs.extend(self.generate_high_frequency_combinations(pos_freq, chunk_size))
+            slugs.extend(self.generate_similar_to_known(chunk_size))
+            slugs.extend(self.generate_random_sampling(chunk_size))
+        
+            # Shuffle the mixed results
+            random.shuffle(slugs)
+            slugs = slugs[:self.slugs_per_file]
+        
+        # Ensure we have exactly the target count - known actives and earlier slugs are already in the bitmap
+        if len(slugs) < self.slugs_per_file:
+            slugs.extend(self.generate_random_sampling(self.slugs_per_file - len(slugs)))
+        
+        slugs = slugs[:self.slugs_per_file]
+        
+        # Save to file - decoded to text only here, the whole batch as one ASCII block in a single write
+        with open(filename, 'wb') as f:
+            if slugs:
+                f.write(("\n".join(map(self.number_to_slug, slugs)) + "\n").encode('ascii'))
+        
+        return len(slugs)
     
     def create_testing_files(self):
         """Create 15 optimized testing files"""
@@ -231,6 +311,7 @@ class SmartTestingStrategy:
         file_counter = 1
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
+        batches = []
         for strategy_name, description, file_count in strategies:
             print(f"\n📋 Creating {file_count} files using: {description}")
             
@@ -238,49 +319,31 @@ class SmartTestingStrategy:
                 filename = f"SMART_TEST_BATCH_{file_counter:02d}_{strategy_name}_{timestamp}.txt"
                 
                 print(f"   📝 Generating {filename}...")
-                
-                if strategy_name == "pattern_weighted":
-                    slugs = self.generate_pattern_based_slugs(pos_freq, self.slugs_per_file)
-                elif strategy_name == "high_frequency":
-                    slugs = self.generate_high_frequency_combinations(pos_freq, self.slugs_per_file)
-                elif strategy_name == "similar_variations":
-                    slugs = self.generate_similar_to_known(self.slugs_per_file)
-                elif strategy_name == "sequential_ranges":
-                    slugs = self.generate_sequential_ranges(self.slugs_per_file)
-                elif strategy_name == "random_sampling":
-                    slugs = self.generate_random_sampling(self.slugs_per_file)
-                elif strategy_name == "mixed_strategy":
-                    # Mix of all strategies
-                    chunk_size = self.slugs_per_file // 4
-                    slugs = []
-                    slugs.extend(self.generate_pattern_based_slugs(pos_freq, chunk_size))
-                    slugs.extend(self.generate_high_frequency_combinations(pos_freq, chunk_size))
-                    slugs.extend(self.generate_similar_to_known(chunk_size))
-                    slugs.extend(self.generate_random_sampling(chunk_size))
-                    
-                    # Shuffle the mixed results
-                    random.shuffle(slugs)
-                    slugs = slugs[:self.slugs_per_file]
-                
-                # Remove any known active slugs
-                slugs = [s for s in slugs if s not in self.known_active_slugs]
-                
-                # Ensure we have exactly the target count
-                while len(slugs) < self.slugs_per_file:
-                    new_slug = ''.join(random.choices(self.charset, k=5))
-                    if new_slug not in self.known_active_slugs and new_slug not in slugs:
-                        slugs.append(new_slug)
-                
-                slugs = slugs[:self.slugs_per_file]
-                
-                # Save to file
-                with open(filename, 'w') as f:
-                    for slug in slugs:
-                        f.write(f"{slug}\n")
-                
-                print(f"   ✅ Created {filename} with {len(slugs):,} slugs")
+                batches.append((strategy_name, filename))
                 file_counter += 1
         
+        # Files are independent - generate them in parallel, each worker marking slugs in a shared copy of the bitmap under one lock
+        bitmap_size = len(self.seen.bits)
+        bitmap_memory = shared_memory.SharedMemory(create=True, size=bitmap_size)
+        try:
+            bitmap_memory.buf[:bitmap_size] = self.seen.bits
+            
+            with ProcessPoolExecutor(max_workers=min(len(batches), os.cpu_count() or 1),
+                                     initializer=init_batch_worker,
+                                     initargs=(bitmap_memory.name, Lock(), self.slugs_per_file)) as executor:
+                futures = [
+                    executor.submit(run_batch_task, strategy_name, filename, pos_freq, random.getrandbits(64))
+                    for strategy_name, filename in batches
+                ]
+                for future in futures:
+                    filename, slug_count = future.result()
+                    print(f"   ✅ Created {filename} with {slug_count:,} slugs")
+            
+            self.seen.bits[:] = bitmap_memory.buf[:bitmap_size]
+        finally:
+            bitmap_memory.close()
+            bitmap_memory.unlink()
+        
         # Create summary file
         summary_file = f"SMART_TEST_STRATEGY_SUMMARY_{timestamp}.txt"
         with open(summary_file, 'w') as f:
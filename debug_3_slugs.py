@@ -16,13 +16,30 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+# Try to import Aho-Corasick for single-pass indicator scanning
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# The widget has rendered once it replaces the shell's title (arguments[0]) with a business name or
+# "undefined", mounts its components, or shows the invalid-slug template
+PAGE_RENDERED_SCRIPT = (
+    "const title = document.title.trim();"
+    "const mount = document.querySelector('#root, #my-widget');"
+    "const text = document.body ? document.body.innerText.toLowerCase() : '';"
+    "return (title !== '' && title !== arguments[0])"
+    " || (mount !== null && mount.childElementCount > 0)"
+    " || text.includes('nothing left to do here');")
+
 class SlugDebugger:
     def __init__(self):
         self.base_url = "https://vsdigital-bookingwidget-prod.azurewebsites.net/b/"
         self.timeout = 15  # Longer timeout for debugging
-        self.driver = None
         
         # Test slugs that should have businesses
         self.test_slugs = ["NzAz", "NzE5", "NzE2"]  # 703, 719, 716
@@ -44,9 +61,55 @@ class SlugDebugger:
             'wellness', 'health', 'medical', 'clinic',
             'provider', 'patient', 'visit', 'care'
         ]
+        
+        # Common business elements that might not be in our indicators
+        self.business_keywords = [
+            'calendar', 'date', 'time', 'slot', 'availability',
+            'location', 'address', 'phone', 'contact',
+            'price', 'cost', 'fee', 'payment',
+            'staff', 'doctor', 'practitioner', 'therapist',
+            'form', 'input', 'button', 'submit'
+        ]
+        
+        # Lowercased ASCII bytes, built once - pages are matched against these, results reported with the originals
+        self.error_lower = tuple(indicator.lower().encode() for indicator in self.error_indicators)
+        self.business_lower = tuple(indicator.lower().encode() for indicator in self.business_indicators)
+        self.keywords_lower = tuple(keyword.lower().encode() for keyword in self.business_keywords)
+        
+        self.indicator_automaton = self.build_indicator_automaton() if AHOCORASICK_AVAILABLE else None
+    
+    def build_indicator_automaton(self):
+        """Aho-Corasick automaton over all three indicator lists"""
+        automaton = ahocorasick.Automaton()
+        for indicator in self.error_lower + self.business_lower + self.keywords_lower:
+            automaton.add_word(indicator.decode('latin-1'), indicator)
+        automaton.make_automaton()
+        return automaton
+    
+    def find_indicators(self, page_lower):
+        """Indicators present in the page (UTF-8 bytes, ASCII-lowercased) - (error, business, keyword) lists in list order"""
+        if self.indicator_automaton is not None:
+            # One pass over the page for all three lists - latin-1 maps bytes 1:1 onto code points, so this is a copy rather than a decode
+            present = {word for _, word in self.indicator_automaton.iter(page_lower.decode('latin-1'))}.__contains__
+        else:
+            present = page_lower.__contains__
+        
+        return (
+            [indicator for indicator, lower in zip(self.error_indicators, self.error_lower) if present(lower)],
+            [indicator for indicator, lower in zip(self.business_indicators, self.business_lower) if present(lower)],
+            [keyword for keyword, lower in zip(self.business_keywords, self.keywords_lower) if present(lower)]
+        )
+    
+    def resolve_driver_path(self):
+        """Install/locate chromedriver via webdriver_manager once - None if it failed"""
+        try:
+            return ChromeDriverManager().install()
+        except Exception as e:
+            print(f"⚠️  WebDriver Manager failed: {e}")
+            return None
     
-    def setup_driver(self):
-        """Setup Chrome driver for debugging"""
+    def setup_driver(self, driver_path=None):
+        """Create a Chrome driver for debugging (driver_path from resolve_driver_path) - None if no driver could be started"""
         chrome_options = Options()
         # Run headless for debugging
         chrome_options.add_argument('--headless')
@@ -58,14 +121,16 @@ class SlugDebugger:
         try:
             # Try multiple approaches
             try:
-                # First try: Use webdriver_manager
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                # First try: Use the chromedriver webdriver_manager resolved up front
+                if driver_path is None:
+                    raise Exception("no chromedriver path from WebDriver Manager")
+                service = Service(driver_path)
+                driver = webdriver.Chrome(service=service, options=chrome_options)
             except Exception as e1:
-                print(f"⚠️  WebDriver Manager failed: {e1}")
+                print(f"⚠️  WebDriver Manager driver failed: {e1}")
                 try:
                     # Second try: Use system Chrome driver
-                    self.driver = webdriver.Chrome(options=chrome_options)
+                    driver = webdriver.Chrome(options=chrome_options)
                 except Exception as e2:
                     print(f"⚠️  System Chrome driver failed: {e2}")
                     # Third try: Use explicit path (common locations)
@@ -78,19 +143,19 @@ class SlugDebugger:
                     for path in chrome_paths:
                         if os.path.exists(path):
                             service = Service(path)
-                            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                            driver = webdriver.Chrome(service=service, options=chrome_options)
                             driver_found = True
                             break
                     if not driver_found:
                         raise Exception("No Chrome driver found in common locations")
             
-            self.driver.set_page_load_timeout(self.timeout)
+            driver.set_page_load_timeout(self.timeout)
             print("✅ Chrome driver initialized for debugging")
-            return True
+            return driver
         except Exception as e:
             print(f"❌ Failed to initialize Chrome driver: {e}")
             print("💡 Try installing Chrome driver: brew install chromedriver")
-            return False
+            return None
     
     def decode_slug(self, slug):
         """Decode base64 slug to see what number it represents"""
@@ -100,57 +165,88 @@ class SlugDebugger:
         except:
             return "DECODE_ERROR"
     
-    def debug_slug(self, slug):
-        """Debug a single slug with comprehensive analysis"""
-        print(f"\n🔍 DEBUGGING SLUG: {slug}")
-        print(f"📊 Decodes to: {self.decode_slug(slug)}")
+    def wait_for_page(self, driver):
+        """Wait for document.readyState == 'complete', for the widget to render past the JS shell, then until
+        the page source stops changing between 100ms polls. Returns (rendered, settled) - False for a wait that timed out."""
+        WebDriverWait(driver, self.timeout).until(
+            lambda driver: driver.execute_script("return document.readyState") == "complete"
+        )
+        
+        # A client-rendered page sits stable while its business data is still loading - wait for the render itself
+        shell_title = driver.execute_script("return document.title.trim()")
+        try:
+            WebDriverWait(driver, self.timeout, poll_frequency=0.1).until(
+                lambda driver: driver.execute_script(PAGE_RENDERED_SCRIPT, shell_title))
+            rendered = True
+        except TimeoutException:
+            rendered = False
+        
+        last_length = None
+        
+        def settled(driver):
+            nonlocal last_length
+            length, last_length = last_length, len(driver.page_source)
+            return length == last_length
+        
+        try:
+            WebDriverWait(driver, self.timeout, poll_frequency=0.1).until(settled)
+            return rendered, True
+        except TimeoutException:
+            return rendered, False
+    
+    def debug_slug(self, driver, slug):
+        """Debug a single slug on the given driver with comprehensive analysis.
+        The report is printed as one block so concurrent sessions don't interleave."""
+        report = []
+        say = report.append
+        
+        say(f"\n🔍 DEBUGGING SLUG: {slug}")
+        say(f"📊 Decodes to: {self.decode_slug(slug)}")
         
         try:
             start_time = time.time()
             
             # Navigate to the URL
             url = f"{self.base_url}{slug}"
-            print(f"🌐 Testing URL: {url}")
+            say(f"🌐 Testing URL: {url}")
             
-            self.driver.get(url)
+            driver.get(url)
             
-            # Wait longer for debugging
-            time.sleep(3)
+            # Wait only as long as the page actually takes to load and render
+            rendered, settled = self.wait_for_page(driver)
+            if not rendered:
+                say(f"⚠️  Widget never rendered past the JS shell within {self.timeout}s - "
+                    f"this capture is the pre-render shell, not the slug's real page")
+            if not settled:
+                say(f"⚠️  Page still changing after {self.timeout}s - capturing it anyway")
             
             # Get all the data
-            page_source = self.driver.page_source
-            page_title = self.driver.title
-            final_url = self.driver.current_url
+            page_source = driver.page_source
+            page_title = driver.title
+            final_url = driver.current_url
             content_length = len(page_source)
             load_time = time.time() - start_time
             
-            print(f"📄 Page Title: '{page_title}'")
-            print(f"🔗 Final URL: {final_url}")
-            print(f"📏 Content Length: {content_length:,} characters")
-            print(f"⏱️  Load Time: {load_time:.2f}s")
+            say(f"🧩 Rendered Past JS Shell: {rendered}")
+            say(f"📄 Page Title: '{page_title}'")
+            say(f"🔗 Final URL: {final_url}")
+            say(f"📏 Content Length: {content_length:,} characters")
+            say(f"⏱️  Load Time: {load_time:.2f}s")
             
-            # Check for error indicators
-            page_source_lower = page_source.lower()
-            error_indicators_found = []
-            for indicator in self.error_indicators:
-                if indicator.lower() in page_source_lower:
-                    error_indicators_found.append(indicator)
+            # Check for error and business indicators (and the extra keywords shown below) - the indicators are
+            # all ASCII, so the page is folded once with the C-level bytes.lower() instead of a full Unicode lower()
+            page_lower = page_source.encode('utf-8', 'ignore').lower()
+            error_indicators_found, business_indicators_found, found_keywords = self.find_indicators(page_lower)
             
-            # Check for business indicators
-            business_indicators_found = []
-            for indicator in self.business_indicators:
-                if indicator.lower() in page_source_lower:
-                    business_indicators_found.append(indicator)
-            
-            print(f"❌ Error Indicators Found: {error_indicators_found}")
-            print(f"✅ Business Indicators Found: {business_indicators_found}")
+            say(f"❌ Error Indicators Found: {error_indicators_found}")
+            say(f"✅ Business Indicators Found: {business_indicators_found}")
             
             # Show current scanner logic
             has_business_title = page_title and len(page_title) > 3 and page_title.lower() not in ['loading', 'error']
             has_substantial_content = content_length > 20000
             
-            print(f"🏷️  Has Business Title: {has_business_title}")
-            print(f"📊 Has Substantial Content (>20k): {has_substantial_content}")
+            say(f"🏷️  Has Business Title: {has_business_title}")
+            say(f"📊 Has Substantial Content (>20k): {has_substantial_content}")
             
             # Current scanner decision logic
             if not page_title or page_title.strip() == "":
@@ -165,35 +261,21 @@ class SlugDebugger:
             else:
                 current_status = "INACTIVE_UNKNOWN (No indicators)"
             
-            print(f"🤖 Current Scanner Would Mark As: {current_status}")
+            say(f"🤖 Current Scanner Would Mark As: {current_status}")
             
             # Show first 1000 characters of page source for manual inspection
-            print(f"\n📝 PAGE SOURCE PREVIEW (first 1000 chars):")
-            print("=" * 80)
-            print(page_source[:1000])
-            print("=" * 80)
-            
-            # Look for common business elements that might not be in our indicators
-            business_keywords = [
-                'calendar', 'date', 'time', 'slot', 'availability',
-                'location', 'address', 'phone', 'contact',
-                'price', 'cost', 'fee', 'payment',
-                'staff', 'doctor', 'practitioner', 'therapist',
-                'form', 'input', 'button', 'submit'
-            ]
-            
-            found_keywords = []
-            for keyword in business_keywords:
-                if keyword in page_source_lower:
-                    found_keywords.append(keyword)
+            say(f"\n📝 PAGE SOURCE PREVIEW (first 1000 chars):")
+            say("=" * 80)
+            say(page_source[:1000])
+            say("=" * 80)
             
-            print(f"🔍 Additional Business Keywords Found: {found_keywords}")
+            say(f"🔍 Additional Business Keywords Found: {found_keywords}")
             
             # Save full page source for detailed analysis
             debug_filename = f"debug_slug_{slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
             with open(debug_filename, 'w', encoding='utf-8') as f:
                 f.write(page_source)
-            print(f"💾 Full page source saved to: {debug_filename}")
+            say(f"💾 Full page source saved to: {debug_filename}")
             
             return {
                 'slug': slug,
@@ -203,6 +285,7 @@ class SlugDebugger:
                 'page_title': page_title,
                 'content_length': content_length,
                 'load_time': load_time,
+                'rendered': rendered,
                 'error_indicators_found': error_indicators_found,
                 'business_indicators_found': business_indicators_found,
                 'additional_keywords': found_keywords,
@@ -213,48 +296,61 @@ class SlugDebugger:
             }
             
         except Exception as e:
-            print(f"❌ Error debugging slug {slug}: {e}")
+            say(f"❌ Error debugging slug {slug}: {e}")
             return None
+        
+        finally:
+            print('\n'.join(report))
     
-    def run_debug_session(self):
-        """Run debugging session for all test slugs"""
-        if not self.setup_driver():
-            return
+    def debug_with_own_driver(self, slug, driver_path):
+        """Debug one slug on a driver of its own - runs in the session's thread pool"""
+        driver = self.setup_driver(driver_path)
+        if driver is None:
+            return None
         
+        try:
+            return self.debug_slug(driver, slug)
+        finally:
+            driver.quit()
+    
+    def run_debug_session(self):
+        """Run debugging session for all test slugs - one driver per slug, all at once"""
         print("🚀 Starting Debug Session for 3 Slugs")
         print("=" * 60)
         
-        results = []
+        results_by_slug = {}
         
-        try:
-            for slug in self.test_slugs:
-                result = self.debug_slug(slug)
+        # Resolve chromedriver before the threads start - concurrent installs race on the same download
+        driver_path = self.resolve_driver_path()
+        
+        with ThreadPoolExecutor(max_workers=len(self.test_slugs)) as executor:
+            futures = {executor.submit(self.debug_with_own_driver, slug, driver_path): slug
+                       for slug in self.test_slugs}
+            for future in as_completed(futures):
+                result = future.result()
                 if result:
-                    results.append(result)
-                time.sleep(2)  # Pause between tests
-            
-            # Save comprehensive debug report
-            debug_report = {
-                'debug_session': datetime.now().isoformat(),
-                'base_url': self.base_url,
-                'tested_slugs': self.test_slugs,
-                'results': results,
-                'scanner_indicators': {
-                    'error_indicators': self.error_indicators,
-                    'business_indicators': self.business_indicators
-                }
+                    results_by_slug[futures[future]] = result
+        
+        print("🔒 Browsers closed")
+        
+        # Save comprehensive debug report - results in test slug order
+        results = [results_by_slug[slug] for slug in self.test_slugs if slug in results_by_slug]
+        debug_report = {
+            'debug_session': datetime.now().isoformat(),
+            'base_url': self.base_url,
+            'tested_slugs': self.test_slugs,
+            'results': results,
+            'scanner_indicators': {
+                'error_indicators': self.error_indicators,
+                'business_indicators': self.business_indicators
             }
-            
-            report_filename = f"debug_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(report_filename, 'w', encoding='utf-8') as f:
-                json.dump(debug_report, f, indent=2, ensure_ascii=False)
-            
-            print(f"\n📋 Debug report saved to: {report_filename}")
-            
-        finally:
-            if self.driver:
-                self.driver.quit()
-                print("🔒 Browser closed")
+        }
+        
+        report_filename = f"debug_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_filename, 'w', encoding='utf-8') as f:
+            json.dump(debug_report, f, indent=2, ensure_ascii=False)
+        
+        print(f"\n📋 Debug report saved to: {report_filename}")
 
 if __name__ == "__main__":
     debugger = SlugDebugger()
@@ -10,6 +10,19 @@ import glob
 import argparse
 from datetime import datetime
 
+def iter_testing_results(log_file, session_data):
+    """Yield a session's test results - inline, or from its NDJSON companion file"""
+    yield from session_data.get('testing_results', [])
+    
+    results_file = session_data.get('testing_results_file')
+    if results_file:
+        results_file = os.path.join(os.path.dirname(log_file), os.path.basename(results_file))
+        if os.path.exists(results_file):
+            with open(results_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
 def extract_connection_error_slugs(log_files, output_file):
     """Extract slugs with errors from session log files"""
     connection_error_slugs = set()
@@ -26,7 +39,7 @@ def extract_connection_error_slugs(log_files, output_file):
                 session_data = json.load(f)
             
             # Extract slugs with errors
-            for test_result in session_data.get('testing_results', []):
+            for test_result in iter_testing_results(log_file, session_data):
                 status = test_result.get('status', '')
                 slug = test_result.get('slug', '')
                 
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test the combined self-tester's error template fast reject on rendered pages
+"""
+
+import os
+
+from combined_self_tester import FAST_REJECT_BODY_CHARS, has_error_template
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Rendered pages saved by debug_3_slugs.py - all three are active businesses
+ACTIVE_PAGES = [
+    'debug_slug_NzAz_20250625_094746.html',
+    'debug_slug_NzE2_20250625_094759.html',
+    'debug_slug_NzE5_20250625_094752.html'
+]
+
+# Body of the rendered invalid-slug template ("401 ERROR Nothing left to do here. Go To HomePage")
+ERROR_TEMPLATE_BODY = (
+    '<body id="kt_body" class="quick-panel-right demo-panel-right offcanvas-right header-fixed '
+    'header-mobile-fixed aside-enabled aside-fixed aside-minimize-hoverable brand-dark">'
+    '<noscript>You need to enable JavaScript to run this app.</noscript>'
+    '<div id="my-widget" ata-symbol="AMC" class="my-widget">'
+    '<div class="notification-container notification-container-empty"><div></div></div>'
+    '<div class="errorPage_container"><h1>401</h1><h2>ERROR</h2>'
+    '<p>Nothing left to do here.</p><a href="/">Go To HomePage</a></div></div>'
+    '<script>!function(o){}([]);</script></body></html>'
+)
+
+def read_page(filename):
+    with open(os.path.join(HERE, filename), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def build_error_page():
+    """Real rendered <head> (~18.5K of meta and injected CSS) followed by the error template body"""
+    page = read_page(ACTIVE_PAGES[0])
+    return page[:page.index('<body')] + ERROR_TEMPLATE_BODY
+
+def test_fast_reject_error_template():
+    window = FAST_REJECT_BODY_CHARS
+    error_page = build_error_page()
+
+    print(f"🧪 Error page: {len(error_page):,} chars, body at {error_page.index('<body'):,}")
+    assert error_page.index('<body') > window, "head should be longer than the fast reject window"
+    assert has_error_template(error_page, window), "fast reject missed the error template"
+    print("   ✅ Error template rejected")
+
+    for filename in ACTIVE_PAGES:
+        assert not has_error_template(read_page(filename), window), f"{filename} wrongly rejected"
+        print(f"   ✅ {filename} not rejected")
+
+if __name__ == "__main__":
+    test_fast_reject_error_template()